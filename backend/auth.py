@@ -1,27 +1,120 @@
+import os
+import threading
+import time
+from collections import OrderedDict
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
 from typing import Optional
 from models.user import User
-from database import SessionLocal
+from database import get_db
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 
-# Şifreleme
-from passlib.context import CryptContext
+# Şifreleme (bcrypt ayrı bir süreç havuzunda çalışır)
+from services.passwords import password_hasher
 
 SECRET_KEY = "gizli-bir-anahtar"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Kullanıcı önbelleği: her korumalı istekte DB'ye gitmemek için
+USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+# Token'a id ve rol eklenir; bunlara güvenilirse yetkilendirme DB'siz yapılır
+AUTH_TRUST_CLAIMS = os.getenv("AUTH_TRUST_CLAIMS", "0") == "1"
+# Güvenilen token'larda da kullanıcının hâlâ var olduğu ve rolünün değişmediği (önbellek üzerinden) denetlenir
+AUTH_REVOCATION_CHECK = os.getenv("AUTH_REVOCATION_CHECK", "1") == "1"
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
 def hash_password(password: str):
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.verify_and_update(plain_password, hashed_password)[0]
+
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    """(doğru mu, yeni hash) döndürür; bcrypt maliyeti değiştiyse yeni hash dolu gelir."""
+    return password_hasher.verify_and_update(plain_password, hashed_password)
+
+async def hash_password_async(password: str):
+    """Async uçlar için: hash süreç havuzunda hesaplanırken thread tutulmaz."""
+    return await password_hasher.hash_async(password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str):
+    return await password_hasher.verify_and_update_async(plain_password, hashed_password)
+
+USER_FIELDS = ("id", "email", "first_name", "last_name", "phone", "department", "role")
+
+
+class UserCache:
+    """E-postaya (token `sub`) göre sınırlı boyutlu, TTL'li LRU kullanıcı önbelleği.
+
+    Oturumdan bağımsız alan kopyaları saklanır; her okumada yeni (transient) bir `User`
+    nesnesi döner. Kullanıcı güncellenince/silinince ilgili kayıt düşürülür.
+    """
+
+    def __init__(self, max_size: int = USER_CACHE_SIZE, ttl: int = USER_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, email: str) -> Optional[User]:
+        with self._lock:
+            item = self._items.get(email)
+            if item is None:
+                return None
+            expires_at, fields = item
+            if time.monotonic() > expires_at:
+                del self._items[email]
+                return None
+            self._items.move_to_end(email)
+        return User(**fields)
+
+    def put(self, user: User):
+        if self.max_size <= 0:
+            return
+        fields = {name: getattr(user, name) for name in USER_FIELDS}
+        with self._lock:
+            self._items[user.email] = (time.monotonic() + self.ttl, fields)
+            self._items.move_to_end(user.email)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, email: str):
+        with self._lock:
+            self._items.pop(email, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+user_cache = UserCache()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    user_cache.invalidate(target.email)
+    # E-posta değiştiyse eski anahtar da düşürülür
+    for old_email in inspect(target).attrs.email.history.deleted or ():
+        user_cache.invalidate(old_email)
+
+
+def load_user(db: Session, email: str) -> Optional[User]:
+    """Kullanıcıyı önbellekten, yoksa DB'den getirir."""
+    user = user_cache.get(email)
+    if user is not None:
+        return user
+    user = db.query(User).filter(User.email == email).first()
+    if user is not None:
+        user_cache.put(user)
+    return user
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -29,13 +122,6 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -50,9 +136,16 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.email == email).first()
+    # İmzalı id/rol claim'leri: DB'ye hiç gitmeden yetkilendirme
+    if AUTH_TRUST_CLAIMS and "uid" in payload and "role" in payload and not AUTH_REVOCATION_CHECK:
+        return User(id=payload["uid"], email=email, role=payload["role"])
+
+    user = load_user(db, email)
     if user is None:
         raise credentials_exception
+    # Rolü değişen kullanıcının eski token'ı geçersiz sayılır
+    if AUTH_TRUST_CLAIMS and "role" in payload and payload["role"] != user.role:
+        raise credentials_exception
     return user
 
 def role_required(required_role: str):
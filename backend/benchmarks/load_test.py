@@ -0,0 +1,79 @@
+"""Senkron ve asenkron mod karşılaştırmalı yük testi.
+
+Aynı uygulama iki kez çalıştırılır (biri APP_ASYNC=1 ile) ve her iki adrese de aynı
+eşzamanlılıkla istek gönderilir; istek/sn ve gecikme yüzdelikleri yazdırılır.
+
+    APP_ASYNC=0 uvicorn main:app --port 8000 --workers 1
+    APP_ASYNC=1 uvicorn main:app --port 8001 --workers 1
+    python -m benchmarks.load_test --sync-url http://127.0.0.1:8000 --async-url http://127.0.0.1:8001 \\
+        --concurrency 50 200 500
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+PATHS = [
+    "/transactions?limit=50",
+    "/projects?limit=100",
+    "/categories?limit=100",
+    "/exchange-rates",
+]
+
+
+async def run(base_url: str, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker(i):
+            nonlocal errors
+            n = i
+            while time.perf_counter() < deadline:
+                path = PATHS[n % len(PATHS)]
+                n += 1
+                start = time.perf_counter()
+                try:
+                    resp = await client.get(path)
+                    if resp.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": pct(0.50),
+        "p99": pct(0.99),
+        "mean": statistics.mean(latencies) * 1000 if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sync-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--async-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--duration", type=float, default=15.0, help="Her ölçümün süresi (sn)")
+    args = parser.parse_args()
+
+    print(f"{'mod':<6} {'eşzamanlı':>9} {'istek/sn':>10} {'p50 ms':>8} {'p99 ms':>8} {'hata':>6}")
+    for concurrency in args.concurrency:
+        for mode, url in (("sync", args.sync_url), ("async", args.async_url)):
+            r = await run(url, concurrency, args.duration)
+            print(f"{mode:<6} {concurrency:>9} {r['rps']:>10.1f} {r['p50']:>8.1f} {r['p99']:>8.1f} {r['errors']:>6}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
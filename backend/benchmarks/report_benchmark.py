@@ -0,0 +1,52 @@
+"""Özet rapor sorgularının büyük tablolarda ölçümü.
+
+Sentetik veri tek transaction içinde üretilir ve sonunda geri alınır.
+
+    cd backend
+    python -m benchmarks.report_benchmark --sizes 1000000 3000000
+"""
+import argparse
+import json
+import statistics
+import time
+
+from benchmarks.search_benchmark import seed
+from database import SessionLocal
+from services.reports import summarize_transactions
+
+GROUPINGS = [
+    ["type"],
+    ["project_id", "type"],
+    ["category_id", "month"],
+    ["currency", "week"],
+    ["project_id", "category_id", "type", "currency", "month"],
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'satır':>10} {'gruplama':<45} {'grup':>7} {'ms':>9} {'JSON KB':>8}")
+    for size in args.sizes:
+        db = SessionLocal()
+        try:
+            seed(db, size)
+            for group_by in GROUPINGS:
+                samples = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    result = summarize_transactions(db, group_by)
+                    samples.append((time.perf_counter() - start) * 1000)
+                size_kb = len(json.dumps(result)) / 1024
+                print(f"{size:>10} {','.join(group_by):<45} {result['length']:>7} "
+                      f"{statistics.median(samples):>9.1f} {size_kb:>8.1f}")
+        finally:
+            db.rollback()
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
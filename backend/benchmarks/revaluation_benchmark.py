@@ -0,0 +1,110 @@
+"""Döviz pozisyonu yeniden değerlemesi: satır satır Python döngüsü ve NumPy motoru.
+
+DB gerekmez; sentetik işlemler ve kur serileri bellekte üretilir. Vektörel motor
+(services.revaluation.revalue) ham işlem satırlarıyla beslenir, iki sonucun aynı olduğu
+doğrulanır.
+
+    cd backend
+    python -m benchmarks.revaluation_benchmark --rows 100000 1000000 --dates 12 60
+"""
+import argparse
+import random
+import time
+from bisect import bisect_right
+from datetime import date, timedelta
+
+import numpy as np
+
+from services.revaluation import Flows, revalue, valuation_dates
+
+CURRENCIES = ["USD", "EUR", "GBP", "CHF"]
+START = date(2020, 1, 1)
+DAYS = 5 * 365
+
+
+def make_data(rows: int, projects: int, seed: int = 42):
+    rng = random.Random(seed)
+    transactions = []
+    for _ in range(rows):
+        sign = 1 if rng.random() < 0.55 else -1
+        amount = sign * round(rng.uniform(10, 10000), 2)
+        transactions.append((
+            rng.randrange(1, projects + 1), rng.choice(CURRENCIES),
+            START + timedelta(days=rng.randrange(DAYS)), amount, amount * rng.uniform(20, 40),
+        ))
+    rates = {}
+    for code in CURRENCIES:
+        dates = [START + timedelta(days=d) for d in range(DAYS) if (START + timedelta(days=d)).weekday() < 5]
+        rates[code] = (dates, [30 + rng.uniform(-5, 5) for _ in dates])
+    return transactions, rates
+
+
+def naive(transactions, rates, at):
+    """Her değerleme tarihi için tüm satırları dolaşan referans uygulama."""
+    result = {}
+    for v in at:
+        position, book = {}, {}
+        for project, code, on_date, amount, tl_total in transactions:
+            if on_date <= v:
+                key = (project, code)
+                position[key] = position.get(key, 0.0) + amount
+                book[key] = book.get(key, 0.0) + tl_total
+        for key, pos in position.items():
+            dates, values = rates[key[1]]
+            i = bisect_right(dates, v)
+            rate = values[i - 1] if i else float("nan")
+            result[(key, v)] = pos * rate - book[key]
+    return result
+
+
+def to_arrays(transactions, rates):
+    """Satırları motorun girdisine çevirir (uç bunu DB sonucundan yapar; ölçüme ayrı yazılır)."""
+    keys = {}
+    key_index = np.array([keys.setdefault((p, c), len(keys)) for p, c, _, _, _ in transactions], dtype=np.int64)
+    flows = Flows(
+        projects=np.array([k[0] for k in keys], dtype=np.int64),
+        currencies=[k[1] for k in keys],
+        key_index=key_index,
+        dates=np.array([t[2] for t in transactions], dtype="datetime64[D]"),
+        amounts=np.array([t[3] for t in transactions]),
+        book=np.array([t[4] for t in transactions]),
+    )
+    series = {c: (np.array(d, dtype="datetime64[D]"), np.array(r)) for c, (d, r) in rates.items()}
+    return keys, flows, series
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dates", type=int, nargs="+", default=[12, 60])
+    parser.add_argument("--projects", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'satır':>9} {'tarih':>6} {'döngü ms':>10} {'hazırlık ms':>12} {'numpy ms':>10} {'hız':>7}")
+    for rows in args.rows:
+        transactions, rates = make_data(rows, args.projects)
+        start = time.perf_counter()
+        keys, flows, series = to_arrays(transactions, rates)
+        prepare_ms = (time.perf_counter() - start) * 1000
+        for months in args.dates:
+            at = valuation_dates(START, START + timedelta(days=31 * months), "month")[:months]
+
+            start = time.perf_counter()
+            expected = naive(transactions, rates, at)
+            naive_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            result = revalue(flows, series, at)
+            numpy_ms = (time.perf_counter() - start) * 1000
+
+            # Aynı sonuç mu (naive yalnızca o tarihe kadar işlemi olan anahtarları içerir)
+            for (key, v), gain in expected.items():
+                got = result.gain_tl[keys[key], at.index(v)]
+                if not np.isclose(got, gain, equal_nan=True):
+                    raise SystemExit(f"Sonuç farklı: {key} {v}: {got} != {gain}")
+
+            print(f"{rows:>9} {len(at):>6} {naive_ms:>10.1f} {prepare_ms:>12.1f} {numpy_ms:>10.1f} {naive_ms / numpy_ms:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""İşlem araması gecikmesi / tablo boyutu ölçümü.
+
+Her boyut için sentetik proje, kategori ve işlem satırları tek bir transaction içinde
+üretilir, arama sorguları ölçülür ve sonunda ROLLBACK yapılır (veritabanı kirlenmez).
+Göçlerin (`alembic upgrade head`) uygulanmış olması gerekir.
+
+    cd backend
+    python -m benchmarks.search_benchmark --sizes 10000 100000 1000000
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import func, select, text
+
+from database import SessionLocal
+from services.transactions import transaction_list_statement
+from models import Transaction
+from services.search import transaction_search_rank
+
+TERMS = ["kira", "proje 42", "usd", "zzz-yok"]
+
+
+def seed(db, size):
+    db.execute(text("""
+        INSERT INTO projects (name, created_at)
+        SELECT 'bench proje ' || g, now() FROM generate_series(1, 200) g
+    """))
+    db.execute(text("""
+        INSERT INTO categories (type, name)
+        SELECT CASE WHEN g % 2 = 0 THEN 'gelir' ELSE 'gider' END, 'bench kategori ' || g
+        FROM generate_series(1, 50) g
+    """))
+    db.execute(text("""
+        WITH p AS (SELECT array_agg(id) ids FROM projects WHERE name LIKE 'bench proje %'),
+             c AS (SELECT array_agg(id) ids FROM categories WHERE name LIKE 'bench kategori %')
+        INSERT INTO transactions (type, project_id, category_id, date, amount, currency, description, tl_total, created_at)
+        SELECT CASE WHEN g % 2 = 0 THEN 'gelir' ELSE 'gider' END,
+               p.ids[1 + g % array_length(p.ids, 1)],
+               c.ids[1 + g % array_length(c.ids, 1)],
+               DATE '2020-01-01' + (g % 2000),
+               (g % 10000) / 3.0,
+               (ARRAY['TRY', 'USD', 'EUR', 'GBP'])[1 + g % 4],
+               (ARRAY['kira ödemesi', 'maaş', 'malzeme alımı', 'danışmanlık'])[1 + g % 4] || ' #' || g,
+               (g % 10000) / 3.0,
+               now()
+        FROM generate_series(1, :size) g, p, c
+    """), {"size": size})
+    db.execute(text("ANALYZE projects"))
+    db.execute(text("ANALYZE categories"))
+    db.execute(text("ANALYZE transactions"))
+
+
+def time_query(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'satır':>10} {'terim':>10} {'ilk sayfa ms':>13} {'sayım ms':>10} {'alaka ms':>10}")
+    for size in args.sizes:
+        db = SessionLocal()
+        try:
+            seed(db, size)
+            for term in TERMS:
+                stmt = transaction_list_statement(term)
+                page = stmt.order_by(Transaction.id).limit(10)
+                counted = select(func.count()).select_from(stmt.subquery())
+                ranked = stmt.order_by(transaction_search_rank(term).desc(), Transaction.id).limit(10)
+                page_ms = time_query(lambda: db.execute(page).all(), args.repeat)
+                count_ms = time_query(lambda: db.execute(counted).scalar(), args.repeat)
+                rank_ms = time_query(lambda: db.execute(ranked).all(), args.repeat)
+                print(f"{size:>10} {term:>10} {page_ms:>13.1f} {count_ms:>10.1f} {rank_ms:>10.1f}")
+        finally:
+            db.rollback()
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
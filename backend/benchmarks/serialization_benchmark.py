@@ -0,0 +1,83 @@
+"""İşlem listesi yanıtının JSON'a çevrilme maliyeti: eski yol ve hızlı yol.
+
+Eski yol: satır başına sözlük + TransactionListResponse doğrulaması + jsonable_encoder + json.
+Hızlı yol: services.serialization (orjson kuruluysa orjson). DB gerekmez; sentetik satırlar kullanılır.
+
+    cd backend
+    python -m benchmarks.serialization_benchmark --rows 1000 --repeat 200
+"""
+import argparse
+import json
+import statistics
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+
+from schemas import TransactionListResponse
+from services import serialization
+from services.serialization import TRANSACTION_FIELDS, list_response, rows_to_items
+from services.transactions import row_to_dict
+
+ROW_KEYS = (
+    "id", "type", "project_id", "category_id", "project_name", "category_name",
+    "date", "amount", "currency", "description", "tl_total", "created_at",
+)
+Row = namedtuple("Row", ROW_KEYS)
+
+
+def make_rows(count: int) -> list:
+    start = datetime(2025, 1, 1, 9, 30)
+    return [
+        Row(
+            i, "gider" if i % 3 else "gelir", i % 50 + 1, i % 20 + 1, f"Proje {i % 50}", f"Kategori {i % 20}",
+            (start + timedelta(days=i % 365)).date(), Decimal(f"{i * 7 % 100000}.25"), "USD",
+            f"Açıklama {i}", Decimal(f"{i * 241 % 10000000}.50"), start + timedelta(minutes=i),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def current_path(rows) -> bytes:
+    content = {"total": len(rows), "items": [row_to_dict(r) for r in rows], "next_cursor": None}
+    model = TransactionListResponse.model_validate(content)
+    return json.dumps(jsonable_encoder(model), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def fast_path(rows) -> bytes:
+    items = rows_to_items(TRANSACTION_FIELDS, ROW_KEYS, rows)
+    return list_response(len(rows), items, next_cursor=None).body
+
+
+def _time(fn, rows, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(rows)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"kodlayıcı: {'orjson' if serialization.orjson else 'json'}")
+    print(f"{'satır':>7} {'yol':<8} {'ort ms':>9} {'p50 ms':>9} {'KB':>8}")
+    for count in args.rows:
+        rows = make_rows(count)
+        # JSON biçimi aynı mı (anahtarlar, tipler, değerler)
+        if json.loads(current_path(rows)) != json.loads(fast_path(rows)):
+            raise SystemExit("Hızlı yolun çıktısı eski yoldan farklı!")
+        for name, fn in (("eski", current_path), ("hızlı", fast_path)):
+            samples = _time(fn, rows, args.repeat)
+            size = len(fn(rows)) / 1024
+            print(f"{count:>7} {name:<8} {statistics.mean(samples):>9.3f} {statistics.median(samples):>9.3f} {size:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
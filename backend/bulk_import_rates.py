@@ -1,48 +1,166 @@
+"""TCMB geçmiş kur aktarımı (backfill).
+
+Günleri sınırlı sayıda iş parçacığıyla, ortak bir HTTP oturumu üzerinden (yeniden deneme ve
+hız sınırıyla) indirir; her gün `rate_backfill_days` tablosuna işlendiği için yarıda kesilen
+çalıştırmalar kaldığı yerden devam eder. Hafta sonları istenmez; TCMB'nin kayıt yayınlamadığı
+günler (resmi tatiller) "missing" olarak işaretlenir ve tekrar denenmez. Bugün ve sonrası için
+404 henüz yayımlanmamış bülten demektir (TCMB ~15:30'da yayımlar); bu günler işaretlenmez,
+sonraki çalıştırmada yeniden denenir.
+
+    python bulk_import_rates.py --start 2023-01-01 --workers 8
+    python bulk_import_rates.py --base-url http://127.0.0.1:9000/kurlar   # yerel test sunucusu
+"""
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
 import requests
-import xml.etree.ElementTree as ET
-from datetime import date, timedelta
+from requests.adapters import HTTPAdapter
+from sqlalchemy.dialects.postgresql import insert
+from urllib3.util.retry import Retry
+
 from database import SessionLocal
-from models import ExchangeRate
+from models import RateBackfillDay
+from services.rate_ingestion import parse_tcmb_xml, store_rates
 
-def fetch_and_save_rates(start_date, end_date):
-    session = SessionLocal()
-    current = start_date
+TCMB_BASE_URL = os.getenv("TCMB_BASE_URL", "https://www.tcmb.gov.tr/kurlar")
+DEFAULT_CURRENCIES = ["USD", "EUR", "GBP"]   # Sadece ihtiyacın olanlar
+
+# Sabit tarihli resmi tatiller (ay, gün); dini bayramlar her yıl değiştiği için TCMB yanıtından öğrenilir
+FIXED_HOLIDAYS = {(1, 1), (4, 23), (5, 1), (5, 19), (7, 15), (8, 30), (10, 29)}
+
+
+class RateLimiter:
+    """İş parçacıkları arasında paylaşılan basit hız sınırlayıcı (saniyede en fazla N istek)."""
+
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            wait_for = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+
+def make_session(pool_size: int, retries: int) -> requests.Session:
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def is_business_day(day: date) -> bool:
+    return day.weekday() < 5 and (day.month, day.day) not in FIXED_HOLIDAYS
 
+
+def day_url(base_url: str, day: date) -> str:
+    return f"{base_url.rstrip('/')}/{day.strftime('%Y%m')}/{day.strftime('%d%m%Y')}.xml"
+
+
+def fetch_day(session, limiter, base_url, day, currencies, timeout):
+    """(gün, durum, satırlar) döndürür; durum: done, missing, unpublished veya error."""
+    limiter.wait()
+    try:
+        resp = session.get(day_url(base_url, day), timeout=timeout)
+        if resp.status_code == 404:
+            # Yalnızca geçmiş günlerde 404 kalıcıdır (tatil); bugünün bülteni henüz çıkmamış olabilir
+            return day, "missing" if day < date.today() else "unpublished", []
+        resp.raise_for_status()
+        return day, "done", parse_tcmb_xml(resp.content, day, currencies)[1]
+    except Exception as e:
+        print(f"{day} hata: {e}")
+        return day, "error", []
+
+
+def pending_days(db, start_date, end_date):
+    done = {
+        d for (d,) in db.query(RateBackfillDay.date)
+        .filter(RateBackfillDay.date >= start_date, RateBackfillDay.date <= end_date)
+    }
+    days = []
+    current = start_date
     while current <= end_date:
-        year_month = current.strftime("%Y%m")
-        day = current.strftime("%d%m%Y")
-        url = f"https://www.tcmb.gov.tr/kurlar/{year_month}/{day}.xml"
-
-        try:
-            resp = requests.get(url)
-            if resp.status_code != 200:
-                print(f"Kayıt yok: {current}")
-                current += timedelta(days=1)
-                continue
-
-            root = ET.fromstring(resp.content)
-            for currency in root.findall("Currency"):
-                code = currency.get("CurrencyCode")
-                forex_buying = currency.find("ForexBuying").text
-
-                # BAZI KURLAR BOŞ OLABİLİR!
-                def try_float(x): return float(x) if x else None
-
-                if code in ["USD", "EUR", "GBP"]:   # Sadece ihtiyacın olanlar
-                    rate = ExchangeRate(
-                        date=current,
-                        currency=code,
-                        rate_to_try=try_float(forex_buying)
-                    )
-                    if not session.query(ExchangeRate).filter_by(date=current, currency=code).first():
-                        session.add(rate)
-            session.commit()
-            print(f"{current} eklendi")
-        except Exception as e:
-            print(f"{current} hata: {e}")
+        if is_business_day(current) and current not in done:
+            days.append(current)
         current += timedelta(days=1)
+    return days
+
+
+def save_batch(db, results):
+    rates = [row for _, status, rows in results if status == "done" for row in rows]
+    checkpoints = [
+        {"date": day, "status": status, "fetched_at": datetime.utcnow()}
+        for day, status, _ in results if status in ("done", "missing")
+    ]
+    # Günlük servisle aynı ifade: tüm kur türleri, (currency, date) çakışmasında güncellenir;
+    # değişen kurlar için tl_total yeniden hesaplama işi aynı transaction'da kuyruğa girer
+    saved = len(store_rates(db, rates))
+    if checkpoints:
+        stmt = insert(RateBackfillDay).values(checkpoints)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["date"],
+            set_={"status": stmt.excluded.status, "fetched_at": stmt.excluded.fetched_at},
+        ))
+    db.commit()
+    return saved
+
+
+def fetch_and_save_rates(start_date, end_date, base_url=TCMB_BASE_URL, currencies=None,
+                         workers=4, per_second=5.0, batch_size=50, retries=3, timeout=10):
+    currencies = set(currencies or DEFAULT_CURRENCIES)
+    db = SessionLocal()
+    session = make_session(workers, retries)
+    limiter = RateLimiter(per_second)
+
+    try:
+        days = pending_days(db, start_date, end_date)
+        print(f"{len(days)} gün aktarılacak ({start_date} - {end_date})")
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for i in range(0, len(days), batch_size):
+                batch = days[i:i + batch_size]
+                results = list(pool.map(
+                    lambda d: fetch_day(session, limiter, base_url, d, currencies, timeout), batch
+                ))
+                saved = save_batch(db, results)
+                errors = sum(1 for _, status, _ in results if status == "error")
+                print(f"{batch[0]} - {batch[-1]}: {saved} yeni/değişen kur yazıldı, {errors} gün hatalı")
+    finally:
+        session.close()
+        db.close()
+
 
 if __name__ == "__main__":
-    start = date(2023, 1, 1)
-    end = date.today()
-    fetch_and_save_rates(start, end)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2023, 1, 1))
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--base-url", default=TCMB_BASE_URL)
+    parser.add_argument("--currencies", nargs="+", default=DEFAULT_CURRENCIES)
+    parser.add_argument("--workers", type=int, default=4, help="Eşzamanlı istek sayısı")
+    parser.add_argument("--rate", type=float, default=5.0, help="Saniyedeki en fazla istek")
+    parser.add_argument("--batch-size", type=int, default=50, help="Tek INSERT ile yazılacak gün sayısı")
+    args = parser.parse_args()
+
+    fetch_and_save_rates(
+        args.start, args.end,
+        base_url=args.base_url,
+        currencies=args.currencies,
+        workers=args.workers,
+        per_second=args.rate,
+        batch_size=args.batch_size,
+    )
@@ -0,0 +1,204 @@
+"""Sık kullanılan işlem sorgularının (ve yapısal filtrelerin) indeks kullandığını EXPLAIN ile doğrular.
+
+Sentetik veri tek transaction içinde üretilir (benchmarks.search_benchmark.seed), sorgular
+`EXPLAIN (FORMAT JSON)` ile planlanır ve `transactions` tablosunun sıralı taramayla
+(Seq Scan) okunduğu her durum hata sayılır. Tablo bölümlüyse (0009 göçü) tarih filtreli liste,
+rapor ve dışa aktarma sorgularının yalnızca tarih aralığına değen bölümleri taradığı (partition
+pruning) da doğrulanır. Sonunda ROLLBACK yapılır.
+Göçlerin (`alembic upgrade head`) uygulanmış olması gerekir.
+
+    python check_query_plans.py                 # varsayılan 200000 satır
+    python check_query_plans.py --size 1000000  # sorun varsa çıkış kodu 1
+
+Aynı kontroller pytest ile de çalışır (tests/test_query_plans.py); EXPLAIN testleri yalnızca
+DATABASE_URL bir Postgres'i gösterdiğinde çalışır, derleme testleri her ortamda çalışır.
+"""
+import argparse
+import sys
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from benchmarks.search_benchmark import seed
+from database import SessionLocal
+from services.partitions import DEFAULT_PARTITION, PARENT, ensure_partitions, partition_interval, partition_names
+from services.reports import summary_statement
+from services.transactions import (
+    TransactionFilters, order_transactions, transaction_list_statement, transaction_page_statements,
+)
+from services.pagination import encode_cursor
+
+# Filtre örneklerindeki proje/kategori id'leri seed sonrası gerçek id'lerle değiştirilir
+PROJECT, CATEGORY = "proje", "kategori"
+
+INDEX_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+# Bu kadar sayfadan küçük bölümlerde (boş gelecek bölümler, varsayılan bölüm) sıralı tarama normaldir
+SMALL_PARTITION_PAGES = 16
+
+# (açıklama, transaction_page_statements argümanları)
+CASES = [
+    ("ilk sayfa, id artan", dict(sort_by="id", sort_order="asc")),
+    ("ilk sayfa, tarih azalan", dict(sort_by="date", sort_order="desc")),
+    ("ilk sayfa, tutar artan", dict(sort_by="amount", sort_order="asc")),
+    ("ilk sayfa, TL toplam azalan", dict(sort_by="tl_total", sort_order="desc")),
+    ("ilk sayfa, eklenme azalan", dict(sort_by="created_at", sort_order="desc")),
+    ("ilk sayfa, tip artan", dict(sort_by="type", sort_order="asc")),
+    ("ilk sayfa, para birimi artan", dict(sort_by="currency", sort_order="asc")),
+    ("keyset, tarih azalan", dict(sort_by="date", sort_order="desc", after=("date", "desc", "2024-06-01", 500000))),
+    ("keyset, tutar artan", dict(sort_by="amount", sort_order="asc", after=("amount", "asc", "1500.00", 1000))),
+    ("arama, id artan", dict(sort_by="id", sort_order="asc", search="kira")),
+    # Yapısal filtreler SQL'e inmeli ve indeksle çözülmeli
+    ("filtre: tarih aralığı", dict(sort_by="date", sort_order="asc",
+                                   filters=dict(date_from=date(2024, 1, 1), date_to=date(2024, 1, 31)))),
+    ("filtre: proje + tarih", dict(sort_by="date", sort_order="desc",
+                                   filters=dict(project_id=[PROJECT], date_from=date(2023, 1, 1)))),
+    ("filtre: kategori", dict(sort_by="id", sort_order="asc", filters=dict(category_id=[CATEGORY]))),
+    ("filtre: para birimi + tarih", dict(sort_by="id", sort_order="asc",
+                                         filters=dict(currency=["USD"], date_from=date(2024, 1, 1), date_to=date(2024, 2, 1)))),
+    ("filtre: tutar aralığı", dict(sort_by="amount", sort_order="asc",
+                                   filters=dict(min_amount=Decimal("100"), max_amount=Decimal("101")))),
+]
+
+
+# (açıklama, sorgu türü, tarih filtresi) — bölüm budama kontrolleri
+JANUARY = dict(date_from=date(2024, 1, 1), date_to=date(2024, 1, 31))
+PRUNING_CASES = [
+    ("liste: ocak 2024, tarih artan", "list", dict(sort_by="date", sort_order="asc"), JANUARY),
+    ("liste: 2024 ilk çeyrek, tutar azalan", "list", dict(sort_by="amount", sort_order="desc"),
+     dict(date_from=date(2024, 1, 1), date_to=date(2024, 3, 31))),
+    ("liste: keyset, tarih azalan", "list",
+     dict(sort_by="date", sort_order="desc", after=("date", "desc", "2024-01-20", 500000)), JANUARY),
+    ("rapor: proje bazında, şubat 2024", "report", dict(group_by=["project_id"]),
+     dict(date_from=date(2024, 2, 3), date_to=date(2024, 2, 20))),
+    ("rapor: günlük, 2023", "report", dict(group_by=["day"]),
+     dict(date_from=date(2023, 1, 1), date_to=date(2023, 12, 31))),
+    ("dışa aktarma: ocak 2024", "export", dict(sort_by="id", sort_order="asc"), JANUARY),
+]
+
+
+def _is_transactions(relation) -> bool:
+    """Üst tablo veya bölümlerinden biri mi (transactions_pYYYY[_MM], transactions_default)."""
+    return bool(relation) and (
+        relation == PARENT or relation == DEFAULT_PARTITION or relation.startswith(f"{PARENT}_p")
+    )
+
+
+def _small_partitions(db) -> set:
+    return set(db.connection().exec_driver_sql(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        f"WHERE i.inhparent = '{PARENT}'::regclass AND c.relpages < {SMALL_PARTITION_PAGES}"
+    ).scalars())
+
+
+def _nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def _child_index(node) -> str:
+    return ", ".join(n["Index Name"] for n in _nodes(node) if "Index Name" in n) or "-"
+
+
+def explain(db, stmt) -> dict:
+    # IN (...) listeleri genişletilerek derlenir (exec_driver_sql POSTCOMPILE parametrelerini çözmez)
+    compiled = stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"render_postcompile": True})
+    conn = db.connection()
+    return conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params).scalar()[0]["Plan"]
+
+
+def _resolve_ids(db, filters: dict) -> dict:
+    lookups = {
+        PROJECT: "SELECT min(id) FROM projects WHERE name LIKE 'bench proje %'",
+        CATEGORY: "SELECT min(id) FROM categories WHERE name LIKE 'bench kategori %'",
+    }
+    for key in ("project_id", "category_id"):
+        if key in filters:
+            filters[key] = [db.execute(text(lookups[v])).scalar() for v in filters[key]]
+    return filters
+
+
+def check(db, args: dict, small: set = frozenset()):
+    """(uygun mu, transactions'ı okuyan düğümlerin özeti) döndürür."""
+    after = args.pop("after", None)
+    filters = TransactionFilters.of(**_resolve_ids(db, dict(args.pop("filters", {}))))
+    page_stmt, _, _ = transaction_page_statements(
+        args.pop("search", ""), 0, 10, args["sort_by"], args["sort_order"],
+        encode_cursor(*after) if after else None, "none", filters,
+    )
+    plan = explain(db, page_stmt)
+    # Bitmap Index Scan düğümlerinde tablo adı yok; üstlerindeki Bitmap Heap Scan tabloyu taşır
+    scans = [
+        (node["Node Type"], node.get("Index Name") or _child_index(node))
+        for node in _nodes(plan)
+        if _is_transactions(node.get("Relation Name")) and node["Relation Name"] not in small
+    ]
+    ok = bool(scans) and all(node_type in INDEX_NODES | {"Bitmap Heap Scan"} for node_type, _ in scans)
+    return ok, scans
+
+
+def check_pruning(db, interval: str, kind: str, args: dict, date_range: dict):
+    """(yalnızca aralığa değen bölümler mi tarandı, taranan bölümler, beklenen bölüm sayısı) döndürür."""
+    filters = TransactionFilters.of(**date_range)
+    args = dict(args)
+    if kind == "list":
+        after = args.pop("after", None)
+        stmt, _, _ = transaction_page_statements(
+            "", 0, 10, args["sort_by"], args["sort_order"], encode_cursor(*after) if after else None, "none", filters,
+        )
+    elif kind == "report":
+        stmt = summary_statement(args["group_by"], filters)
+    else:
+        stmt = order_transactions(transaction_list_statement("", filters), args["sort_by"], args["sort_order"])[0]
+
+    plan = explain(db, stmt)
+    scanned = sorted({node["Relation Name"] for node in _nodes(plan) if _is_transactions(node.get("Relation Name"))})
+    expected = set(partition_names(date_range["date_from"], date_range["date_to"], interval))
+    return bool(scanned) and set(scanned) <= expected, scanned, len(expected)
+
+
+def prepare(db, size: int):
+    """Sentetik veriyi üretir; (bölüm aralığı veya None, budama dışı tutulacak küçük bölümler) döndürür."""
+    seed(db, size)
+    interval = partition_interval(db.connection())
+    small = set()
+    if interval:
+        # Sentetik tarihler varsayılan bölüme düşer; kendi dönem bölümlerine ayrılıp istatistik yenilenir
+        ensure_partitions(db.connection())
+        db.execute(text(f"ANALYZE {PARENT}"))
+        small = _small_partitions(db)
+    return interval, small
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=200_000)
+    cli = parser.parse_args()
+
+    db = SessionLocal()
+    failures = pruning_failures = 0
+    interval = None
+    try:
+        interval, small = prepare(db, cli.size)
+
+        for name, case_args in CASES:
+            ok, scans = check(db, dict(case_args), small)
+            failures += not ok
+            summary = ", ".join(f"{node_type} ({index})" for node_type, index in scans)
+            print(f"{'OK ' if ok else 'HATA'} {name:<32} {summary}")
+
+        if interval:
+            for name, kind, case_args, date_range in PRUNING_CASES:
+                ok, scanned, expected = check_pruning(db, interval, kind, case_args, date_range)
+                pruning_failures += not ok
+                print(f"{'OK ' if ok else 'HATA'} {name:<40} {len(scanned)}/{expected} bölüm: {', '.join(scanned)}")
+    finally:
+        db.rollback()
+        db.close()
+    print(f"{len(CASES) - failures}/{len(CASES)} sorgu indeks kullanıyor.")
+    if interval:
+        print(f"{len(PRUNING_CASES) - pruning_failures}/{len(PRUNING_CASES)} sorguda bölüm budaması var ({interval}).")
+    else:
+        print("transactions bölümlü değil; bölüm budama kontrolleri atlandı.")
+    sys.exit(1 if failures or pruning_failures else 0)
@@ -0,0 +1,72 @@
+"""TCMB XML ayrıştırma ve kur yazma ifadesini kayıtlı fixture'lara karşı doğrular.
+
+Veritabanına bağlanmaz: `fixtures/tcmb/today.xml` ayrıştırılır, sonuç beklenen satırlarla
+karşılaştırılır ve `upsert_statement` Postgres diyalektiyle derlenip incelenir.
+
+    python check_rate_ingestion.py   # sorun varsa çıkış kodu 1
+"""
+import os
+import sys
+from datetime import date
+
+from sqlalchemy.dialects import postgresql
+
+from services.rate_ingestion import RATE_COLUMNS, parse_tcmb_xml, upsert_statement
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "tcmb", "today.xml")
+ON_DATE = date(2026, 10, 16)
+
+# (para birimi, rate_to_try, forex_selling, banknote_buying, banknote_selling)
+EXPECTED = [
+    ("USD", 41.7312, 41.8064, 41.7020, 41.8691),
+    ("EUR", 48.6471, 48.7348, 48.6130, 48.8079),
+    ("JPY", 27.6505, 27.8335, 27.5566, 27.9408),
+    ("KWD", 135.9871, 137.7669, 133.9473, 139.8334),
+    ("RUB", 0.5173, 0.5241, None, None),        # efektif alanları boş
+    ("XDR", 57.1498, None, None, None),         # yalnızca ForexBuying var
+]
+
+
+def main() -> int:
+    with open(FIXTURE, "rb") as f:
+        content = f.read()
+    tarih, rows = parse_tcmb_xml(content, ON_DATE)
+    by_code = {row["currency"]: row for row in rows}
+    parsed = [(row["currency"], *(row[col] for col in RATE_COLUMNS)) for row in rows]
+
+    _, filtered = parse_tcmb_xml(content, ON_DATE, ["usd", "xdr"])
+    duplicate = [dict(by_code["USD"]), {**by_code["USD"], "rate_to_try": 42.0}, by_code["EUR"]]
+    stmt = upsert_statement(duplicate)
+    sql = " ".join(str(stmt.compile(dialect=postgresql.dialect())).split())
+    params = stmt.compile(dialect=postgresql.dialect()).params
+
+    checks = [
+        ("Tarih özniteliği", tarih, "16.10.2026"),
+        ("satırlar (kod, kurlar)", parsed, EXPECTED),
+        ("tüm satırlarda tarih", {row["date"] for row in rows}, {ON_DATE}),
+        ("boş efektif alanları None", (by_code["RUB"]["banknote_buying"], by_code["RUB"]["banknote_selling"]),
+         (None, None)),
+        ("yalnızca ForexBuying olan para birimi", by_code.get("XDR", {}).get("rate_to_try"), 57.1498),
+        ("kuru olmayan (IRR) atlanır", "IRR" in by_code, False),
+        ("para birimi süzgeci", [row["currency"] for row in filtered], ["USD", "XDR"]),
+        ("boş satır kümesinde ifade yok", upsert_statement([]), None),
+        ("tekrarlanan (para birimi, tarih) tekilleşir", sorted(v for k, v in params.items() if k.startswith("currency")),
+         ["EUR", "USD"]),
+        ("tekrarda son satır geçerli", 42.0 in params.values(), True),
+        ("ON CONFLICT (currency, date) DO UPDATE", "ON CONFLICT (currency, date) DO UPDATE" in sql, True),
+        ("değişmeyen satırlar yazılmaz (IS DISTINCT FROM)",
+         all(f"exchange_rates.{col} IS DISTINCT FROM excluded.{col}" in sql for col in RATE_COLUMNS), True),
+        ("RETURNING currency, date", "RETURNING exchange_rates.currency, exchange_rates.date" in sql, True),
+    ]
+
+    failures = 0
+    for label, got, expected in checks:
+        ok = got == expected
+        failures += not ok
+        print(f"{'OK ' if ok else 'HATA'} {label}" + ("" if ok else f": {got!r} (beklenen {expected!r})"))
+    print(f"{len(checks) - failures}/{len(checks)} kontrol geçti.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Okuma yönlendirmesini iki SQLite dosyasıyla (birincil ve replika yerine) uçtan uca doğrular.
+
+Her veritabanında hangi düğüm olduğunu yazan `node` tablosu oluşturulur; okuma oturumlarının
+nereye gittiği bu tablodan okunur. Kontrol edilenler: sağlıklı replikaya yönlendirme, erişilemeyen
+replikanın devre dışı kalması, yazmadan sonra birincile sabitleme (read-your-writes), sabitleme
+süresinin dolması, çerez/başlık ayrıştırma ve hiç replika yokken birincile düşme.
+
+    python check_replica_routing.py   # sorun varsa çıkış kodu 1
+
+İki gerçek Postgres ile denemek için DATABASE_URL ve DATABASE_REPLICA_URLS ortam değişkenlerini
+verip uygulamayı çalıştırmak yeterlidir; /db/pool yanıtında replika sağlığı görünür.
+"""
+import os
+import sys
+import tempfile
+import time
+
+# database modülü ayarları içe aktarılırken okuduğundan ortam değişkenleri önce verilir
+_tmp = tempfile.mkdtemp(prefix="finans-replica-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/primary.db"
+os.environ["DATABASE_REPLICA_URLS"] = f"sqlite:///{_tmp}/replica.db,sqlite:///{_tmp}/yok/replica.db"
+os.environ["READ_YOUR_WRITES_SECONDS"] = "1"
+
+from sqlalchemy import column, insert, table, text  # noqa: E402
+
+import database  # noqa: E402
+from database import ReadYourWritesMiddleware, RoutingState, SessionLocal, read_session, replicas  # noqa: E402
+
+node = table("node", column("name"))
+
+
+def _prepare():
+    for target, name in [(database.engine, "primary"), (replicas.replicas[0].engine, "replica")]:
+        with target.begin() as conn:
+            conn.execute(text("CREATE TABLE node (name TEXT)"))
+            conn.execute(insert(node).values(name=name))
+
+
+def _read_node() -> str:
+    db = read_session()
+    try:
+        return db.execute(text("SELECT name FROM node LIMIT 1")).scalar()
+    finally:
+        db.close()
+
+
+def _with_state(state: RoutingState, fn):
+    token = database._routing_state.set(state)
+    try:
+        return fn()
+    finally:
+        database._routing_state.reset(token)
+
+
+def _write_and_read() -> str:
+    db = SessionLocal()
+    try:
+        db.execute(insert(node).values(name="primary"))
+        db.commit()
+    finally:
+        db.close()
+    return _read_node()
+
+
+def _scope(headers):
+    return {"type": "http", "headers": [(k.encode(), v.encode()) for k, v in headers]}
+
+
+def main() -> int:
+    _prepare()
+    replicas.check_all()
+    healthy, broken = replicas.replicas
+
+    pinned = RoutingState(time.time() + 60)
+    expired = RoutingState(time.time() - 1)
+    checks = [
+        ("sağlıklı replika işaretlendi", healthy.healthy, True),
+        ("erişilemeyen replika devre dışı", broken.healthy, False),
+        ("okumalar replikadan", {_read_node() for _ in range(5)}, {"replica"}),
+        ("yazan istek birincilden okur", _with_state(RoutingState(), _write_and_read), "primary"),
+        ("sabitlenmiş istemci birincilden okur", _with_state(pinned, _read_node), "primary"),
+        ("süresi dolan sabitleme replikaya döner", _with_state(expired, _read_node), "replica"),
+        ("çerezden sabitleme zamanı",
+         ReadYourWritesMiddleware._pinned_until(_scope([("cookie", "a=1; db_pin=123.5")])), 123.5),
+        ("başlıktan sabitleme zamanı",
+         ReadYourWritesMiddleware._pinned_until(_scope([("x-db-pin", "99")])), 99.0),
+        ("bozuk değer yok sayılır",
+         ReadYourWritesMiddleware._pinned_until(_scope([("x-db-pin", "abc")])), 0.0),
+    ]
+    healthy.healthy = False
+    checks.append(("sağlıklı replika yoksa birincil", _read_node(), "primary"))
+
+    failures = 0
+    for label, got, expected in checks:
+        ok = got == expected
+        failures += not ok
+        print(f"{'OK ' if ok else 'HATA'} {label}: {got!r}" + ("" if ok else f" (beklenen {expected!r})"))
+    print(f"replika durumu: {replicas.status()}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
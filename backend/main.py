@@ -1,13 +1,23 @@
-from fastapi import FastAPI, Depends
+import os
+from fastapi import FastAPI, Depends, APIRouter, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from database import SessionLocal
+from database import get_db, pool_status, replicas, ReadYourWritesMiddleware
 from routers import auth, admin
 from fastapi.middleware.cors import CORSMiddleware
 from routers import projects
 from routers import categories
 from routers import transactions
 from routers import exchange_rates
+from routers import reports
+from routers import dashboard
+from routers import recalc_jobs
+from routers import async_projects, async_categories, async_transactions, async_exchange_rates
+from services.rate_refresher import rate_refresher
+from services.passwords import password_hasher
+from services.recalc_jobs import recalc_worker
+from services.partitions import partition_maintainer
+from services.metrics import MetricsMiddleware, render_prometheus
 
 
 app = FastAPI()
@@ -22,24 +32,66 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-DB-Pin"],
 )
 
+# İstek süresi, SQL sayısı/süresi (Server-Timing) ve yavaş sorgu kaydı
+app.add_middleware(MetricsMiddleware)
+
+# Okuma replikaları varsa (DATABASE_REPLICA_URLS), yazan istemciyi kısa süre birincile sabitler
+app.add_middleware(ReadYourWritesMiddleware)
+
+
+# APP_ASYNC=1 ise proje, kategori, işlem ve kur uçları AsyncSession/asyncpg üzerinden çalışır
+ASYNC_MODE = os.getenv("APP_ASYNC", "0") == "1"
+
+
+def _without_routes(router: APIRouter, replacement: APIRouter) -> APIRouter:
+    """`replacement` içindeki aynı yol+metotlu uçları `router`'dan çıkarır."""
+    replaced = {(r.path, m) for r in replacement.routes for m in r.methods}
+    remaining = APIRouter()
+    remaining.routes.extend(
+        r for r in router.routes if not any((r.path, m) in replaced for m in r.methods)
+    )
+    return remaining
+
 
 # Router'ları ekle
 app.include_router(auth.router)
 app.include_router(admin.router)
-app.include_router(exchange_rates.router, tags=["Exchanges"])
-app.include_router(projects.router, tags=["Projects"])
-app.include_router(categories.router, tags=["Categories"])
-app.include_router(transactions.router, tags=["Transaction"])
-
-# DB oturumu oluşturmak için dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+if ASYNC_MODE:
+    app.include_router(async_exchange_rates.router, tags=["Exchanges"])
+    app.include_router(async_projects.router, tags=["Projects"])
+    app.include_router(async_categories.router, tags=["Categories"])
+    app.include_router(async_transactions.router, tags=["Transaction"])
+    # Toplu ekleme ve dışa aktarma senkron kalır
+    app.include_router(_without_routes(transactions.router, async_transactions.router), tags=["Transaction"])
+else:
+    app.include_router(exchange_rates.router, tags=["Exchanges"])
+    app.include_router(projects.router, tags=["Projects"])
+    app.include_router(categories.router, tags=["Categories"])
+    app.include_router(transactions.router, tags=["Transaction"])
+app.include_router(reports.router, tags=["Reports"])
+app.include_router(dashboard.router, tags=["Dashboard"])
+app.include_router(recalc_jobs.router, tags=["Recalc Jobs"])
+
+# Arka plan kur güncelleyicisi (EXCHANGE_RATE_REFRESH=0), tl_total işçisi (RECALC_WORKER=0) ve
+# işlem bölümü bakımı (PARTITION_MAINTENANCE=0) kapatılabilir
+@app.on_event("startup")
+async def start_rate_refresher():
+    rate_refresher.start()
+    recalc_worker.start()
+    replicas.start()
+    partition_maintainer.start()
+
+@app.on_event("shutdown")
+async def stop_rate_refresher():
+    await rate_refresher.stop()
+    await async_exchange_rates.close_http_client()
+    password_hasher.shutdown()
+    recalc_worker.stop()
+    replicas.stop()
+    partition_maintainer.stop()
 
 # Veritabanı bağlantısını test etmek için endpoint
 @app.get("/ping-db")
@@ -49,3 +101,14 @@ def ping_database(db: Session = Depends(get_db)):
         return {"status": "Veritabanı bağlantısı başarılı ✅"}
     except Exception as e:
         return {"status": "Veritabanı bağlantısı HATALI ❌", "error": str(e)}
+
+# Bağlantı havuzu doluluğu, bekleme süreleri ve replika sağlığı (havuz boyutlandırması için)
+@app.get("/db/pool")
+def get_pool_status():
+    return pool_status()
+
+
+# Prometheus metrikleri (istek gecikmeleri, SQL sayaçları, bağlantı havuzu)
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return Response(render_prometheus(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,80 @@
+"""baseline: mevcut şema (users, projects, categories, transactions, exchange_rates)
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("first_name", sa.String(), nullable=True),
+        sa.Column("last_name", sa.String(), nullable=True),
+        sa.Column("phone", sa.String(), nullable=True),
+        sa.Column("department", sa.String(), nullable=True),
+        sa.Column("role", sa.String(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "projects",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_projects_id", "projects", ["id"])
+    op.create_index("ix_projects_name", "projects", ["name"], unique=True)
+
+    op.create_table(
+        "categories",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("type", sa.String(10), nullable=False),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=False), server_default=sa.func.now()),
+        sa.UniqueConstraint("type", "name", name="unique_type_name"),
+    )
+    op.create_index("ix_categories_id", "categories", ["id"])
+
+    op.create_table(
+        "transactions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("type", sa.String(10)),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id")),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id")),
+        sa.Column("date", sa.Date()),
+        sa.Column("amount", sa.Numeric(12, 2)),
+        sa.Column("currency", sa.String(5)),
+        sa.Column("description", sa.String(255)),
+        sa.Column("tl_total", sa.Numeric(18, 2)),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_transactions_id", "transactions", ["id"])
+
+    op.create_table(
+        "exchange_rates",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("currency", sa.String()),
+        sa.Column("rate_to_try", sa.Numeric()),
+        sa.Column("date", sa.Date()),
+    )
+
+
+def downgrade():
+    op.drop_table("exchange_rates")
+    op.drop_table("transactions")
+    op.drop_table("categories")
+    op.drop_table("projects")
+    op.drop_table("users")
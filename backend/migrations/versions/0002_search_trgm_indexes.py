@@ -0,0 +1,45 @@
+"""arama: pg_trgm GIN indeksleri
+
+Proje/kategori adları ve işlem açıklama/tip/para birimi üzerinde ILIKE '%...%'
+aramalarını destekleyen trigram indeksleri. Arama alt sorgularının (project_id IN ...)
+indeksle çözülebilmesi için yabancı anahtar indeksleri de eklenir.
+
+Revision ID: 0002_search_trgm_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0002_search_trgm_indexes"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_index(
+        "ix_projects_name_trgm", "projects", ["name"],
+        postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_categories_name_trgm", "categories", ["name"],
+        postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_transactions_search_trgm", "transactions", ["description", "type", "currency"],
+        postgresql_using="gin",
+        postgresql_ops={"description": "gin_trgm_ops", "type": "gin_trgm_ops", "currency": "gin_trgm_ops"},
+    )
+    op.create_index("ix_transactions_project_id", "transactions", ["project_id"])
+    op.create_index("ix_transactions_category_id", "transactions", ["category_id"])
+
+
+def downgrade():
+    op.drop_index("ix_transactions_category_id", table_name="transactions")
+    op.drop_index("ix_transactions_project_id", table_name="transactions")
+    op.drop_index("ix_transactions_search_trgm", table_name="transactions")
+    op.drop_index("ix_categories_name_trgm", table_name="categories")
+    op.drop_index("ix_projects_name_trgm", table_name="projects")
@@ -0,0 +1,33 @@
+"""exchange_rates: (currency, date) benzersizlik kısıtı
+
+Mevcut veride para birimi kodları büyük harfe çevrilir ve aynı gün için birden fazla
+kur varsa en son eklenen (en büyük id) tutulur. Kısıtın oluşturduğu (currency, date)
+indeksi as-of kur sorgularını da karşılar.
+
+Revision ID: 0003_exchange_rate_unique
+Revises: 0002_search_trgm_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0003_exchange_rate_unique"
+down_revision = "0002_search_trgm_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("UPDATE exchange_rates SET currency = upper(currency) WHERE currency <> upper(currency)")
+    op.execute("""
+        DELETE FROM exchange_rates e
+        USING exchange_rates newer
+        WHERE e.currency = newer.currency
+          AND e.date = newer.date
+          AND e.id < newer.id
+    """)
+    op.create_unique_constraint("uq_exchange_rates_currency_date", "exchange_rates", ["currency", "date"])
+
+
+def downgrade():
+    op.drop_constraint("uq_exchange_rates_currency_date", "exchange_rates", type_="unique")
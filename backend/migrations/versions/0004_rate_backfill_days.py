@@ -0,0 +1,27 @@
+"""rate_backfill_days: geçmiş kur aktarımı kontrol noktası
+
+Revision ID: 0004_rate_backfill_days
+Revises: 0003_exchange_rate_unique
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_rate_backfill_days"
+down_revision = "0003_exchange_rate_unique"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "rate_backfill_days",
+        sa.Column("date", sa.Date(), primary_key=True),
+        sa.Column("status", sa.String(10), nullable=False),
+        sa.Column("fetched_at", sa.DateTime()),
+    )
+
+
+def downgrade():
+    op.drop_table("rate_backfill_days")
@@ -0,0 +1,43 @@
+"""transaction_monthly_rollups: aylık özet tablosu
+
+Tablo oluşturulduktan sonra mevcut işlemlerden doldurulur.
+
+Revision ID: 0005_transaction_monthly_rollups
+Revises: 0004_rate_backfill_days
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_transaction_monthly_rollups"
+down_revision = "0004_rate_backfill_days"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "transaction_monthly_rollups",
+        sa.Column("month", sa.Date(), primary_key=True),
+        sa.Column("project_id", sa.Integer(), primary_key=True),
+        sa.Column("category_id", sa.Integer(), primary_key=True),
+        sa.Column("type", sa.String(10), primary_key=True),
+        sa.Column("currency", sa.String(5), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("amount", sa.Numeric(18, 2), nullable=False, server_default="0"),
+        sa.Column("tl_total", sa.Numeric(18, 2), nullable=False, server_default="0"),
+    )
+    op.execute("""
+        INSERT INTO transaction_monthly_rollups (month, project_id, category_id, type, currency, count, amount, tl_total)
+        SELECT date_trunc('month', date)::date, project_id, category_id, type, currency,
+               count(*), coalesce(sum(amount), 0), coalesce(sum(tl_total), 0)
+        FROM transactions
+        WHERE date IS NOT NULL AND project_id IS NOT NULL AND category_id IS NOT NULL
+          AND type IS NOT NULL AND currency IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5
+    """)
+
+
+def downgrade():
+    op.drop_table("transaction_monthly_rollups")
@@ -0,0 +1,48 @@
+"""işlemler: sıralama ve filtreler için bileşik indeksler
+
+İşlem listesindeki her sıralama `(sütun, id)` çifti üzerinden yapılır (keyset sayfalama dahil);
+bu indeksler ilk sayfayı ve imleçten sonraki sayfaları sıralamasız bir indeks taramasıyla
+döndürür. Proje/kategori indeksleri tarih ile genişletilir (filtre + tarih aralığı/sıralama),
+tek sütunlu eski halleri gereksiz kaldığı için kaldırılır.
+
+Büyük tablolarda yazmaları kilitlememek için indeksler CONCURRENTLY oluşturulur.
+
+Revision ID: 0006_tx_sort_filter_indexes
+Revises: 0005_transaction_monthly_rollups
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0006_tx_sort_filter_indexes"
+down_revision = "0005_transaction_monthly_rollups"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_transactions_date_id", ["date", "id"]),
+    ("ix_transactions_amount_id", ["amount", "id"]),
+    ("ix_transactions_tl_total_id", ["tl_total", "id"]),
+    ("ix_transactions_created_at_id", ["created_at", "id"]),
+    ("ix_transactions_type_id", ["type", "id"]),
+    ("ix_transactions_currency_id", ["currency", "id"]),
+    ("ix_transactions_currency_date", ["currency", "date", "id"]),
+    ("ix_transactions_project_date", ["project_id", "date", "id"]),
+    ("ix_transactions_category_date", ["category_id", "date", "id"]),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, "transactions", columns, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index("ix_transactions_project_id", table_name="transactions", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_transactions_category_id", table_name="transactions", postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index("ix_transactions_project_id", "transactions", ["project_id"], postgresql_concurrently=True, if_not_exists=True)
+        op.create_index("ix_transactions_category_id", "transactions", ["category_id"], postgresql_concurrently=True, if_not_exists=True)
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name="transactions", postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,29 @@
+"""exchange_rates: tüm TCMB kur türleri
+
+Döviz satış ve efektif alış/satış kurları için sütunlar. Döviz alış (ForexBuying)
+mevcut rate_to_try sütununda kalır.
+
+Revision ID: 0007_exchange_rate_kinds
+Revises: 0006_tx_sort_filter_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_exchange_rate_kinds"
+down_revision = "0006_tx_sort_filter_indexes"
+branch_labels = None
+depends_on = None
+
+COLUMNS = ["forex_selling", "banknote_buying", "banknote_selling"]
+
+
+def upgrade():
+    for name in COLUMNS:
+        op.add_column("exchange_rates", sa.Column(name, sa.Numeric(), nullable=True))
+
+
+def downgrade():
+    for name in reversed(COLUMNS):
+        op.drop_column("exchange_rates", name)
@@ -0,0 +1,42 @@
+"""tl_total_recalc_jobs: tl_total yeniden hesaplama iş kuyruğu
+
+Revision ID: 0008_tl_total_recalc_jobs
+Revises: 0007_exchange_rate_kinds
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_tl_total_recalc_jobs"
+down_revision = "0007_exchange_rate_kinds"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "tl_total_recalc_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("currency", sa.String(5), nullable=False),
+        sa.Column("date_from", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(10), nullable=False, server_default="pending"),
+        sa.Column("total", sa.Integer()),
+        sa.Column("processed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("started_at", sa.DateTime()),
+        sa.Column("heartbeat_at", sa.DateTime()),
+        sa.Column("finished_at", sa.DateTime()),
+    )
+    op.create_index(
+        "uq_tl_total_recalc_jobs_pending", "tl_total_recalc_jobs", ["currency"],
+        unique=True, postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade():
+    op.drop_index("uq_tl_total_recalc_jobs_pending", table_name="tl_total_recalc_jobs")
+    op.drop_table("tl_total_recalc_jobs")
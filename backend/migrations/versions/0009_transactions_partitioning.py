@@ -0,0 +1,37 @@
+"""işlemler: tarih aralığına göre bölümleme (aylık/yıllık)
+
+`transactions` tablosu `date` üzerinden RANGE bölümlü tabloya çevrilir: mevcut veriler dönem
+bölümlerine kopyalanır, bugünden sonraki TRANSACTION_PARTITIONS_AHEAD dönemin bölümü önceden
+açılır, bölüm dışı tarihler `transactions_default` bölümüne düşer (bakım işi bunları ayırır).
+Birincil anahtar (id, date) olur; indeksler ve yabancı anahtarlar üst tabloda yeniden tanımlanır.
+
+Dönem türü TRANSACTION_PARTITION_INTERVAL ile seçilir (month, year veya none; varsayılan none).
+Varsayılanda göç tabloyu değiştirmez; dönüşüm bakım penceresinde `python partition_transactions.py
+convert` ile ya da göç TRANSACTION_PARTITION_INTERVAL=month ile çalıştırılarak yapılır. Dönüşüm
+tek transaction'dır ve süresince tabloya yazma bekler (200 bin satırda ~6 sn).
+
+Revision ID: 0009_transactions_partitioning
+Revises: 0008_tl_total_recalc_jobs
+Create Date: 2026-10-18
+"""
+import os
+
+from alembic import op
+
+from services.partitions import convert_to_partitioned, convert_to_plain
+
+
+revision = "0009_transactions_partitioning"
+down_revision = "0008_tl_total_recalc_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    interval = os.getenv("TRANSACTION_PARTITION_INTERVAL", "none")
+    if interval != "none":
+        convert_to_partitioned(op.get_bind(), interval)
+
+
+def downgrade():
+    convert_to_plain(op.get_bind())
@@ -1,4 +1,7 @@
 from .projects import Project
 from .category import Category
 from .transaction import Transaction
-from .exchange_rate import ExchangeRate
\ No newline at end of file
+from .exchange_rate import ExchangeRate
+from .rate_backfill import RateBackfillDay
+from .transaction_rollup import TransactionMonthlyRollup
+from .recalc_job import TlTotalRecalcJob
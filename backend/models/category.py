@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from database import Base
 
@@ -12,4 +12,6 @@ class Category(Base):
 
     __table_args__ = (
         UniqueConstraint("type", "name", name="unique_type_name"),
+        # pg_trgm: ILIKE '%...%' aramaları için
+        Index("ix_categories_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
     )
@@ -1,10 +1,18 @@
-from sqlalchemy import Column, Integer, String, Numeric, Date
+from sqlalchemy import Column, Integer, String, Numeric, Date, UniqueConstraint
 from database import Base
 
 class ExchangeRate(Base):
     __tablename__ = "exchange_rates"
 
     id = Column(Integer, primary_key=True)
-    currency = Column(String)  # ✅
-    rate_to_try = Column(Numeric)  # ✅
+    currency = Column(String)  # ✅ (her zaman büyük harf: USD, EUR ...)
+    rate_to_try = Column(Numeric)  # ✅ döviz alış (ForexBuying); TL karşılıkları bu kurla hesaplanır
+    forex_selling = Column(Numeric)
+    banknote_buying = Column(Numeric)
+    banknote_selling = Column(Numeric)
     date = Column(Date)  # ✅
+
+    __table_args__ = (
+        # Aynı gün için tek kur; (currency, date) bileşik indeksi bu kısıtla birlikte gelir
+        UniqueConstraint("currency", "date", name="uq_exchange_rates_currency_date"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy import Column, Integer, String, DateTime, Index, func
 from database import Base
 
 class Project(Base):
@@ -7,3 +7,8 @@ class Project(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), unique=True, index=True, nullable=False)
     created_at = Column(DateTime, default=func.now())
+
+    __table_args__ = (
+        # pg_trgm: ILIKE '%...%' aramaları için
+        Index("ix_projects_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, Date, DateTime
+from database import Base
+from datetime import datetime
+
+class RateBackfillDay(Base):
+    """Geçmiş kur aktarımının gün bazlı kontrol noktası (yarım kalan çalıştırmalar buradan devam eder)."""
+    __tablename__ = "rate_backfill_days"
+
+    date = Column(Date, primary_key=True)
+    status = Column(String(10), nullable=False)  # done: kurlar yazıldı, missing: TCMB'de kayıt yok (tatil vb.)
+    fetched_at = Column(DateTime, default=datetime.utcnow)
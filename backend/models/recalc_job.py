@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Index, text
+from database import Base
+from datetime import datetime
+
+class TlTotalRecalcJob(Base):
+    """Kur düzeltmesi/geç aktarım sonrası tl_total yeniden hesaplama işi (kuyruk + ilerleme)."""
+    __tablename__ = "tl_total_recalc_jobs"
+
+    id = Column(Integer, primary_key=True)
+    currency = Column(String(5), nullable=False)
+    date_from = Column(Date, nullable=False)      # bu tarihten itibaren as-of kuru değişmiş olabilecek işlemler
+    status = Column(String(10), nullable=False, default="pending")  # pending, running, done, failed
+    total = Column(Integer)                       # kapsamdaki işlem sayısı (başlarken hesaplanır)
+    processed = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    last_id = Column(Integer, nullable=False, default=0)  # kaldığı yer: bu id'ye kadar işlendi
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        # Para birimi başına tek bekleyen iş; yeni değişiklikler bu işin date_from'unu geri çeker
+        Index(
+            "uq_tl_total_recalc_jobs_pending", "currency",
+            unique=True, postgresql_where=text("status = 'pending'"),
+        ),
+    )
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String, Date, Float, Numeric, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Float, Numeric, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
 
 class Transaction(Base):
+    # 0009 göçünden sonra tablo `date` üzerinden bölümlüdür (DB'deki birincil anahtar: id, date)
     __tablename__ = "transactions"
     id = Column(Integer, primary_key=True, index=True)
     type = Column(String(10))
@@ -18,3 +19,24 @@ class Transaction(Base):
 
     project = relationship("Project")
     category = relationship("Category")
+
+    __table_args__ = (
+        # pg_trgm: arama kutusundaki ILIKE '%...%' koşulları için (tek GIN, her sütun ayrı kullanılabilir)
+        Index(
+            "ix_transactions_search_trgm",
+            "description", "type", "currency",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops", "type": "gin_trgm_ops", "currency": "gin_trgm_ops"},
+        ),
+        # Liste sıralamaları (sütun, id) çifti üzerinden yapılır; keyset sayfalama da bu sırayı kullanır
+        Index("ix_transactions_date_id", "date", "id"),
+        Index("ix_transactions_amount_id", "amount", "id"),
+        Index("ix_transactions_tl_total_id", "tl_total", "id"),
+        Index("ix_transactions_created_at_id", "created_at", "id"),
+        Index("ix_transactions_type_id", "type", "id"),
+        Index("ix_transactions_currency_id", "currency", "id"),
+        # Filtre + tarih aralığı/sıralaması (proje/kategori ayrıca arama alt sorgularında kullanılır)
+        Index("ix_transactions_currency_date", "currency", "date", "id"),
+        Index("ix_transactions_project_date", "project_id", "date", "id"),
+        Index("ix_transactions_category_date", "category_id", "date", "id"),
+    )
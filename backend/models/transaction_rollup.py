@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Date, Numeric
+from database import Base
+
+class TransactionMonthlyRollup(Base):
+    """Aylık işlem özetleri; işlem ekleme/güncelleme/silme sırasında artımlı güncellenir."""
+    __tablename__ = "transaction_monthly_rollups"
+
+    month = Column(Date, primary_key=True)  # ayın ilk günü
+    project_id = Column(Integer, primary_key=True)
+    category_id = Column(Integer, primary_key=True)
+    type = Column(String(10), primary_key=True)
+    currency = Column(String(5), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    amount = Column(Numeric(18, 2), nullable=False, default=0)
+    tl_total = Column(Numeric(18, 2), nullable=False, default=0)
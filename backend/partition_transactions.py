@@ -0,0 +1,45 @@
+"""`transactions` tablosunun tarih bölümlerini yönetir.
+
+Uygulama içi bakım iş parçacığı (PARTITION_MAINTENANCE=1, varsayılan) gelecek dönem bölümlerini
+kendisi açar; uygulama dışında (ör. cron) çalıştırmak veya elle dönüştürmek için:
+
+    python partition_transactions.py status                  # dönem türü ve bölümler
+    python partition_transactions.py ensure [--ahead 6]       # gelecek bölümleri aç, varsayılan bölümü ayır
+    python partition_transactions.py convert --interval year  # tek tabloyu bölümlü tabloya çevir
+"""
+import argparse
+
+from sqlalchemy import text
+
+from database import engine
+from services.partitions import (
+    DEFAULT_PARTITION, PARTITION_INTERVALS, PARTITIONS_AHEAD,
+    convert_to_partitioned, ensure_partitions, existing_partitions, partition_interval,
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status")
+    ensure = sub.add_parser("ensure")
+    ensure.add_argument("--ahead", type=int, default=PARTITIONS_AHEAD)
+    convert = sub.add_parser("convert")
+    convert.add_argument("--interval", choices=PARTITION_INTERVALS, default="month")
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        if args.command == "convert":
+            moved = convert_to_partitioned(conn, args.interval)
+            print(f"{moved} işlem bölümlü tabloya taşındı.")
+        elif args.command == "ensure":
+            created = ensure_partitions(conn, args.ahead)
+            print(f"{len(created)} bölüm oluşturuldu: {', '.join(created) or '-'}")
+        else:
+            interval = partition_interval(conn)
+            if interval is None:
+                print("transactions bölümlü değil.")
+            else:
+                print(f"Dönem türü: {interval}")
+                for name in existing_partitions(conn):
+                    count = conn.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+                    print(f"  {name:<28} {count:>12} satır" + ("  (varsayılan)" if name == DEFAULT_PARTITION else ""))
@@ -0,0 +1,28 @@
+"""Aylık işlem özet tablosunu (transaction_monthly_rollups) yeniden üretir veya doğrular.
+
+    python rebuild_rollups.py verify    # farklı kovaları listeler, fark varsa çıkış kodu 1
+    python rebuild_rollups.py rebuild   # tabloyu işlemlerden baştan hesaplar
+"""
+import argparse
+import sys
+
+from database import SessionLocal
+from services.rollups import rebuild_rollups, verify_rollups
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            print(f"{rebuild_rollups(db)} özet satırı oluşturuldu.")
+        else:
+            mismatches = verify_rollups(db)
+            for row in mismatches:
+                print(row)
+            print(f"{len(mismatches)} kova farklı.")
+            sys.exit(1 if mismatches else 0)
+    finally:
+        db.close()
@@ -0,0 +1,42 @@
+"""tl_total yeniden hesaplama işlerini ayrı bir süreçte çalıştırır veya kuyruğa ekler.
+
+Kur düzeltmeleri ve geç aktarımlar işleri otomatik olarak kuyruğa ekler; uygulama içi işçi
+(RECALC_WORKER=1, varsayılan) bunları çalıştırır. Uygulama dışında çalıştırmak için:
+
+    python recalc_tl_totals.py work                           # kuyruğu sürekli işler
+    python recalc_tl_totals.py work --once                    # kuyruk boşalınca çıkar
+    python recalc_tl_totals.py enqueue USD --from 2024-01-01  # elle iş ekler
+"""
+import argparse
+import time
+from datetime import date
+
+from database import SessionLocal
+from services.recalc_jobs import RECALC_POLL_INTERVAL, enqueue_recalc, run_pending_jobs
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    work = sub.add_parser("work")
+    work.add_argument("--once", action="store_true")
+    enqueue = sub.add_parser("enqueue")
+    enqueue.add_argument("currency")
+    enqueue.add_argument("--from", dest="date_from", type=date.fromisoformat, required=True)
+    args = parser.parse_args()
+
+    if args.command == "enqueue":
+        db = SessionLocal()
+        try:
+            enqueue_recalc(db, [(args.currency, args.date_from)])
+            db.commit()
+            print(f"{args.currency.upper()} için {args.date_from} itibarıyla iş kuyruğa eklendi.")
+        finally:
+            db.close()
+    else:
+        while True:
+            count = run_pending_jobs()
+            if count:
+                print(f"{count} iş çalıştırıldı.")
+            if args.once:
+                break
+            time.sleep(RECALC_POLL_INTERVAL)
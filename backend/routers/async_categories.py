@@ -0,0 +1,90 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
+from models import Category
+from services.pagination import name_list_statement, count_statement
+from services.lookups import lookup_cache
+from services.serialization import CATEGORY_FIELDS, list_response, rows_to_items
+from schemas import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryListResponse
+
+# routers/categories.py ile aynı uçlar, AsyncSession üzerinde (APP_ASYNC=1)
+router = APIRouter()
+
+# 📌 Kategori Listesi (arama + sayfalama + sıralama)
+@router.get("/categories", response_model=CategoryListResponse)
+async def get_categories(
+    search: str = Query("", description="Kategori adına göre ara"),
+    skip: int = 0,
+    limit: int = 10,
+    sort_by: str = Query("id", description="Sıralanacak sütun adı (id, type, name, created_at; arama varken relevance)"),
+    sort_order: str = Query("asc", description="Sıralama yönü: asc veya desc"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Hızlı yol: yalnızca yanıttaki sütunlar seçilir, satırlar doğrudan JSON'a kodlanır
+    columns = [getattr(Category, field) for field in CATEGORY_FIELDS]
+    stmt = name_list_statement(Category, search, sort_by, sort_order, ["id", "type", "name", "created_at"], columns=columns)
+
+    total = (await db.execute(count_statement(stmt, "exact"))).scalar()
+    result = (await db.execute(stmt.offset(skip).limit(limit)))
+    return list_response(total, rows_to_items(CATEGORY_FIELDS, result.keys(), result.all()))
+
+# 📌 Kategori Ekle
+@router.post("/categories", response_model=CategoryResponse)
+async def create_category(category: CategoryCreate, db: AsyncSession = Depends(get_async_db)):
+    if category.type.lower() not in ["gelir", "gider"]:
+        raise HTTPException(status_code=400, detail="Kategori tipi 'gelir' veya 'gider' olmalı.")
+
+    existing = (
+        await db.execute(
+            select(Category).where(Category.type == category.type, Category.name.ilike(category.name))
+        )
+    ).scalars().first()
+    if existing:
+        raise HTTPException(status_code=400, detail="Bu tip ve isimde kategori zaten var.")
+
+    new_category = Category(type=category.type, name=category.name)
+    db.add(new_category)
+    await db.commit()
+    lookup_cache.invalidate()
+    await db.refresh(new_category)
+    return new_category
+
+# 📌 Kategori Güncelle
+@router.put("/categories/{category_id}", response_model=CategoryResponse)
+async def update_category(category_id: int, updated: CategoryUpdate, db: AsyncSession = Depends(get_async_db)):
+    category = await db.get(Category, category_id)
+    if not category:
+        raise HTTPException(status_code=404, detail="Kategori bulunamadı.")
+
+    if updated.type.lower() not in ["gelir", "gider"]:
+        raise HTTPException(status_code=400, detail="Kategori tipi 'gelir' veya 'gider' olmalı.")
+
+    existing = (
+        await db.execute(
+            select(Category).where(
+                Category.type == updated.type, Category.name.ilike(updated.name), Category.id != category_id
+            )
+        )
+    ).scalars().first()
+    if existing:
+        raise HTTPException(status_code=400, detail="Bu tip ve isimde başka bir kategori var.")
+
+    category.type = updated.type
+    category.name = updated.name
+    await db.commit()
+    lookup_cache.invalidate()
+    await db.refresh(category)
+    return category
+
+# 📌 Kategori Sil
+@router.delete("/categories/{category_id}")
+async def delete_category(category_id: int, db: AsyncSession = Depends(get_async_db)):
+    category = await db.get(Category, category_id)
+    if not category:
+        raise HTTPException(status_code=404, detail="Kategori bulunamadı.")
+
+    await db.delete(category)
+    await db.commit()
+    lookup_cache.invalidate()
+    return {"message": "Kategori silindi."}
@@ -0,0 +1,47 @@
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
+from services.exchange_rates import fetch_and_store_exchange_rates_async, today_rates_cache, TCMB_URL
+
+# routers/exchange_rates.py ile aynı uçlar; TCMB isteği httpx.AsyncClient ile (APP_ASYNC=1)
+router = APIRouter()
+
+# Bağlantıları yeniden kullanmak için süreç başına tek istemci
+_client: httpx.AsyncClient = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(timeout=10)
+    return _client
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+# 📌 Güncel kurlar (DB'den, önbellekli; TCMB'ye istek atmaz)
+@router.get("/exchange-rates")
+async def get_exchange_rates(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    cached = await today_rates_cache.get_async(db)
+    headers = {
+        "ETag": cached["etag"],
+        "Cache-Control": f"public, max-age={today_rates_cache.ttl}",
+    }
+    if request.headers.get("if-none-match") == cached["etag"]:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return cached["body"]
+
+# 📌 Kurları TCMB'den hemen çek ve kaydet
+@router.post("/exchange-rates/refresh")
+async def refresh_exchange_rates(db: AsyncSession = Depends(get_async_db)):
+    result = await fetch_and_store_exchange_rates_async(db, get_http_client(), TCMB_URL)
+    if "error" in result:
+        raise HTTPException(status_code=502, detail=f"Kur verisi alınamadı: {result['error']}")
+    return result
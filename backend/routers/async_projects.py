@@ -0,0 +1,75 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
+from models import Project
+from services.pagination import name_list_statement, count_statement
+from services.lookups import lookup_cache
+from services.serialization import PROJECT_FIELDS, list_response, rows_to_items
+from schemas import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectListResponse
+
+# routers/projects.py ile aynı uçlar, AsyncSession üzerinde (APP_ASYNC=1)
+router = APIRouter()
+
+# 📌 Proje Listesi (arama + sayfalama)
+@router.get("/projects", response_model=ProjectListResponse)
+async def get_projects(
+    search: str = Query("", description="Proje adına göre ara"),
+    skip: int = 0,
+    limit: int = 10,
+    sort_by: str = Query("id", description="Sıralanacak sütun adı (id veya name; arama varken relevance)"),
+    sort_order: str = Query("asc", description="Sıralama yönü: asc veya desc"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Hızlı yol: yalnızca yanıttaki sütunlar seçilir, satırlar doğrudan JSON'a kodlanır
+    columns = [getattr(Project, field) for field in PROJECT_FIELDS]
+    stmt = name_list_statement(Project, search, sort_by, sort_order, ["id", "name", "created_at"], columns=columns)
+
+    total = (await db.execute(count_statement(stmt, "exact"))).scalar()
+    result = (await db.execute(stmt.offset(skip).limit(limit)))
+    return list_response(total, rows_to_items(PROJECT_FIELDS, result.keys(), result.all()))
+
+# 📌 Proje Ekle
+@router.post("/projects", response_model=ProjectResponse)
+async def create_project(project: ProjectCreate, db: AsyncSession = Depends(get_async_db)):
+    existing = (await db.execute(select(Project).where(Project.name.ilike(project.name)))).scalars().first()
+    if existing:
+        raise HTTPException(status_code=400, detail="Bu isimde bir proje zaten var.")
+
+    new_project = Project(name=project.name)
+    db.add(new_project)
+    await db.commit()
+    lookup_cache.invalidate()
+    await db.refresh(new_project)
+    return new_project
+
+# 📌 Proje Güncelle
+@router.put("/projects/{project_id}", response_model=ProjectResponse)
+async def update_project(project_id: int, updated: ProjectUpdate, db: AsyncSession = Depends(get_async_db)):
+    project = await db.get(Project, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Proje bulunamadı.")
+
+    existing = (
+        await db.execute(select(Project).where(Project.name.ilike(updated.name), Project.id != project_id))
+    ).scalars().first()
+    if existing:
+        raise HTTPException(status_code=400, detail="Bu isimde başka bir proje var.")
+
+    project.name = updated.name
+    await db.commit()
+    lookup_cache.invalidate()
+    await db.refresh(project)
+    return project
+
+# 📌 Proje Sil
+@router.delete("/projects/{project_id}")
+async def delete_project(project_id: int, db: AsyncSession = Depends(get_async_db)):
+    project = await db.get(Project, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Proje bulunamadı.")
+
+    await db.delete(project)
+    await db.commit()
+    lookup_cache.invalidate()
+    return {"message": "Proje silindi."}
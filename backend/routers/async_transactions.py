@@ -0,0 +1,94 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from database import get_async_db
+from models import Transaction
+from schemas import TransactionCreate, TransactionUpdate, TransactionListResponse, TransactionResponse
+from services.serialization import TRANSACTION_FIELDS, list_response, rows_to_items
+from services.transactions import TransactionFilters, transaction_page_statements
+from services.rate_table import calculate_tl_total_async
+from services.cross_rates import cross_rates, add_report_amounts
+from services.rollups import rollup_snapshot, collect_deltas, delta_statement
+
+# routers/transactions.py'deki liste ve CRUD uçları, AsyncSession üzerinde (APP_ASYNC=1).
+# Toplu ekleme ve dışa aktarma senkron router'da kalır.
+router = APIRouter()
+
+
+async def _apply_rollup_deltas(db: AsyncSession, items):
+    stmt = delta_statement(collect_deltas(items))
+    if stmt is not None:
+        await db.execute(stmt)
+
+# 📌 Tüm işlemleri listele (arama + sayfalama + sıralama)
+@router.get("/transactions", response_model=TransactionListResponse)
+async def get_transactions(
+    search: str = Query("", description="Açıklama veya proje/kategori adına göre ara"),
+    skip: int = 0,
+    limit: int = 10,
+    sort_by: str = Query("id", description="Sıralanacak sütun adı (arama varken 'relevance' da olabilir)"),
+    sort_order: str = Query("asc", description="Sıralama yönü: asc veya desc"),
+    after: Optional[str] = Query(None, description="İmleç tabanlı sayfalama: önceki yanıttaki next_cursor (verilirse skip yok sayılır)"),
+    count: str = Query("exact", description="Toplam sayım modu: exact, estimate veya none"),
+    report_currency: Optional[str] = Query(None, description="Verilirse her kayda bu para birimindeki karşılığı (report_amount) eklenir"),
+    filters: TransactionFilters = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    report_currency = await cross_rates.check_async(db, report_currency)
+    page_stmt, count_stmt, next_cursor = transaction_page_statements(
+        search, skip, limit, sort_by, sort_order, after, count, filters
+    )
+    total = (await db.execute(count_stmt)).scalar() if count_stmt is not None else None
+    result = (await db.execute(page_stmt))
+    records = result.all()
+
+    # Hızlı yol: satırlar TransactionResponse doğrulamasına girmeden kodlanır (JSON biçimi aynı)
+    items = rows_to_items(TRANSACTION_FIELDS, result.keys(), records)
+    if report_currency:
+        add_report_amounts(cross_rates.matrices(r["date"] for r in items), items, report_currency)
+        return list_response(total, items, next_cursor=next_cursor(records), report_currency=report_currency)
+    return list_response(total, items, next_cursor=next_cursor(records))
+
+# 📌 Yeni işlem ekle
+@router.post("/transactions", response_model=TransactionResponse)
+async def create_transaction(transaction: TransactionCreate, db: AsyncSession = Depends(get_async_db)):
+    # TL toplam hesapla (süreç içi kur tablosundan)
+    tl_total = await calculate_tl_total_async(db, transaction.amount, transaction.currency, transaction.date)
+
+    new_tr = Transaction(**transaction.dict(), tl_total=tl_total)
+    db.add(new_tr)
+    await _apply_rollup_deltas(db, [(rollup_snapshot(new_tr), 1)])
+    await db.commit()
+    await db.refresh(new_tr)
+    return new_tr
+
+# 📌 İşlem güncelle
+@router.put("/transactions/{transaction_id}", response_model=TransactionResponse)
+async def update_transaction(transaction_id: int, updated: TransactionUpdate, db: AsyncSession = Depends(get_async_db)):
+    tr = await db.get(Transaction, transaction_id)
+    if not tr:
+        raise HTTPException(status_code=404, detail="Kayıt bulunamadı.")
+
+    old = rollup_snapshot(tr)
+    for field, value in updated.dict(exclude_unset=True).items():
+        setattr(tr, field, value)
+
+    # TL toplamı güncelle
+    tr.tl_total = await calculate_tl_total_async(db, tr.amount, tr.currency, tr.date)
+    await _apply_rollup_deltas(db, [(old, -1), (rollup_snapshot(tr), 1)])
+
+    await db.commit()
+    await db.refresh(tr)
+    return tr
+
+# 📌 İşlem sil
+@router.delete("/transactions/{transaction_id}")
+async def delete_transaction(transaction_id: int, db: AsyncSession = Depends(get_async_db)):
+    tr = await db.get(Transaction, transaction_id)
+    if not tr:
+        raise HTTPException(status_code=404, detail="Kayıt bulunamadı.")
+
+    await _apply_rollup_deltas(db, [(rollup_snapshot(tr), -1)])
+    await db.delete(tr)
+    await db.commit()
+    return {"message": "Kayıt silindi."}
@@ -1,26 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from database import SessionLocal
+from database import get_db
 from models.user import User
 from schemas.user import UserCreate, UserLogin, UserOut
-from auth import hash_password, verify_password, create_access_token
+from auth import hash_password_async, verify_and_update_password_async, create_access_token
+from services.login_throttle import ip_limiter, email_limiter
+from services.passwords import PasswordPoolBusy
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 
-@router.post("/register", response_model=UserOut)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == user.email).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Bu e-posta zaten kayıtlı.")
-    
-    hashed = hash_password(user.password)
+def _client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def _check_throttle(limiter, key: str):
+    retry_after = limiter.retry_after(key)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=429,
+            detail="Çok fazla deneme yapıldı. Lütfen daha sonra tekrar deneyin.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def _hash_busy():
+    return HTTPException(
+        status_code=503,
+        detail="Sunucu şu anda yoğun. Lütfen tekrar deneyin.",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _find_user(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
+def _save_user(db: Session, user: UserCreate, hashed: str) -> User:
     new_user = User(
                         email=user.email,
                         hashed_password=hashed,  # ← Doğru alan adı bu
@@ -35,11 +52,58 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     db.refresh(new_user)
     return new_user
 
+
+def _update_hash(db: Session, db_user: User, new_hash: str):
+    db_user.hashed_password = new_hash
+    db.commit()
+
+
+# Uçlar async: bcrypt süreç havuzunda beklenirken threadpool thread'i tutulmaz,
+# senkron DB işleri run_in_threadpool ile yapılır
+@router.post("/register", response_model=UserOut)
+async def register(user: UserCreate, request: Request, db: Session = Depends(get_db)):
+    ip = _client_ip(request)
+    _check_throttle(ip_limiter, ip)
+    ip_limiter.hit(ip)
+
+    existing = await run_in_threadpool(_find_user, db, user.email)
+    if existing:
+        raise HTTPException(status_code=400, detail="Bu e-posta zaten kayıtlı.")
+    
+    try:
+        hashed = await hash_password_async(user.password)
+    except PasswordPoolBusy:
+        raise _hash_busy()
+    return await run_in_threadpool(_save_user, db, user, hashed)
+
 @router.post("/login")
-def login(user: UserLogin, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+async def login(user: UserLogin, request: Request, db: Session = Depends(get_db)):
+    # Hash maliyeti harcanmadan önce IP ve e-posta sınırları denetlenir
+    ip = _client_ip(request)
+    email_key = user.email.lower()
+    _check_throttle(ip_limiter, ip)
+    _check_throttle(email_limiter, email_key)
+    ip_limiter.hit(ip)
+
+    db_user = await run_in_threadpool(_find_user, db, user.email)
+    valid, new_hash = False, None
+    if db_user:
+        try:
+            valid, new_hash = await verify_and_update_password_async(user.password, db_user.hashed_password)
+        except PasswordPoolBusy:
+            raise _hash_busy()
+    if not valid:
+        email_limiter.hit(email_key)
         raise HTTPException(status_code=401, detail="Geçersiz e-posta veya şifre.")
+    email_limiter.reset(email_key)
+
+    # id/rol claim'leri AUTH_TRUST_CLAIMS=1 iken DB'siz yetkilendirmeye izin verir
+    # (commit sonrası nesne süresi dolacağından alanlar önceden okunur; event loop'ta sorgu atılmaz)
+    claims = {"sub": db_user.email, "uid": db_user.id, "role": db_user.role}
+
+    # bcrypt maliyeti değiştiyse şifre yeni ayarla yeniden hash'lenir
+    if new_hash:
+        await run_in_threadpool(_update_hash, db, db_user, new_hash)
 
-    token = create_access_token({"sub": db_user.email})
+    token = create_access_token(claims)
     return {"access_token": token, "token_type": "bearer"}
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, get_read_db
 from models import Category
+from services.pagination import name_list_statement, count_statement
+from services.lookups import lookup_cache
+from services.serialization import CATEGORY_FIELDS, list_response, rows_to_items
 from schemas import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryListResponse
 
 router = APIRouter()
@@ -12,26 +15,17 @@ def get_categories(
     search: str = Query("", description="Kategori adına göre ara"),
     skip: int = 0,
     limit: int = 10,
-    sort_by: str = Query("id", description="Sıralanacak sütun adı (id, type, name, created_at)"),
+    sort_by: str = Query("id", description="Sıralanacak sütun adı (id, type, name, created_at; arama varken relevance)"),
     sort_order: str = Query("asc", description="Sıralama yönü: asc veya desc"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    query = db.query(Category)
-    if search:
-        query = query.filter(Category.name.ilike(f"%{search}%"))
+    # Hızlı yol: yalnızca yanıttaki sütunlar seçilir, satırlar doğrudan JSON'a kodlanır
+    columns = [getattr(Category, field) for field in CATEGORY_FIELDS]
+    stmt = name_list_statement(Category, search, sort_by, sort_order, ["id", "type", "name", "created_at"], columns=columns)
 
-    if sort_by not in ["id", "type", "name", "created_at"]:
-        sort_by = "id"
-
-    sort_column = getattr(Category, sort_by)
-    if sort_order.lower() == "desc":
-        sort_column = sort_column.desc()
-
-    query = query.order_by(sort_column)
-
-    total = query.count()
-    categories = query.offset(skip).limit(limit).all()
-    return {"total": total, "items": categories}
+    total = db.execute(count_statement(stmt, "exact")).scalar()
+    result = db.execute(stmt.offset(skip).limit(limit))
+    return list_response(total, rows_to_items(CATEGORY_FIELDS, result.keys(), result.all()))
 
 # 📌 Kategori Ekle
 @router.post("/categories", response_model=CategoryResponse)
@@ -50,6 +44,7 @@ def create_category(category: CategoryCreate, db: Session = Depends(get_db)):
     new_category = Category(type=category.type, name=category.name)
     db.add(new_category)
     db.commit()
+    lookup_cache.invalidate()
     db.refresh(new_category)
     return new_category
 
@@ -74,6 +69,7 @@ def update_category(category_id: int, updated: CategoryUpdate, db: Session = Dep
     category.type = updated.type
     category.name = updated.name
     db.commit()
+    lookup_cache.invalidate()
     db.refresh(category)
     return category
 
@@ -86,4 +82,5 @@ def delete_category(category_id: int, db: Session = Depends(get_db)):
 
     db.delete(category)
     db.commit()
+    lookup_cache.invalidate()
     return {"message": "Kategori silindi."}
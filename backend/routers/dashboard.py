@@ -0,0 +1,64 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from database import get_read_db, pinned_to_primary
+from services.exchange_rates import today_rates_cache
+from services.lookups import lookup_cache
+from services.serialization import TRANSACTION_FIELDS, rows_to_items
+from services.transactions import TransactionFilters, transaction_page_statements
+
+router = APIRouter()
+
+# Uçlar replikadan okur. Önbellekler paylaşıldığından yazmadan hemen sonra gecikmeli bir
+# replikadan yeniden dolmuş olabilir; birincile sabitli istemci için önbellek birincilden tazelenir.
+
+# 📌 Proje/kategori listeleri (önbellekli, ETag/304)
+@router.get("/dashboard/lookups")
+def get_lookups(request: Request, response: Response, db: Session = Depends(get_read_db)):
+    cached = lookup_cache.get(db, fresh=pinned_to_primary())
+    headers = {"ETag": cached["etag"], "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == cached["etag"]:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return cached["body"]
+
+# 📌 Sayfa açılışı için tek istek: listeler + güncel kurlar + ilk işlem sayfası
+@router.get("/dashboard/bootstrap")
+def get_bootstrap(
+    response: Response,
+    search: str = Query("", description="Açıklama veya proje/kategori adına göre ara"),
+    skip: int = 0,
+    limit: int = 10,
+    sort_by: str = Query("id", description="Sıralanacak sütun adı"),
+    sort_order: str = Query("asc", description="Sıralama yönü: asc veya desc"),
+    count: str = Query("exact", description="Toplam sayım modu: exact, estimate veya none"),
+    lookups_etag: Optional[str] = Query(None, description="Elde olan listelerin ETag'i; değişmediyse lookups boş döner"),
+    filters: TransactionFilters = Depends(),
+    db: Session = Depends(get_read_db)
+):
+    fresh = pinned_to_primary()
+    lookups = lookup_cache.get(db, fresh=fresh)
+    rates = today_rates_cache.get(db, fresh=fresh)
+
+    page_stmt, count_stmt, next_cursor = transaction_page_statements(
+        search, skip, limit, sort_by, sort_order, None, count, filters
+    )
+    total = db.execute(count_stmt).scalar() if count_stmt is not None else None
+    result = db.execute(page_stmt)
+    records = result.all()
+
+    response.headers["Cache-Control"] = "no-store"
+    return {
+        "lookups_etag": lookups["etag"],
+        # İstemcideki listeler güncelse tekrar gönderilmez
+        "lookups": None if lookups_etag == lookups["etag"] else lookups["body"],
+        "rates": rates["body"],
+        "transactions": {
+            "total": total,
+            "items": rows_to_items(TRANSACTION_FIELDS, result.keys(), records),
+            "next_cursor": next_cursor(records),
+        },
+    }
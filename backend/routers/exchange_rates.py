@@ -1,57 +1,28 @@
-import requests
-import xml.etree.ElementTree as ET
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from database import get_db
-from models import ExchangeRate
-from datetime import date
+from services.exchange_rates import fetch_and_store_exchange_rates, today_rates_cache, TCMB_URL
 
 router = APIRouter()
 
+# 📌 Güncel kurlar (DB'den, önbellekli; TCMB'ye istek atmaz)
 @router.get("/exchange-rates")
-def get_and_save_exchange_rates(db: Session = Depends(get_db)):
-    url = "https://www.tcmb.gov.tr/kurlar/today.xml"
-    response = requests.get(url)
-    response.encoding = "utf-8"
-
-    if response.status_code != 200:
-        return {"error": "Kur verisi alınamadı"}
-
-    root = ET.fromstring(response.text)
-    tarih = root.attrib.get("Tarih", "")
-    today = date.today()
-
-    allowed_codes = ["USD", "EUR", "CHF", "GBP", "CAD"]
-    data = []
-
-    for currency in root.findall("Currency"):
-        code = currency.get("CurrencyCode")
-        if code not in allowed_codes:
-            continue
-
-        forex_buying = currency.find("ForexBuying").text
-
-        if forex_buying is None or forex_buying == "":
-            continue
-
-        rate = float(forex_buying.replace(",", "."))
-
-        # ✅ Eğer aynı gün ve para birimi varsa, güncelle
-        existing = db.query(ExchangeRate).filter_by(currency=code, date=today).first()
-        if existing:
-            existing.rate_to_try = rate
-        else:
-            db.add(ExchangeRate(currency=code, rate_to_try=rate, date=today))
-
-        data.append({
-            "code": code,
-            "rate": rate
-        })
-
-    db.commit()
-
-    return {
-        "date": tarih,
-        "message": "Veriler kaydedildi.",
-        "saved_rates": data
+def get_exchange_rates(request: Request, response: Response, db: Session = Depends(get_db)):
+    cached = today_rates_cache.get(db)
+    headers = {
+        "ETag": cached["etag"],
+        "Cache-Control": f"public, max-age={today_rates_cache.ttl}",
     }
+    if request.headers.get("if-none-match") == cached["etag"]:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return cached["body"]
+
+# 📌 Kurları TCMB'den hemen çek ve kaydet (arka plan görevi beklenmeden)
+@router.post("/exchange-rates/refresh")
+def refresh_exchange_rates(db: Session = Depends(get_db)):
+    result = fetch_and_store_exchange_rates(db, TCMB_URL)
+    if "error" in result:
+        raise HTTPException(status_code=502, detail=f"Kur verisi alınamadı: {result['error']}")
+    return result
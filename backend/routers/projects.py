@@ -1,7 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, get_read_db
 from models import Project
+from services.pagination import name_list_statement, count_statement
+from services.lookups import lookup_cache
+from services.serialization import PROJECT_FIELDS, list_response, rows_to_items
 from schemas import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectListResponse
 from typing import List
 
@@ -13,27 +16,17 @@ def get_projects(
     search: str = Query("", description="Proje adına göre ara"),
     skip: int = 0,
     limit: int = 10,
-    sort_by: str = Query("id", description="Sıralanacak sütun adı (id veya name)"),
+    sort_by: str = Query("id", description="Sıralanacak sütun adı (id veya name; arama varken relevance)"),
     sort_order: str = Query("asc", description="Sıralama yönü: asc veya desc"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    query = db.query(Project)
-    if search:
-        query = query.filter(Project.name.ilike(f"%{search}%"))
+    # Hızlı yol: yalnızca yanıttaki sütunlar seçilir, satırlar doğrudan JSON'a kodlanır
+    columns = [getattr(Project, field) for field in PROJECT_FIELDS]
+    stmt = name_list_statement(Project, search, sort_by, sort_order, ["id", "name", "created_at"], columns=columns)
 
-    # Geçerli sütun mu kontrol et
-    if sort_by not in ["id", "name", "created_at"]:
-        sort_by = "id"
-
-    # Sıralama
-    sort_column = getattr(Project, sort_by)
-    if sort_order.lower() == "desc":
-        sort_column = sort_column.desc()
-    query = query.order_by(sort_column)
-
-    total = query.count()
-    projects = query.offset(skip).limit(limit).all()
-    return {"total": total, "items": projects}
+    total = db.execute(count_statement(stmt, "exact")).scalar()
+    result = db.execute(stmt.offset(skip).limit(limit))
+    return list_response(total, rows_to_items(PROJECT_FIELDS, result.keys(), result.all()))
 
 # 📌 Proje Ekle
 @router.post("/projects", response_model=ProjectResponse)
@@ -45,6 +38,7 @@ def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
     new_project = Project(name=project.name)
     db.add(new_project)
     db.commit()
+    lookup_cache.invalidate()
     db.refresh(new_project)
     return new_project
 
@@ -65,6 +59,7 @@ def update_project(project_id: int, updated: ProjectUpdate, db: Session = Depend
 
     project.name = updated.name
     db.commit()
+    lookup_cache.invalidate()
     db.refresh(project)
     return project
 
@@ -77,4 +72,5 @@ def delete_project(project_id: int, db: Session = Depends(get_db)):
 
     db.delete(project)
     db.commit()
+    lookup_cache.invalidate()
     return {"message": "Proje silindi."}
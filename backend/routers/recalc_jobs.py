@@ -0,0 +1,46 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database import get_db
+from models import TlTotalRecalcJob
+from services.recalc_jobs import enqueue_recalc, job_to_dict
+
+router = APIRouter()
+
+# 📌 tl_total yeniden hesaplamayı elle başlat (kur düzeltmeleri zaten otomatik kuyruğa girer)
+@router.post("/recalc-jobs")
+def create_recalc_job(
+    currency: str = Query(..., description="Para birimi (USD, EUR ...)"),
+    date_from: date = Query(..., description="Bu tarih ve sonrasındaki işlemler yeniden hesaplanır"),
+    db: Session = Depends(get_db)
+):
+    if currency.upper() in ["TL", "TRY"]:
+        raise HTTPException(status_code=400, detail="TL işlemlerinin tl_total'ı kurdan bağımsızdır.")
+    enqueue_recalc(db, [(currency, date_from)])
+    db.commit()
+    job = db.execute(
+        select(TlTotalRecalcJob)
+        .where(TlTotalRecalcJob.currency == currency.upper(), TlTotalRecalcJob.status == "pending")
+    ).scalars().first()
+    if job is None:
+        raise HTTPException(status_code=409, detail="İş oluşturulamadı, tekrar deneyin.")
+    return job_to_dict(job)
+
+# 📌 Son işler
+@router.get("/recalc-jobs")
+def list_recalc_jobs(limit: int = Query(20, ge=1, le=200), db: Session = Depends(get_db)):
+    jobs = db.execute(
+        select(TlTotalRecalcJob).order_by(TlTotalRecalcJob.id.desc()).limit(limit)
+    ).scalars().all()
+    return [job_to_dict(job) for job in jobs]
+
+# 📌 İş ilerlemesi
+@router.get("/recalc-jobs/{job_id}")
+def get_recalc_job(job_id: int, db: Session = Depends(get_db)):
+    job = db.get(TlTotalRecalcJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="İş bulunamadı.")
+    return job_to_dict(job)
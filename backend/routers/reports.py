@@ -0,0 +1,68 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from database import get_read_db
+from services.cash_flow import BUCKETS, DEFAULT_MAX_POINTS, balance_series
+from services.cross_rates import cross_rates
+from services.reports import summarize_transactions
+from services.revaluation import MAX_VALUATION_DATES, STEPS, numpy_available, revaluation_report, valuation_dates
+from services.transactions import TransactionFilters
+
+router = APIRouter()
+
+# 📌 Özet rapor: gruplara göre TL toplamı ve işlem sayısı (sütun bazlı JSON)
+@router.get("/reports/summary")
+def get_summary(
+    group_by: List[str] = Query([], description="type, project_id, category_id, currency, day, week, month"),
+    report_currency: Optional[str] = Query(None, description="Verilirse bu para birimindeki toplam (report_total) eklenir, ör. USD"),
+    filters: TransactionFilters = Depends(),
+    db: Session = Depends(get_read_db)
+):
+    report_currency = cross_rates.check(db, report_currency)
+    return summarize_transactions(db, group_by, filters, report_currency)
+
+# 📌 Döviz pozisyonlarının yeniden değerlemesi: proje bazında gerçekleşmemiş kur farkı
+@router.get("/reports/revaluation")
+def get_revaluation(
+    valuation_date: List[date] = Query([], description="Değerleme tarihleri (tekrarlanabilir)"),
+    date_from: Optional[date] = Query(None, description="valuation_date yoksa: aralık başlangıcı"),
+    date_to: Optional[date] = Query(None, description="valuation_date yoksa: aralık sonu"),
+    step: str = Query("month", description="Aralık adımı: day, week veya month (ay sonları)"),
+    project_id: List[int] = Query([], description="Proje id'leri (tekrarlanabilir)"),
+    by_currency: bool = Query(False, description="Para birimi kırılımı (pozisyon ve kur ile)"),
+    db: Session = Depends(get_read_db)
+):
+    if not numpy_available():
+        raise HTTPException(status_code=400, detail="Yeniden değerleme için numpy kurulu olmalı.")
+    if step not in STEPS:
+        raise HTTPException(status_code=400, detail="Geçersiz adım. day, week veya month olmalı.")
+
+    dates = valuation_date
+    if not dates:
+        if date_from and date_to:
+            if date_from > date_to:
+                raise HTTPException(status_code=400, detail="date_from, date_to'dan büyük olamaz.")
+            dates = valuation_dates(date_from, date_to, step)
+        else:
+            dates = [date.today()]
+    if len(dates) > MAX_VALUATION_DATES:
+        raise HTTPException(status_code=400, detail=f"En fazla {MAX_VALUATION_DATES} değerleme tarihi verilebilir.")
+
+    return revaluation_report(db, dates, project_id, by_currency)
+
+# 📌 Nakit akışı: proje bazında kova başına net akış ve kümülatif bakiye (boş kovalar dahil)
+@router.get("/reports/balance")
+def get_balance_series(
+    bucket: str = Query("day", description="day, week, month, quarter veya year"),
+    date_from: Optional[date] = Query(None, description="Boşsa ilk işlem tarihi"),
+    date_to: Optional[date] = Query(None, description="Boşsa son işlem tarihi"),
+    project_id: List[int] = Query([], description="Proje id'leri (tekrarlanabilir)"),
+    max_points: int = Query(DEFAULT_MAX_POINTS, ge=1, le=5000, description="Proje başına en fazla kova; aşılırsa kova büyütülür"),
+    db: Session = Depends(get_read_db)
+):
+    if bucket not in BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Geçersiz kova. {', '.join(BUCKETS)} olmalı.")
+    return balance_series(db, bucket, date_from, date_to, project_id, max_points)
@@ -1,9 +1,19 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+import codecs
+import csv
+from fastapi import APIRouter, HTTPException, Depends, Query, Body, File, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from database import get_db
-from models import Transaction, Project, Category, ExchangeRate
-from schemas import TransactionCreate, TransactionUpdate, TransactionListResponse, TransactionResponse
+from typing import Any, List, Optional
+from database import get_db, get_read_db
+from models import Transaction
+from schemas import TransactionCreate, TransactionUpdate, TransactionListResponse, TransactionResponse, BulkImportResponse
+from services.serialization import TRANSACTION_FIELDS, list_response, rows_to_items
+from services.transactions import TransactionFilters, transaction_list_statement, order_transactions, transaction_page_statements
+from services.rate_table import calculate_tl_total
+from services.cross_rates import cross_rates, add_report_amounts
+from services.bulk_import import import_transactions, DEFAULT_CHUNK_SIZE
+from services.export import STREAMERS, EXPORT_FORMATS, xlsx_available
+from services.rollups import rollup_snapshot, record_insert, record_update, record_delete
 
 router = APIRouter()
 
@@ -13,110 +23,88 @@ def get_transactions(
     search: str = Query("", description="Açıklama veya proje/kategori adına göre ara"),
     skip: int = 0,
     limit: int = 10,
+    sort_by: str = Query("id", description="Sıralanacak sütun adı (arama varken 'relevance' da olabilir)"),
+    sort_order: str = Query("asc", description="Sıralama yönü: asc veya desc"),
+    after: Optional[str] = Query(None, description="İmleç tabanlı sayfalama: önceki yanıttaki next_cursor (verilirse skip yok sayılır)"),
+    count: str = Query("exact", description="Toplam sayım modu: exact, estimate veya none"),
+    report_currency: Optional[str] = Query(None, description="Verilirse her kayda bu para birimindeki karşılığı (report_amount) eklenir"),
+    filters: TransactionFilters = Depends(),
+    db: Session = Depends(get_read_db)
+):
+    report_currency = cross_rates.check(db, report_currency)
+    page_stmt, count_stmt, next_cursor = transaction_page_statements(
+        search, skip, limit, sort_by, sort_order, after, count, filters
+    )
+    total = db.execute(count_stmt).scalar() if count_stmt is not None else None
+    result = db.execute(page_stmt)
+    records = result.all()
+
+    # Hızlı yol: satırlar TransactionResponse doğrulamasına girmeden kodlanır (JSON biçimi aynı)
+    items = rows_to_items(TRANSACTION_FIELDS, result.keys(), records)
+    if report_currency:
+        # Çevrim, tarih başına önbellekteki çapraz kur matrisinden toplu yapılır
+        add_report_amounts(cross_rates.matrices(r["date"] for r in items), items, report_currency)
+        return list_response(total, items, next_cursor=next_cursor(records), report_currency=report_currency)
+    return list_response(total, items, next_cursor=next_cursor(records))
+
+# 📌 İşlemleri dışa aktar (CSV / NDJSON / XLSX, listeyle aynı arama, filtre ve sıralama)
+@router.get("/transactions/export")
+def export_transactions(
+    format: str = Query("csv", description="csv, ndjson veya xlsx"),
+    search: str = Query("", description="Açıklama veya proje/kategori adına göre ara"),
     sort_by: str = Query("id", description="Sıralanacak sütun adı"),
     sort_order: str = Query("asc", description="Sıralama yönü: asc veya desc"),
-    db: Session = Depends(get_db)
+    filters: TransactionFilters = Depends(),
 ):
-    # JOIN ile proje ve kategori adlarını almak
-    query = (
-        db.query(
-            Transaction.id,
-            Transaction.type,
-            Transaction.project_id,
-            Transaction.category_id,
-            Project.name.label("project_name"),
-            Category.name.label("category_name"),
-            Transaction.date,
-            Transaction.amount,
-            Transaction.currency,
-            Transaction.description,
-            Transaction.tl_total,
-            Transaction.created_at,
-        )
-        .join(Project, Transaction.project_id == Project.id)
-        .join(Category, Transaction.category_id == Category.id)
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Geçersiz format. csv, ndjson veya xlsx olmalı.")
+    if format == "xlsx" and not xlsx_available():
+        raise HTTPException(status_code=400, detail="XLSX dışa aktarımı için openpyxl kurulu olmalı.")
+
+    stmt = order_transactions(transaction_list_statement(search, filters), sort_by, sort_order)[0]
+
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        STREAMERS[format](stmt),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="islemler.{extension}"'},
     )
 
-    # Arama
-    if search:
-        query = query.filter(
-            (Project.name.ilike(f"%{search}%")) |
-            (Category.name.ilike(f"%{search}%")) |
-            (Transaction.type.ilike(f"%{search}%")) |
-            (Transaction.currency.ilike(f"%{search}%")) |
-            (Transaction.description.ilike(f"%{search}%"))
-        )
-
-    # Sıralama
-    valid_sort_columns = {
-        "id": Transaction.id,
-        "type": Transaction.type,
-        "project_name": Project.name,
-        "category_name": Category.name,
-        "date": Transaction.date,
-        "amount": Transaction.amount,
-        "currency": Transaction.currency,
-        "created_at": Transaction.created_at,
-        "tl_total": Transaction.tl_total,
-    }
-    sort_column = valid_sort_columns.get(sort_by, Transaction.id)
-    if sort_order.lower() == "desc":
-        sort_column = sort_column.desc()
-
-    query = query.order_by(sort_column)
-
-    total = query.count()
-    records = query.offset(skip).limit(limit).all()
-
-    items = [
-        {
-            "id": r.id,
-            "type": r.type,
-            "project_id": r.project_id,          # düzelt
-            "category_id": r.category_id,        # düzelt
-            "project_name": r.project_name,
-            "category_name": r.category_name,
-            "date": r.date,
-            "amount": r.amount,
-            "currency": r.currency,
-            "description": r.description,
-            "tl_total": r.tl_total,
-            "created_at": r.created_at,
-        }
-        for r in records
-    ]
-
-    return {"total": total, "items": items}
-
 # 📌 Yeni işlem ekle
 @router.post("/transactions", response_model=TransactionResponse)
 def create_transaction(transaction: TransactionCreate, db: Session = Depends(get_db)):
-    # TL toplam hesapla
-    tl_total = transaction.amount
-    if transaction.currency.upper() not in ["TL", "TRY"]:
-        rate = (
-            db.query(ExchangeRate)
-            .filter(
-                func.upper(ExchangeRate.currency) == transaction.currency.upper(),
-                ExchangeRate.date <= transaction.date
-            )
-            .order_by(ExchangeRate.date.desc())
-            .first()
-        )
-        if rate and rate.rate_to_try:
-            try:
-                tl_total = float(transaction.amount) * float(rate.rate_to_try)
-            except Exception:
-                tl_total = None
-        else:
-            tl_total = None
+    # TL toplam hesapla (süreç içi kur tablosundan)
+    tl_total = calculate_tl_total(db, transaction.amount, transaction.currency, transaction.date)
 
     new_tr = Transaction(**transaction.dict(), tl_total=tl_total)
     db.add(new_tr)
+    record_insert(db, new_tr)
     db.commit()
     db.refresh(new_tr)
     return new_tr
 
+# 📌 Toplu işlem ekle (JSON dizi)
+@router.post("/transactions/bulk", response_model=BulkImportResponse)
+def bulk_create_transactions(
+    rows: List[Any] = Body(..., description="TransactionCreate alanlarına sahip nesne dizisi"),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=10000, description="Tek seferde eklenecek satır sayısı"),
+    db: Session = Depends(get_db)
+):
+    return import_transactions(db, rows, chunk_size)
+
+# 📌 Toplu işlem ekle (CSV dosyası; başlık satırı: type,project_id,category_id,date,amount,currency,description)
+@router.post("/transactions/bulk/csv", response_model=BulkImportResponse)
+def bulk_create_transactions_csv(
+    file: UploadFile = File(...),
+    delimiter: str = Query(",", max_length=1, description="Alan ayracı"),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=10000, description="Tek seferde eklenecek satır sayısı"),
+    db: Session = Depends(get_db)
+):
+    # Dosya belleğe alınmadan satır satır okunur
+    reader = csv.DictReader(codecs.iterdecode(file.file, "utf-8-sig"), delimiter=delimiter)
+    rows = ({k: (v if v != "" else None) for k, v in r.items()} for r in reader)
+    return import_transactions(db, rows, chunk_size)
+
 # 📌 İşlem güncelle
 @router.put("/transactions/{transaction_id}", response_model=TransactionResponse)
 def update_transaction(transaction_id: int, updated: TransactionUpdate, db: Session = Depends(get_db)):
@@ -124,30 +112,14 @@ def update_transaction(transaction_id: int, updated: TransactionUpdate, db: Sess
     if not tr:
         raise HTTPException(status_code=404, detail="Kayıt bulunamadı.")
 
+    old = rollup_snapshot(tr)
     for field, value in updated.dict(exclude_unset=True).items():
         setattr(tr, field, value)
 
     # TL toplamı güncelle
-    tl_total = tr.amount
-    if tr.currency.upper() not in ["TL", "TRY"]:
-        rate = (
-            db.query(ExchangeRate)
-            .filter(
-                func.upper(ExchangeRate.currency) == tr.currency.upper(),
-                ExchangeRate.date <= tr.date
-            )
-            .order_by(ExchangeRate.date.desc())
-            .first()
-        )
-        if rate and rate.rate_to_try:
-            try:
-                tl_total = float(tr.amount) * float(rate.rate_to_try)
-            except Exception:
-                tl_total = None
-        else:
-            tl_total = None
-
+    tl_total = calculate_tl_total(db, tr.amount, tr.currency, tr.date)
     tr.tl_total = tl_total
+    record_update(db, old, tr)
 
     db.commit()
     db.refresh(tr)
@@ -160,6 +132,7 @@ def delete_transaction(transaction_id: int, db: Session = Depends(get_db)):
     if not tr:
         raise HTTPException(status_code=404, detail="Kayıt bulunamadı.")
 
+    record_delete(db, tr)
     db.delete(tr)
     db.commit()
     return {"message": "Kayıt silindi."}
@@ -4,5 +4,6 @@ from .transaction import (
     TransactionCreate,
     TransactionUpdate,
     TransactionListResponse,
-    TransactionResponse
+    TransactionResponse,
+    BulkImportResponse,
 )
\ No newline at end of file
@@ -29,9 +29,23 @@ class TransactionResponse(TransactionBase):
     class Config:
         orm_mode = True
 
+class TransactionListItem(TransactionResponse):
+    report_amount: Optional[float] = None  # report_currency verilirse, işlem tarihi kuruyla karşılığı
+
 class TransactionListResponse(BaseModel):
-    total: int
-    items: List[TransactionResponse]
+    total: Optional[int] = None  # count=none ise boş döner
+    items: List[TransactionListItem]
+    next_cursor: Optional[str] = None  # sonraki sayfa için `after` token
+    report_currency: Optional[str] = None
 
     class Config:
         orm_mode = True
+
+class BulkImportError(BaseModel):
+    row: int  # girdideki 1'den başlayan satır numarası
+    error: str
+
+class BulkImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[BulkImportError]
@@ -0,0 +1,133 @@
+import csv
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert, literal, select, union_all
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models import Transaction, Project, Category
+from schemas import TransactionCreate
+from services.rate_table import calculate_tl_total
+from services.rollups import apply_deltas, collect_deltas
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _chunks(rows: Iterable[dict], size: int) -> Iterator[List[Tuple[int, dict]]]:
+    numbered = enumerate(rows, start=1)
+    while True:
+        chunk = list(islice(numbered, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _format_validation_error(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors())
+
+
+def _existing_ids(db: Session, project_ids: set, category_ids: set) -> Tuple[set, set]:
+    """Parçadaki proje ve kategori id'lerini tek sorguda doğrular."""
+    parts = []
+    if project_ids:
+        parts.append(select(literal("p").label("kind"), Project.id).where(Project.id.in_(project_ids)))
+    if category_ids:
+        parts.append(select(literal("c").label("kind"), Category.id).where(Category.id.in_(category_ids)))
+    if not parts:
+        return set(), set()
+
+    found_projects, found_categories = set(), set()
+    for kind, id_ in db.execute(union_all(*parts) if len(parts) > 1 else parts[0]):
+        (found_projects if kind == "p" else found_categories).add(id_)
+    return found_projects, found_categories
+
+
+def _insert_chunk(db: Session, rows: List[Tuple[int, dict]], errors: list) -> List[dict]:
+    """Parçayı tek executemany ile ekler; hata olursa satır satır deneyerek hatalı satırı ayırır.
+
+    Eklenen satırların değerlerini döndürür.
+    """
+    try:
+        with db.begin_nested():
+            db.execute(insert(Transaction), [values for _, values in rows])
+        return [values for _, values in rows]
+    except SQLAlchemyError:
+        pass
+
+    inserted = []
+    for row_no, values in rows:
+        try:
+            with db.begin_nested():
+                db.execute(insert(Transaction), [values])
+            inserted.append(values)
+        except SQLAlchemyError as e:
+            errors.append({"row": row_no, "error": str(e.orig) if getattr(e, "orig", None) else str(e)})
+    return inserted
+
+
+def import_transactions(db: Session, rows: Iterable[dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """İşlemleri parçalar halinde toplu ekler.
+
+    Hatalı satırlar (doğrulama, bilinmeyen proje/kategori, veritabanı hatası) atlanır ve
+    1'den başlayan satır numarasıyla raporlanır; diğer satırlar eklenir. Her parça ayrı
+    commit edilir. Girdinin kendisi okunamazsa (bozuk kodlama, geçersiz CSV) 400 döner;
+    hata mesajı o ana kadar kaydedilmiş işlem sayısını belirtir.
+    """
+    inserted = 0
+    errors = []
+    read = 0
+
+    chunks = _chunks(rows, chunk_size)
+    while True:
+        try:
+            chunk = next(chunks, None)
+        except (UnicodeDecodeError, ValueError, csv.Error) as e:
+            # Önceki parçalar commit edildi; kısmi aktarım yanıtta açıkça belirtilir
+            raise HTTPException(
+                status_code=400,
+                detail=f"Girdi okunamadı ({e}). İlk {read} satırdan {inserted} işlem kaydedildi; "
+                       f"sonraki satırlar eklenmedi.",
+            )
+        if chunk is None:
+            break
+        read = chunk[-1][0]
+        valid: List[Tuple[int, TransactionCreate]] = []
+        for row_no, raw in chunk:
+            # csv.DictReader başlıktan fazla alanları None anahtarı altında toplar
+            if isinstance(raw, dict) and None in raw:
+                errors.append({"row": row_no, "error": f"Başlıktakinden {len(raw[None])} fazla alan var."})
+                continue
+            try:
+                valid.append((row_no, TransactionCreate(**raw)))
+            except ValidationError as e:
+                errors.append({"row": row_no, "error": _format_validation_error(e)})
+            except TypeError:
+                errors.append({"row": row_no, "error": "Satır bir nesne olmalı."})
+
+        projects, categories = _existing_ids(
+            db, {t.project_id for _, t in valid}, {t.category_id for _, t in valid}
+        )
+
+        to_insert = []
+        for row_no, t in valid:
+            if t.project_id not in projects:
+                errors.append({"row": row_no, "error": f"Proje bulunamadı: {t.project_id}"})
+                continue
+            if t.category_id not in categories:
+                errors.append({"row": row_no, "error": f"Kategori bulunamadı: {t.category_id}"})
+                continue
+            tl_total = calculate_tl_total(db, t.amount, t.currency, t.date)
+            to_insert.append((row_no, {**t.dict(), "tl_total": tl_total}))
+
+        if to_insert:
+            chunk_inserted = _insert_chunk(db, to_insert, errors)
+            # Aylık özetler parça başına tek sorguyla güncellenir
+            apply_deltas(db, collect_deltas((values, 1) for values in chunk_inserted))
+            inserted += len(chunk_inserted)
+        db.commit()
+
+    errors.sort(key=lambda e: e["row"])
+    return {"inserted": inserted, "failed": len(errors), "errors": errors}
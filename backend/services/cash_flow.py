@@ -0,0 +1,181 @@
+from datetime import date, timedelta
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Date, DateTime, Interval, and_, case, cast, func, literal, select, true
+from sqlalchemy.orm import Session
+
+from models import Transaction, TransactionMonthlyRollup
+from services.reports import to_columnar
+
+# İnceden kabaya kova sırası; nokta sayısı sınırı aşılırsa bir sonraki kovaya geçilir
+BUCKETS = ("day", "week", "month", "quarter", "year")
+# Ay ve üstü kovalar aylık özet tablosundan okunur
+ROLLUP_BUCKETS = {"month", "quarter", "year"}
+# generate_series adımı (Postgres'te "quarter" bir interval birimi değildir)
+BUCKET_STEPS = {"day": "1 day", "week": "1 week", "month": "1 month", "quarter": "3 months", "year": "1 year"}
+DEFAULT_MAX_POINTS = 400
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    if bucket == "day":
+        return day
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())  # Postgres date_trunc('week') gibi pazartesi
+    if bucket == "month":
+        return day.replace(day=1)
+    if bucket == "quarter":
+        return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+    return day.replace(month=1, day=1)
+
+
+def bucket_end(day: date, bucket: str) -> date:
+    """`day`'in içinde bulunduğu kovanın son günü."""
+    start = bucket_start(day, bucket)
+    if bucket == "day":
+        return start
+    if bucket == "week":
+        return start + timedelta(days=6)
+    months = {"month": 1, "quarter": 3, "year": 12}[bucket]
+    month_index = start.year * 12 + start.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1) - timedelta(days=1)
+
+
+def bucket_count(date_from: date, date_to: date, bucket: str) -> int:
+    start, end = bucket_start(date_from, bucket), bucket_start(date_to, bucket)
+    if bucket == "day":
+        return (end - start).days + 1
+    if bucket == "week":
+        return (end - start).days // 7 + 1
+    months = (end.year - start.year) * 12 + end.month - start.month
+    return months // {"month": 1, "quarter": 3, "year": 12}[bucket] + 1
+
+
+def choose_bucket(date_from: date, date_to: date, requested: str, max_points: int) -> str:
+    """İstenen kova veya nokta sayısını `max_points` altında tutan ilk daha kaba kova."""
+    for bucket in BUCKETS[BUCKETS.index(requested):]:
+        if bucket_count(date_from, date_to, bucket) <= max_points:
+            return bucket
+    return BUCKETS[-1]
+
+
+def _signed(type_column, value_column):
+    return case((type_column == "gider", -value_column), else_=value_column)
+
+
+def _flows(bucket: str, start: date, end: date, project_ids: Sequence[int]):
+    """(project_id, kova, net) alt sorgusu: gelir - gider, TL."""
+    if bucket in ROLLUP_BUCKETS:
+        src, src_date = TransactionMonthlyRollup, TransactionMonthlyRollup.month
+    else:
+        src, src_date = Transaction, Transaction.date
+    bucket_column = cast(func.date_trunc(bucket, src_date), Date)
+    stmt = (
+        select(
+            src.project_id.label("project_id"),
+            bucket_column.label("bucket"),
+            func.sum(_signed(src.type, func.coalesce(src.tl_total, 0))).label("net"),
+        )
+        .where(src_date >= start, src_date <= end, src.project_id.isnot(None))
+        .group_by(src.project_id, bucket_column)
+    )
+    if project_ids:
+        stmt = stmt.where(src.project_id.in_(project_ids))
+    return stmt.subquery("flows")
+
+
+def _opening(start: date, project_ids: Sequence[int]):
+    """Aralık başındaki bakiye: önceki tam aylar özet tablosundan, ayın başından `start`'a kadar işlemlerden."""
+    month_start = start.replace(day=1)
+    from_rollups = (
+        select(
+            TransactionMonthlyRollup.project_id.label("project_id"),
+            _signed(TransactionMonthlyRollup.type, TransactionMonthlyRollup.tl_total).label("amount"),
+        )
+        .where(TransactionMonthlyRollup.month < month_start)
+    )
+    from_transactions = (
+        select(
+            Transaction.project_id.label("project_id"),
+            _signed(Transaction.type, func.coalesce(Transaction.tl_total, 0)).label("amount"),
+        )
+        .where(Transaction.date >= month_start, Transaction.date < start)
+    )
+    if project_ids:
+        from_rollups = from_rollups.where(TransactionMonthlyRollup.project_id.in_(project_ids))
+        from_transactions = from_transactions.where(Transaction.project_id.in_(project_ids))
+    parts = from_rollups.union_all(from_transactions.where(Transaction.project_id.isnot(None))).subquery()
+    return (
+        select(parts.c.project_id, func.sum(parts.c.amount).label("amount"))
+        .group_by(parts.c.project_id)
+        .subquery("opening")
+    )
+
+
+def _data_range(db: Session, project_ids: Sequence[int]) -> Tuple[Optional[date], Optional[date]]:
+    stmt = select(func.min(Transaction.date), func.max(Transaction.date))
+    if project_ids:
+        stmt = stmt.where(Transaction.project_id.in_(project_ids))
+    return tuple(db.execute(stmt).one())
+
+
+def balance_series(
+    db: Session,
+    bucket: str = "day",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    project_ids: Sequence[int] = (),
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> dict:
+    """Proje bazında kova başına net akış ve kümülatif bakiye (boş kovalar 0 ile doldurulur).
+
+    Bakiye = aralık öncesi açılış bakiyesi + `SUM(net) OVER (PARTITION BY project_id ORDER BY kova)`.
+    Aralık `max_points` kovayı aşıyorsa otomatik olarak daha kaba kovaya geçilir.
+    """
+    if bucket not in BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Geçersiz kova: {bucket}. Geçerli değerler: {', '.join(BUCKETS)}")
+    if date_from is None or date_to is None:
+        first, last = _data_range(db, project_ids)
+        date_from, date_to = date_from or first, date_to or last
+    if date_from is None or date_to is None:
+        return {**to_columnar(["project_id", "bucket", "net", "balance"], []), "bucket": bucket}
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from, date_to'dan büyük olamaz.")
+
+    bucket = choose_bucket(date_from, date_to, bucket, max(1, max_points))
+    # Kovalar tam kapsansın diye aralık kova sınırlarına genişletilir
+    start, end = bucket_start(date_from, bucket), bucket_end(date_to, bucket)
+
+    buckets = select(
+        cast(
+            func.generate_series(
+                cast(literal(start), DateTime), cast(literal(bucket_start(end, bucket)), DateTime),
+                cast(literal(BUCKET_STEPS[bucket]), Interval),
+            ),
+            Date,
+        ).label("bucket")
+    ).subquery("buckets")
+    flows = _flows(bucket, start, end, project_ids)
+    opening = _opening(start, project_ids)
+    projects = select(flows.c.project_id).union(select(opening.c.project_id)).subquery("projects")
+
+    net = func.coalesce(flows.c.net, 0)
+    balance = func.coalesce(opening.c.amount, 0) + func.sum(net).over(
+        partition_by=projects.c.project_id, order_by=buckets.c.bucket
+    )
+    stmt = (
+        select(projects.c.project_id, buckets.c.bucket, net.label("net"), balance.label("balance"))
+        .select_from(
+            projects.join(buckets, true())
+            .outerjoin(flows, and_(flows.c.project_id == projects.c.project_id, flows.c.bucket == buckets.c.bucket))
+            .outerjoin(opening, opening.c.project_id == projects.c.project_id)
+        )
+        .order_by(projects.c.project_id, buckets.c.bucket)
+    )
+    rows = db.execute(stmt).all()
+    return {
+        **to_columnar(["project_id", "bucket", "net", "balance"], rows),
+        "bucket": bucket,
+        "date_from": start.isoformat(),
+        "date_to": end.isoformat(),
+    }
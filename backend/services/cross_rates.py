@@ -0,0 +1,148 @@
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from services.rate_table import RateTable, rate_table
+
+# Önbellekte tutulacak en fazla tarih (matris) sayısı; en eski kullanılan atılır
+CROSS_RATE_CACHE_SIZE = int(os.getenv("CROSS_RATE_CACHE_SIZE", "2048"))
+
+BASE_CURRENCY = "TRY"
+
+
+def normalize_currency(code: str) -> str:
+    code = code.strip().upper()
+    return BASE_CURRENCY if code == "TL" else code
+
+
+class CrossRateMatrix:
+    """Tek tarih için tüm para birimi çiftlerinin kuru: matrix[i][j] = 1 birim i'nin j cinsinden değeri.
+
+    `rate_to_try` satırlarından türetilir (i/j = rate_to_try[i] / rate_to_try[j]); o tarihte
+    kuru olmayan para birimi matriste yer almaz, `rate()` None döner.
+    """
+
+    __slots__ = ("on_date", "codes", "index", "matrix")
+
+    def __init__(self, on_date: date, rates_to_try: Dict[str, object]):
+        rates = {code: float(rate) for code, rate in rates_to_try.items() if rate}
+        rates[BASE_CURRENCY] = 1.0
+        self.on_date = on_date
+        self.codes: Tuple[str, ...] = tuple(sorted(rates))
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        values = [rates[code] for code in self.codes]
+        self.matrix: List[List[float]] = [[src / dst for dst in values] for src in values]
+
+    def rate(self, source: str, target: str) -> Optional[float]:
+        i = self.index.get(normalize_currency(source))
+        j = self.index.get(normalize_currency(target))
+        if i is None or j is None:
+            return None
+        return self.matrix[i][j]
+
+
+class CrossRateCache:
+    """Tarih başına çapraz kur matrisleri için sınırlı (LRU) önbellek.
+
+    Matris, süreç içi kur tablosundan tarih başına bir kez hesaplanır. Kur tablosu değiştiğinde
+    (yeni kur yazımı, yeniden yükleme) `version` farkından anlaşılır ve önbellek boşaltılır.
+    """
+
+    def __init__(self, rates: RateTable, max_size: int = CROSS_RATE_CACHE_SIZE):
+        self.rates = rates
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._matrices: "OrderedDict[date, CrossRateMatrix]" = OrderedDict()
+        self._version = None
+
+    def _get_loaded(self, on_date: date) -> CrossRateMatrix:
+        with self._lock:
+            if self._version != self.rates.version:
+                self._matrices.clear()
+                self._version = self.rates.version
+            matrix = self._matrices.get(on_date)
+            if matrix is not None:
+                self._matrices.move_to_end(on_date)
+                return matrix
+
+        matrix = CrossRateMatrix(on_date, self.rates.rates_at(on_date))
+        with self._lock:
+            self._matrices[on_date] = matrix
+            while len(self._matrices) > self.max_size:
+                self._matrices.popitem(last=False)
+        return matrix
+
+    def matrices(self, dates: Iterable[date]) -> Dict[date, CrossRateMatrix]:
+        """Tarih başına matrisler; kur tablosu önceden `check*` ile yüklenmiş olmalıdır.
+
+        Tarihi boş (NULL) kayıtlar için matris yoktur; bunların çevrimi None döner.
+        """
+        return {on_date: self._get_loaded(on_date) for on_date in set(dates) if on_date is not None}
+
+    def _check_loaded(self, code: Optional[str]) -> Optional[str]:
+        if not code:
+            return None
+        code = normalize_currency(code)
+        if code != BASE_CURRENCY and code not in self.rates.rates_at(date.max):
+            raise HTTPException(status_code=400, detail=f"Bilinmeyen rapor para birimi: {code}")
+        return code
+
+    def check(self, db: Session, code: Optional[str]) -> Optional[str]:
+        """`report_currency` parametresini normalleştirir (TL -> TRY), kur tablosunu yükler; bilinmiyorsa 400."""
+        if code:
+            self.rates.ensure_loaded(db)
+        return self._check_loaded(code)
+
+    async def check_async(self, db: AsyncSession, code: Optional[str]) -> Optional[str]:
+        if code:
+            await self.rates.ensure_loaded_async(db)
+        return self._check_loaded(code)
+
+    def clear(self):
+        with self._lock:
+            self._matrices.clear()
+
+
+cross_rates = CrossRateCache(rate_table)
+
+
+def conversion_factors(
+    matrices: Dict[date, CrossRateMatrix], pairs: Iterable[Tuple[date, str]], target: str
+) -> Dict[Tuple[date, str], Optional[float]]:
+    """(tarih, kaynak para birimi) çifti başına tek çarpan; satır başına arama yapılmaz.
+
+    Matrisi olmayan tarihlerin (boş tarih) çarpanı, kuru bilinmeyen günlerdeki gibi None'dır.
+    """
+    factors = {}
+    for on_date, source in set(pairs):
+        matrix = matrices.get(on_date)
+        factors[(on_date, source)] = matrix.rate(source, target) if matrix is not None else None
+    return factors
+
+
+def _converted(value, factor: Optional[float]) -> Optional[float]:
+    if value is None or factor is None:
+        return None
+    return round(float(value) * factor, 2)
+
+
+def add_report_amounts(matrices: Dict[date, CrossRateMatrix], items: List[dict], target: str) -> List[dict]:
+    """Liste öğelerine `report_amount` (tutarın işlem tarihi kuruyla `target` karşılığı) ekler."""
+    factors = conversion_factors(matrices, ((item["date"], item["currency"]) for item in items), target)
+    for item in items:
+        item["report_amount"] = _converted(item["amount"], factors[(item["date"], item["currency"])])
+    return items
+
+
+def convert_tl_totals(
+    matrices: Dict[date, CrossRateMatrix], rows: Sequence[Tuple[date, object]], target: str
+) -> List[Optional[float]]:
+    """(tarih, TL tutar) satırlarını tarih bazlı TRY -> `target` çarpanıyla çevirir."""
+    factors = conversion_factors(matrices, ((on_date, BASE_CURRENCY) for on_date, _ in rows), target)
+    return [_converted(value, factors[(on_date, BASE_CURRENCY)]) for on_date, value in rows]
@@ -1,51 +1,128 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import httpx
 import requests
-import xml.etree.ElementTree as ET
-from datetime import datetime
+from datetime import datetime, date
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from models.exchange_rate import ExchangeRate
+from services.rate_table import rate_table
+from services.rate_ingestion import parse_tcmb_xml, store_rates, store_rates_async, written_rates
 
-TCMB_URL = "https://www.tcmb.gov.tr/kurlar/today.xml"
+# Testlerde/yerel geliştirmede sahte bir sunucuya yönlendirmek için ortam değişkeniyle değiştirilebilir
+TCMB_URL = os.getenv("TCMB_URL", "https://www.tcmb.gov.tr/kurlar/today.xml")
 
-def fetch_and_store_exchange_rates(db: Session):
-    try:
-        response = requests.get(TCMB_URL)
-        response.raise_for_status()
+# Gösterge panelinde listelenen para birimleri
+DISPLAY_CODES = ["USD", "EUR", "CHF", "GBP", "CAD"]
+
+# Okuma önbelleğinin geçerlilik süresi (saniye); HTTP Cache-Control max-age olarak da kullanılır
+RATES_CACHE_TTL = int(os.getenv("RATES_CACHE_TTL", "60"))
 
-        tree = ET.fromstring(response.content)
-        today = datetime.today().date()
+def _after_write(written):
+    rate_table.update(written)
+    today_rates_cache.invalidate()
 
-        for currency in tree.findall("Currency"):
-            code = currency.get("CurrencyCode")
-            forex_selling = currency.find("ForexSelling").text
 
-            if not forex_selling:
-                continue
+def fetch_and_store_exchange_rates(db: Session, url: str = TCMB_URL):
+    try:
+        response = requests.get(url, timeout=10)
+        response.raise_for_status()
 
-            rate = float(forex_selling.replace(",", "."))
+        # Tüm kur türleri tek satır kümesinde, tek `INSERT ... ON CONFLICT` ile yazılır
+        tarih, rows = parse_tcmb_xml(response.content, datetime.today().date())
+        store_rates(db, rows)
+        db.commit()
+        _after_write(written_rates(rows))
+        return {"message": "Kurlar başarıyla güncellendi.", "date": tarih}
 
-            # TL zaten 1 olduğu için eklemeye gerek yok
-            if code == "TRY":
-                continue
+    except Exception as e:
+        db.rollback()
+        return {"error": str(e)}
 
-            # Daha önce aynı gün için kayıt varsa güncelle
-            existing_rate = (
-                db.query(ExchangeRate)
-                .filter(ExchangeRate.currency == code, ExchangeRate.date == today)
-                .first()
-            )
 
-            if existing_rate:
-                existing_rate.rate_to_try = rate
-            else:
-                new_rate = ExchangeRate(
-                    currency=code,
-                    rate_to_try=rate,
-                    date=today
-                )
-                db.add(new_rate)
+async def fetch_and_store_exchange_rates_async(db: AsyncSession, client: httpx.AsyncClient, url: str = TCMB_URL):
+    """Asenkron sürüm: httpx ile çeker, senkron sürümle aynı tek ifadeyle yazar."""
+    try:
+        response = await client.get(url, timeout=10)
+        response.raise_for_status()
 
-        db.commit()
-        return {"message": "Kurlar başarıyla güncellendi."}
+        tarih, rows = parse_tcmb_xml(response.content, datetime.today().date())
+        await store_rates_async(db, rows)
+        await db.commit()
+        _after_write(written_rates(rows))
+        return {"message": "Kurlar başarıyla güncellendi.", "date": tarih}
 
     except Exception as e:
+        await db.rollback()
         return {"error": str(e)}
+
+
+class TodayRatesCache:
+    """Gösterge paneli kurlarının süreç içi TTL önbelleği.
+
+    Değer, her para biriminin bugüne kadarki en son kurundan oluşur ve içeriğinden türetilen
+    bir ETag ile birlikte saklanır.
+    """
+
+    def __init__(self, ttl: int = RATES_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._value = None
+        self._expires_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+
+    def _cached(self):
+        with self._lock:
+            if self._value is not None and time.monotonic() < self._expires_at:
+                return self._value
+        return None
+
+    def _store(self, rows):
+        value = self._build(rows)
+        with self._lock:
+            self._value = value
+            self._expires_at = time.monotonic() + self.ttl
+        return value
+
+    def get(self, db: Session, fresh: bool = False):
+        """`fresh` verilirse önbellek atlanır ve kurlar `db`'den yeniden okunur."""
+        return (not fresh and self._cached()) or self._store(db.execute(self._statement()).all())
+
+    async def get_async(self, db: AsyncSession, fresh: bool = False):
+        return (not fresh and self._cached()) or self._store((await db.execute(self._statement())).all())
+
+    @staticmethod
+    def _statement():
+        latest = (
+            select(ExchangeRate.currency, func.max(ExchangeRate.date).label("date"))
+            .where(ExchangeRate.currency.in_(DISPLAY_CODES), ExchangeRate.date <= date.today())
+            .group_by(ExchangeRate.currency)
+            .subquery()
+        )
+        return (
+            select(ExchangeRate.currency, ExchangeRate.date, ExchangeRate.rate_to_try)
+            .join(latest, (ExchangeRate.currency == latest.c.currency) & (ExchangeRate.date == latest.c.date))
+        )
+
+    @staticmethod
+    def _build(rows):
+        by_code = {r.currency: r for r in rows}
+        rates = [
+            {"code": code, "rate": float(by_code[code].rate_to_try)}
+            for code in DISPLAY_CODES
+            if code in by_code and by_code[code].rate_to_try is not None
+        ]
+        rate_date = max((r.date for r in rows), default=None)
+        body = {"date": rate_date.isoformat() if rate_date else "", "rates": rates}
+        etag = '"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest() + '"'
+        return {"body": body, "etag": etag}
+
+
+today_rates_cache = TodayRatesCache()
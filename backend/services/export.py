@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterator
+
+from sqlalchemy.sql import Select
+
+from database import read_session
+
+EXPORT_COLUMNS = [
+    "id", "type", "project_id", "category_id", "project_name", "category_name",
+    "date", "amount", "currency", "description", "tl_total", "created_at",
+]
+# Sunucu tarafı imleçten tek seferde çekilen satır sayısı
+YIELD_PER = 1000
+FLUSH_ROWS = 500
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} JSON'a çevrilemez")
+
+
+def _stream_rows(stmt: Select) -> Iterator[tuple]:
+    """Sorguyu kendi oturumunda, sunucu tarafı imleçle satır satır akıtır.
+
+    İstek bağımlılığındaki oturum yanıt gönderilmeden kapandığı için akış ayrı oturum kullanır
+    (salt okuma olduğundan replikaya yönlenebilir).
+    """
+    db = read_session()
+    try:
+        result = db.execute(stmt.execution_options(stream_results=True, max_row_buffer=YIELD_PER))
+        for row in result:
+            yield tuple(getattr(row, name) for name in EXPORT_COLUMNS)
+    finally:
+        db.close()
+
+
+def stream_csv(stmt) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")  # Excel'in UTF-8'i tanıması için BOM
+    writer.writerow(EXPORT_COLUMNS)
+    for i, row in enumerate(_stream_rows(stmt), start=1):
+        writer.writerow(row)
+        if i % FLUSH_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def stream_ndjson(stmt) -> Iterator[bytes]:
+    lines = []
+    for row in _stream_rows(stmt):
+        lines.append(json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=_json_default, ensure_ascii=False))
+        if len(lines) >= FLUSH_ROWS:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def stream_xlsx(stmt) -> Iterator[bytes]:
+    """openpyxl'in write_only kipiyle satırları diske yazar, ardından dosyayı parça parça gönderir."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("İşlemler")
+    sheet.append(EXPORT_COLUMNS)
+    for row in _stream_rows(stmt):
+        sheet.append([float(v) if isinstance(v, Decimal) else v for v in row])
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        workbook.save(path)
+        with open(path, "rb") as f:
+            while chunk := f.read(64 * 1024):
+                yield chunk
+    finally:
+        os.remove(path)
+
+
+STREAMERS = {"csv": stream_csv, "ndjson": stream_ndjson, "xlsx": stream_xlsx}
+
+
+def xlsx_available() -> bool:
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        return False
+    return True
@@ -0,0 +1,70 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+# IP başına tüm giriş/kayıt denemeleri, e-posta başına başarısız denemeler sınırlanır
+LOGIN_IP_LIMIT = int(os.getenv("LOGIN_IP_LIMIT", "30"))
+LOGIN_IP_WINDOW = int(os.getenv("LOGIN_IP_WINDOW", "60"))
+LOGIN_EMAIL_LIMIT = int(os.getenv("LOGIN_EMAIL_LIMIT", "5"))
+LOGIN_EMAIL_WINDOW = int(os.getenv("LOGIN_EMAIL_WINDOW", "300"))
+# Takip edilen anahtar sayısı üst sınırı (bellek taşmasına karşı)
+THROTTLE_MAX_KEYS = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", "100000"))
+
+
+class SlidingWindowLimiter:
+    """Anahtar başına kayan pencereli deneme sayacı."""
+
+    def __init__(self, limit: int, window: int, max_keys: int = THROTTLE_MAX_KEYS):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._hits: Dict[str, deque] = {}
+
+    def _prune(self, hits: deque, now: float):
+        while hits and hits[0] <= now - self.window:
+            hits.popleft()
+
+    def retry_after(self, key: str) -> Optional[int]:
+        """Sınır aşıldıysa beklenmesi gereken saniye, aşılmadıysa None."""
+        if self.limit <= 0:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits.get(key)
+            if not hits:
+                return None
+            self._prune(hits, now)
+            if len(hits) < self.limit:
+                return None
+            return max(1, int(hits[0] + self.window - now) + 1)
+
+    def hit(self, key: str):
+        if self.limit <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits is None:
+                if len(self._hits) >= self.max_keys:
+                    self._evict(now)
+                hits = self._hits[key] = deque()
+            self._prune(hits, now)
+            hits.append(now)
+
+    def reset(self, key: str):
+        with self._lock:
+            self._hits.pop(key, None)
+
+    def _evict(self, now: float):
+        for key in [k for k, hits in self._hits.items() if not hits or hits[-1] <= now - self.window]:
+            del self._hits[key]
+        # Hâlâ doluysa en eski anahtarlar atılır
+        while len(self._hits) >= self.max_keys:
+            del self._hits[next(iter(self._hits))]
+
+
+ip_limiter = SlidingWindowLimiter(LOGIN_IP_LIMIT, LOGIN_IP_WINDOW)
+email_limiter = SlidingWindowLimiter(LOGIN_EMAIL_LIMIT, LOGIN_EMAIL_WINDOW)
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import Project, Category
+
+# Diğer süreçlerdeki yazmaların en geç bu süre (sn) sonra görünmesi için
+LOOKUP_CACHE_TTL = int(os.getenv("LOOKUP_CACHE_TTL", "30"))
+
+
+class LookupCache:
+    """Proje ve kategori listelerinin (id/ad) sürüm damgalı süreç içi önbelleği.
+
+    Proje/kategori yazma uçları commit sonrası `invalidate()` çağırır; sürüm artar ve
+    bir sonraki okuma tabloları yeniden yükler. ETag içerikten türetildiği için birden
+    fazla süreçte de tutarlıdır.
+    """
+
+    def __init__(self, ttl: int = LOOKUP_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.version = 0
+        self._value = None
+        self._expires_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self._value = None
+
+    def _cached(self):
+        with self._lock:
+            if self._value is not None and time.monotonic() < self._expires_at:
+                return self._value
+        return None
+
+    def _store(self, version: int, projects, categories):
+        body = {
+            "projects": [{"id": r.id, "name": r.name} for r in projects],
+            "categories": [{"id": r.id, "type": r.type, "name": r.name} for r in categories],
+        }
+        etag = '"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest() + '"'
+        value = {"version": version, "etag": etag, "body": body}
+        with self._lock:
+            # Yükleme sırasında invalidate geldiyse eski veri önbelleğe yazılmaz
+            if self.version == version:
+                self._value = value
+                self._expires_at = time.monotonic() + self.ttl
+        return value
+
+    def get(self, db: Session, fresh: bool = False):
+        """`fresh` verilirse önbellek atlanır ve liste `db`'den yeniden yüklenir."""
+        cached = None if fresh else self._cached()
+        if cached is not None:
+            return cached
+        version = self.version
+        return self._store(version, db.execute(self._projects()).all(), db.execute(self._categories()).all())
+
+    async def get_async(self, db: AsyncSession, fresh: bool = False):
+        cached = None if fresh else self._cached()
+        if cached is not None:
+            return cached
+        version = self.version
+        projects = (await db.execute(self._projects())).all()
+        categories = (await db.execute(self._categories())).all()
+        return self._store(version, projects, categories)
+
+    # Yalnızca gerekli sütunlar; ORM nesnesi oluşturulmaz
+    @staticmethod
+    def _projects():
+        return select(Project.id, Project.name).order_by(Project.name, Project.id)
+
+    @staticmethod
+    def _categories():
+        return select(Category.id, Category.type, Category.name).order_by(Category.name, Category.id)
+
+
+lookup_cache = LookupCache()
@@ -0,0 +1,205 @@
+import contextvars
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from database import pool_status
+
+# Bu süreyi (ms) aşan SQL ifadeleri parametreleriyle birlikte loglanır; 0: kapalı
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# Server-Timing başlığı (istek başına SQL sayısı/süresi) eklensin mi
+SERVER_TIMING = os.getenv("SERVER_TIMING", "1") == "1"
+
+# Saniye cinsinden histogram kovaları (Prometheus varsayılanlarına yakın)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+slow_query_logger = logging.getLogger("finans.slow_query")
+
+
+class RequestStats:
+    """Tek isteğin SQL sayacı; context değişkeninde tutulur (threadpool'a kopyalanır)."""
+
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+_request_stats: contextvars.ContextVar = contextvars.ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    """Etiket kümesi başına sabit kovalı gecikme histogramı."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple, list] = {}  # etiketler -> [kova sayaçları..., toplam, adet]
+
+    def observe(self, labels: Tuple, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self) -> Dict[Tuple, list]:
+        with self._lock:
+            return {labels: list(series) for labels, series in self._series.items()}
+
+
+class Counters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.slow_queries = 0
+
+    def record(self, elapsed: float, slow: bool):
+        with self._lock:
+            self.queries += 1
+            self.query_seconds += elapsed
+            if slow:
+                self.slow_queries += 1
+
+
+request_latency = Histogram()
+sql_counters = Counters()
+
+
+# 🔹 SQL olayları: tüm Engine'ler (AsyncEngine'in senkron çekirdeği dahil) için geçerli.
+# Başlangıç zamanı bağlantıya değil yürütme bağlamına yazılır; hata veren ifade iz bırakmaz.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _record_query(context, statement, parameters):
+    start = getattr(context, "_query_start", None)
+    if start is None:
+        return
+    del context._query_start
+    elapsed = time.perf_counter() - start
+    slow = SLOW_QUERY_MS > 0 and elapsed * 1000 >= SLOW_QUERY_MS
+    sql_counters.record(elapsed, slow)
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+    if slow:
+        slow_query_logger.warning(
+            "Yavaş sorgu (%.1f ms): %s | parametreler: %r", elapsed * 1000, statement, parameters
+        )
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_query(context, statement, parameters)
+
+
+# Hata veren ifadeler de (ör. statement_timeout ile kesilenler) süresiyle sayılır
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    context = exception_context.execution_context
+    if context is not None:
+        _record_query(context, exception_context.statement, exception_context.parameters)
+
+
+class MetricsMiddleware:
+    """Rota başına gecikme histogramı ve Server-Timing başlığı ekleyen ASGI ara katmanı.
+
+    Saf ASGI olarak yazıldı; gövde akışına (StreamingResponse) dokunmaz.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if SERVER_TIMING:
+                    total_ms = (time.perf_counter() - start) * 1000
+                    timing = (
+                        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries", '
+                        f"app;dur={total_ms:.1f}"
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", timing.encode())
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            # Etiket olarak rota şablonu kullanılır (/transactions/{transaction_id}); eşleşmeyenler tek kovada
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            request_latency.observe((scope["method"], path, str(status_code)), time.perf_counter() - start)
+
+
+def _labels(names, values) -> str:
+    return ",".join(f'{n}="{v}"' for n, v in zip(names, values))
+
+
+def render_prometheus() -> str:
+    """Tüm metrikleri Prometheus metin biçiminde döndürür."""
+    lines = [
+        "# HELP http_request_duration_seconds İstek süresi (rota şablonuna göre)",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    names = ("method", "route", "status")
+    for labels, series in sorted(request_latency.snapshot().items()):
+        base = _labels(names, labels)
+        cumulative = 0
+        for bound, count in zip(request_latency.buckets, series):
+            cumulative += count
+            lines.append(f'http_request_duration_seconds_bucket{{{base},le="{bound}"}} {cumulative}')
+        lines.append(f'http_request_duration_seconds_bucket{{{base},le="+Inf"}} {series[-1]}')
+        lines.append(f"http_request_duration_seconds_sum{{{base}}} {series[-2]}")
+        lines.append(f"http_request_duration_seconds_count{{{base}}} {series[-1]}")
+
+    lines += [
+        "# TYPE db_queries_total counter",
+        f"db_queries_total {sql_counters.queries}",
+        "# TYPE db_query_duration_seconds_total counter",
+        f"db_query_duration_seconds_total {sql_counters.query_seconds}",
+        "# TYPE db_slow_queries_total counter",
+        f"db_slow_queries_total {sql_counters.slow_queries}",
+    ]
+
+    pool = pool_status()
+    for key in ("size", "checked_out", "checked_in", "overflow"):
+        lines += [f"# TYPE db_pool_{key} gauge", f"db_pool_{key} {pool[key]}"]
+    lines += [
+        "# TYPE db_pool_checkouts_total counter",
+        f"db_pool_checkouts_total {pool['checkouts']}",
+        "# TYPE db_pool_timeouts_total counter",
+        f"db_pool_timeouts_total {pool['timeouts']}",
+        "# TYPE db_pool_wait_seconds_total counter",
+        f"db_pool_wait_seconds_total {pool['wait_total_ms'] / 1000}",
+    ]
+    return "\n".join(lines) + "\n"
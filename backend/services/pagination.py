@@ -0,0 +1,114 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import BigInteger, and_, or_, select, func, cast, table, column
+from sqlalchemy.sql import Select
+
+from services.search import name_search_filter, name_search_rank
+
+# Tahmini/sınırlı sayım için üst limit: bu değerin üzerindeki sonuçlarda tam sayım yapılmaz
+COUNT_CAP = 10000
+
+
+def _to_json(value: Any):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _from_json(value: Any, python_type: type):
+    if value is None:
+        return None
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, row_id: int) -> str:
+    """Sıralama anahtarı + id'den opak bir `after` token üretir."""
+    payload = json.dumps([sort_by, sort_order, _to_json(value), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort_by: str, sort_order: str, column) -> tuple:
+    """Token'ı çözer ve sıralama ayarlarıyla uyumlu olduğunu doğrular."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        token_sort_by, token_order, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if token_sort_by != sort_by or token_order != sort_order:
+            raise ValueError("sıralama uyuşmuyor")
+        return _from_json(value, column.type.python_type), int(row_id)
+    except (ValueError, TypeError, KeyError, InvalidOperation):
+        raise HTTPException(status_code=400, detail="Geçersiz sayfalama imleci (after).")
+
+
+def keyset_filter(column, id_column, value: Any, row_id: int, descending: bool):
+    """`(column, id)` sırasına göre imleçten sonraki satırları seçen koşul.
+
+    PostgreSQL'de NULL değerler ASC sıralamada sonda, DESC sıralamada başta yer alır;
+    koşul bu sırayı bozmayacak şekilde kurulur.
+    """
+    if descending:
+        if value is None:
+            return or_(and_(column.is_(None), id_column < row_id), column.isnot(None))
+        return or_(column < value, and_(column == value, id_column < row_id))
+
+    if value is None:
+        return and_(column.is_(None), id_column > row_id)
+    return or_(column > value, and_(column == value, id_column > row_id), column.is_(None))
+
+
+_pg_class = table("pg_class", column("relname"), column("reltuples"))
+
+
+def count_statement(stmt: Select, mode: str, table_name: Optional[str] = None, filtered: bool = True) -> Optional[Select]:
+    """Toplam kayıt sayısı sorgusunu istenen moda göre kurar.
+
+    - exact: tam `COUNT(*)`
+    - estimate: filtre yoksa `pg_class.reltuples`, varsa `COUNT_CAP` ile sınırlı sayım
+    - none: sayım yapılmaz (None döner)
+    """
+    if mode == "none":
+        return None
+    inner = stmt.order_by(None)
+    if mode == "estimate":
+        capped = select(func.count()).select_from(inner.limit(COUNT_CAP).subquery()).scalar_subquery()
+        if filtered or not table_name:
+            return select(capped)
+        # İstatistik yoksa (reltuples = -1) sınırlı sayıma düşülür
+        estimate = (
+            select(cast(_pg_class.c.reltuples, BigInteger))
+            .where(_pg_class.c.relname == table_name, _pg_class.c.reltuples >= 0)
+            .scalar_subquery()
+        )
+        return select(func.coalesce(estimate, capped))
+    return select(func.count()).select_from(inner.subquery())
+
+
+
+def name_list_statement(model, search: str, sort_by: str, sort_order: str, sortable, columns=None) -> Select:
+    """Proje/kategori gibi ad sütunlu tablolar için arama + sıralama sorgusu.
+
+    `columns` verilirse ORM nesnesi yerine yalnızca bu sütunlar seçilir.
+    """
+    stmt = select(*columns) if columns else select(model)
+    if search:
+        stmt = stmt.where(name_search_filter(model.name, search))
+        # Alaka sıralaması: en benzer adlar önce
+        if sort_by == "relevance":
+            return stmt.order_by(name_search_rank(model.name, search).desc(), model.id)
+
+    if sort_by not in sortable:
+        sort_by = "id"
+    sort_column = getattr(model, sort_by)
+    if sort_order.lower() == "desc":
+        sort_column = sort_column.desc()
+    return stmt.order_by(sort_column)
@@ -0,0 +1,261 @@
+import os
+import threading
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from database import engine
+
+# `transactions` tablosu `date` sütununa göre aylık veya yıllık aralık bölümlerine ayrılabilir
+PARTITION_INTERVALS = ("month", "year")
+# Bu dönemden sonraki kaç dönem için bölüm önceden oluşturulur
+PARTITIONS_AHEAD = int(os.getenv("TRANSACTION_PARTITIONS_AHEAD", "3"))
+# Uygulama içi bakım iş parçacığının çalışma aralığı (sn); PARTITION_MAINTENANCE=0 ile kapatılır
+PARTITION_MAINTENANCE_INTERVAL = float(os.getenv("PARTITION_MAINTENANCE_INTERVAL", "21600"))
+
+PARENT = "transactions"
+DEFAULT_PARTITION = "transactions_default"
+# Birden fazla süreç aynı anda bölüm oluşturmaya çalışmasın diye kullanılan advisory kilit anahtarı
+_LOCK_KEY = 72_010_025
+
+# Bölümlü tabloda yeniden oluşturulan indeksler (üst tabloda tanımlanır, tüm bölümlere yayılır)
+INDEXES = [
+    ("ix_transactions_id", "(id)"),
+    ("ix_transactions_date_id", "(date, id)"),
+    ("ix_transactions_amount_id", "(amount, id)"),
+    ("ix_transactions_tl_total_id", "(tl_total, id)"),
+    ("ix_transactions_created_at_id", "(created_at, id)"),
+    ("ix_transactions_type_id", "(type, id)"),
+    ("ix_transactions_currency_id", "(currency, id)"),
+    ("ix_transactions_currency_date", "(currency, date, id)"),
+    ("ix_transactions_project_date", "(project_id, date, id)"),
+    ("ix_transactions_category_date", "(category_id, date, id)"),
+    ("ix_transactions_search_trgm",
+     "USING gin (description gin_trgm_ops, type gin_trgm_ops, currency gin_trgm_ops)"),
+]
+FOREIGN_KEYS = [
+    ("transactions_project_id_fkey", "project_id", "projects"),
+    ("transactions_category_id_fkey", "category_id", "categories"),
+]
+
+
+def period_start(day: date, interval: str) -> date:
+    return day.replace(day=1) if interval == "month" else day.replace(month=1, day=1)
+
+
+def next_period(start: date, interval: str) -> date:
+    if interval == "year":
+        return start.replace(year=start.year + 1)
+    return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+
+
+def periods(first: date, last: date, interval: str) -> List[Tuple[date, date]]:
+    """[first, last] aralığına değen dönemler: (başlangıç, bir sonraki dönemin başlangıcı)."""
+    result = []
+    start = period_start(first, interval)
+    while start <= last:
+        end = next_period(start, interval)
+        result.append((start, end))
+        start = end
+    return result
+
+
+def partition_name(start: date, interval: str) -> str:
+    return f"{PARENT}_p{start:%Y}" if interval == "year" else f"{PARENT}_p{start:%Y_%m}"
+
+
+def partition_names(first: date, last: date, interval: str) -> List[str]:
+    return [partition_name(start, interval) for start, _ in periods(first, last, interval)]
+
+
+def partition_interval(conn: Connection) -> Optional[str]:
+    """Tablo bölümlüyse dönem türü (tablo yorumunda saklanır), değilse None."""
+    if conn.dialect.name != "postgresql":
+        return None
+    comment = conn.execute(text(
+        "SELECT obj_description(p.partrelid, 'pg_class') FROM pg_partitioned_table p "
+        "WHERE p.partrelid = to_regclass(:parent)"
+    ), {"parent": PARENT}).first()
+    if comment is None:
+        return None
+    value = (comment[0] or "").partition("partition_interval=")[2]
+    return value if value in PARTITION_INTERVALS else "month"
+
+
+def existing_partitions(conn: Connection) -> List[str]:
+    return list(conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:parent) ORDER BY c.relname"
+    ), {"parent": PARENT}).scalars())
+
+
+def create_partition(conn: Connection, start: date, interval: str) -> Optional[str]:
+    """Dönem bölümünü oluşturur; varsayılan bölüme düşmüş o döneme ait satırları içine taşır.
+
+    Varsayılan bölümde kapsanan satır varken doğrudan `PARTITION OF` hata verir; bu yüzden
+    tablo ayrı oluşturulup satırlar taşınır, sonra ATTACH edilir. Zaten varsa None döner.
+    """
+    name = partition_name(start, interval)
+    if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+        return None
+    end = next_period(start, interval)
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS)"))
+    conn.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ), {"start": start, "end": end})
+    conn.execute(text(
+        f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    return name
+
+
+def ensure_partitions(conn: Connection, ahead: int = PARTITIONS_AHEAD, today: Optional[date] = None) -> List[str]:
+    """Bu dönem ve sonraki `ahead` dönemin bölümlerini, varsayılan bölümde satırı olan dönemlerinkini oluşturur.
+
+    Tablo bölümlü değilse hiçbir şey yapmaz. Oluşturulan bölüm adlarını döndürür.
+    """
+    interval = partition_interval(conn)
+    if interval is None:
+        return []
+    if not conn.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _LOCK_KEY}).scalar():
+        return []  # başka bir süreç şu an bakım yapıyor
+
+    current = period_start(today or date.today(), interval)
+    starts = [current]
+    for _ in range(ahead):
+        starts.append(next_period(starts[-1], interval))
+    # Geçmiş tarihli toplu aktarımlar varsayılan bölüme düşer; kendi dönemlerine ayrılırlar
+    starts += conn.execute(text(
+        f"SELECT DISTINCT date_trunc('{interval}', date)::date FROM {DEFAULT_PARTITION} WHERE date IS NOT NULL"
+    )).scalars()
+
+    created = [create_partition(conn, start, interval) for start in sorted(set(starts))]
+    return [name for name in created if name]
+
+
+def _rename_table(conn: Connection, new_name: str):
+    """Eski tabloyu ve birincil anahtarını yeniden adlandırır (yeni tablo aynı adları kullanabilsin)."""
+    conn.execute(text(f"LOCK TABLE {PARENT} IN SHARE MODE"))
+    conn.execute(text(f"ALTER TABLE {PARENT} RENAME TO {new_name}"))
+    pkey = conn.execute(text(
+        "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:table) AND contype = 'p'"
+    ), {"table": new_name}).scalar()
+    if pkey:
+        conn.execute(text(f"ALTER TABLE {new_name} RENAME CONSTRAINT {pkey} TO {new_name}_pkey"))
+
+
+def convert_to_partitioned(conn: Connection, interval: str, ahead: int = PARTITIONS_AHEAD) -> int:
+    """Mevcut `transactions` tablosunu `date` üzerinden bölümlü tabloya çevirir; taşınan satır sayısını döndürür.
+
+    Eski tablo yeniden adlandırılır, aynı sütunlarla bölümlü tablo oluşturulur, veriler dönem
+    dönem kopyalanır; kimlik dizisi yeni tabloya devredilir ve indeksler/yabancı anahtarlar
+    üst tabloda yeniden tanımlanır. Tek transaction içinde çalışır (yazmalar süre boyunca bekler).
+    Bölümlü tablonun birincil anahtarı (id, date) olduğundan `date` boş olamaz.
+    """
+    if interval not in PARTITION_INTERVALS:
+        raise ValueError(f"Geçersiz bölüm aralığı: {interval}. month veya year olmalı.")
+    if partition_interval(conn) is not None:
+        return 0
+    nulls = conn.execute(text(f"SELECT count(*) FROM {PARENT} WHERE date IS NULL")).scalar()
+    if nulls:
+        raise RuntimeError(f"{nulls} işlemin tarihi boş; bölümlemeden önce doldurulmalı.")
+
+    old = f"{PARENT}_unpartitioned"
+    _rename_table(conn, old)
+    conn.execute(text(
+        f"CREATE TABLE {PARENT} (LIKE {old} INCLUDING DEFAULTS, PRIMARY KEY (id, date)) PARTITION BY RANGE (date)"
+    ))
+    conn.execute(text(f"COMMENT ON TABLE {PARENT} IS 'partition_interval={interval}'"))
+    conn.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {PARENT} DEFAULT"))
+
+    # Yalnızca satırı olan dönemlerin bölümü açılır; aradaki boş dönemlere sonradan yazılan
+    # satırlar varsayılan bölüme düşer ve bakım işi onları kendi bölümlerine ayırır
+    starts = conn.execute(text(
+        f"SELECT DISTINCT date_trunc('{interval}', date)::date FROM {old} ORDER BY 1"
+    )).scalars().all()
+    moved = 0
+    for start in starts:
+        end = next_period(start, interval)
+        create_partition(conn, start, interval)
+        moved += conn.execute(text(
+            f"INSERT INTO {PARENT} SELECT * FROM {old} WHERE date >= :start AND date < :end"
+        ), {"start": start, "end": end}).rowcount
+
+    sequence = conn.execute(text("SELECT pg_get_serial_sequence(:old, 'id')"), {"old": old}).scalar()
+    if sequence:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {PARENT}.id"))
+    conn.execute(text(f"DROP TABLE {old}"))
+    create_indexes(conn)
+    ensure_partitions(conn, ahead)
+    conn.execute(text(f"ANALYZE {PARENT}"))
+    return moved
+
+
+def convert_to_plain(conn: Connection) -> int:
+    """`convert_to_partitioned`'ın tersi: bölümlü tabloyu tek tabloya geri çevirir."""
+    if partition_interval(conn) is None:
+        return 0
+    old = f"{PARENT}_partitioned"
+    _rename_table(conn, old)
+    conn.execute(text(f"CREATE TABLE {PARENT} (LIKE {old} INCLUDING DEFAULTS, PRIMARY KEY (id))"))
+    conn.execute(text(f"ALTER TABLE {PARENT} ALTER COLUMN date DROP NOT NULL"))
+    moved = conn.execute(text(f"INSERT INTO {PARENT} SELECT * FROM {old}")).rowcount
+    sequence = conn.execute(text("SELECT pg_get_serial_sequence(:old, 'id')"), {"old": old}).scalar()
+    if sequence:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {PARENT}.id"))
+    conn.execute(text(f"DROP TABLE {old}"))  # bölümler de silinir
+    create_indexes(conn)
+    conn.execute(text(f"ANALYZE {PARENT}"))
+    return moved
+
+
+def create_indexes(conn: Connection):
+    for name, definition in INDEXES:
+        conn.execute(text(f"CREATE INDEX {name} ON {PARENT} {definition}"))
+    for name, column, target in FOREIGN_KEYS:
+        conn.execute(text(f"ALTER TABLE {PARENT} ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES {target} (id)"))
+
+
+class PartitionMaintainer:
+    """Gelecek dönem bölümlerini önceden açan arka plan iş parçacığı (ayrı süreç için: partition_transactions.py ensure)."""
+
+    def __init__(self, interval: float = PARTITION_MAINTENANCE_INTERVAL):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def enabled(self) -> bool:
+        return os.getenv("PARTITION_MAINTENANCE", "1") != "0" and engine.dialect.name == "postgresql"
+
+    def run_once(self) -> List[str]:
+        with engine.begin() as conn:
+            return ensure_partitions(conn)
+
+    def start(self):
+        if self.enabled and self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="transaction-partitions", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                created = self.run_once()
+                if created:
+                    print(f"İşlem bölümleri oluşturuldu: {', '.join(created)}")
+            except Exception as e:
+                print(f"Bölüm bakımı hatası: {e}")
+            self._stop.wait(self.interval)
+
+
+partition_maintainer = PartitionMaintainer()
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from passlib.context import CryptContext
+
+# bcrypt maliyeti; değiştirildiğinde eski hash'ler ilk başarılı girişte yeniden üretilir
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Hash işlemleri istek thread'lerinde değil, bu boyuttaki ayrı bir süreç havuzunda çalışır;
+# async uçlar sonucu event loop'ta bekler, böylece sıradaki işler threadpool thread'i tutmaz
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+# Havuzda aynı anda bekleyebilecek en fazla iş; aşılırsa istek hemen reddedilir
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", str(PASSWORD_HASH_WORKERS * 8)))
+
+# min = max = varsayılan: maliyet hangi yöne değişirse değişsin needs_update doğru döner
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+
+class PasswordPoolBusy(Exception):
+    """Hash kuyruğu dolu."""
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(password: str, hashed: str):
+    return pwd_context.verify_and_update(password, hashed)
+
+
+class PasswordHasher:
+    """bcrypt işlerini sınırlı bir süreç havuzunda çalıştırır (havuz ilk kullanımda açılır)."""
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, queue: int = PASSWORD_HASH_QUEUE):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(queue)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _submit(self, fn, *args):
+        """İşi havuza verir; kuyruk yeri iş bitince (sonucu bekleyen olmasa da) bırakılır."""
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolBusy()
+        try:
+            future = self._pool().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)  # PASSWORD_HASH_WORKERS=0: havuzsuz, aynı thread'de
+        return self._submit(fn, *args).result()
+
+    async def _run_async(self, fn, *args):
+        if self.workers <= 0:
+            return await asyncio.to_thread(fn, *args)
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password)
+
+    def verify_and_update(self, password: str, hashed: str):
+        """(geçerli mi, yeni hash veya None) döndürür."""
+        return self._run(_verify_and_update, password, hashed)
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async(_hash, password)
+
+    async def verify_and_update_async(self, password: str, hashed: str):
+        return await self._run_async(_verify_and_update, password, hashed)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,126 @@
+"""TCMB kur XML'lerinin ortak ayrıştırma ve yazma yolu.
+
+Günlük servis (`services.exchange_rates`), asenkron uç ve geçmiş aktarım (`bulk_import_rates`)
+aynı akışı kullanır: XML bir kez satır kümesine çevrilir, küme tek bir
+`INSERT ... ON CONFLICT (currency, date) DO UPDATE` ile yazılır.
+
+Kayıtlı bir XML dosyasını veritabanına yazmadan ayrıştırmak için:
+
+    cd backend
+    python -m services.rate_ingestion fixtures/tcmb/today.xml --date 2026-10-16
+
+Fixture'a karşı doğrulama (sorun varsa çıkış kodu 1): `python check_rate_ingestion.py`
+"""
+import xml.etree.ElementTree as ET
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models.exchange_rate import ExchangeRate
+from services.recalc_jobs import enqueue_recalc, enqueue_statement
+
+# XML alanı -> sütun. ForexBuying uygulamanın ana kuru olan rate_to_try'a yazılır.
+RATE_KINDS = {
+    "ForexBuying": "rate_to_try",
+    "ForexSelling": "forex_selling",
+    "BanknoteBuying": "banknote_buying",
+    "BanknoteSelling": "banknote_selling",
+}
+RATE_COLUMNS = list(RATE_KINDS.values())
+
+
+def _number(text: Optional[str]) -> Optional[float]:
+    # BAZI KURLAR BOŞ OLABİLİR!
+    if not text or not text.strip():
+        return None
+    return float(text.strip().replace(",", "."))
+
+
+def parse_tcmb_xml(content: bytes, on_date: date, currencies: Optional[Iterable[str]] = None) -> Tuple[str, List[dict]]:
+    """XML'i (Tarih, satırlar) çiftine çevirir; her satır tüm kur türlerini içerir.
+
+    ForexBuying'i olmayan para birimleri atlanır (tutarların TL karşılığı bu kurla hesaplanır).
+    """
+    wanted = {c.upper() for c in currencies} if currencies else None
+    root = ET.fromstring(content)
+    rows = []
+    for currency in root.findall("Currency"):
+        code = (currency.get("CurrencyCode") or "").upper()
+        # TL zaten 1 olduğu için eklemeye gerek yok
+        if not code or code == "TRY" or (wanted is not None and code not in wanted):
+            continue
+        row = {"currency": code, "date": on_date}
+        for field, column in RATE_KINDS.items():
+            row[column] = _number(currency.findtext(field))
+        if row["rate_to_try"] is None:
+            continue
+        rows.append(row)
+    return root.attrib.get("Tarih", ""), rows
+
+
+def upsert_statement(rows: List[dict]):
+    """Satırları tek ifadeyle yazan `INSERT ... ON CONFLICT DO UPDATE`; satır yoksa None.
+
+    Aynı (para birimi, tarih) iki kez gelirse son satır geçerli olur (Postgres aynı ifadede
+    bir çakışma satırını iki kez güncelleyemez). Yalnızca eklenen veya değeri gerçekten
+    değişen satırlar yazılır ve (currency, date) olarak geri döner.
+    """
+    unique = {(row["currency"], row["date"]): row for row in rows}
+    if not unique:
+        return None
+    values = [{"currency": c, "date": d, **{col: row.get(col) for col in RATE_COLUMNS}} for (c, d), row in unique.items()]
+    stmt = insert(ExchangeRate).values(values)
+    return stmt.on_conflict_do_update(
+        index_elements=["currency", "date"],
+        set_={col: getattr(stmt.excluded, col) for col in RATE_COLUMNS},
+        where=or_(*(getattr(ExchangeRate, col).is_distinct_from(getattr(stmt.excluded, col)) for col in RATE_COLUMNS)),
+    ).returning(ExchangeRate.currency, ExchangeRate.date)
+
+
+def written_rates(rows: List[dict]) -> List[tuple]:
+    """Kur tablosunu güncellemek için (para birimi, tarih, kur) demetleri."""
+    return [(row["currency"], row["date"], row["rate_to_try"]) for row in rows]
+
+
+def store_rates(db: Session, rows: List[dict]) -> List[tuple]:
+    """Satırları yazar ve değişen kurlar için tl_total yeniden hesaplama işi kuyruğa ekler.
+
+    Commit çağırana kalır (kur ve iş aynı transaction'da yazılır); değişen (para birimi, tarih)
+    çiftlerini döndürür.
+    """
+    stmt = upsert_statement(rows)
+    if stmt is None:
+        return []
+    changed = [tuple(r) for r in db.execute(stmt).all()]
+    enqueue_recalc(db, changed)
+    return changed
+
+
+async def store_rates_async(db: AsyncSession, rows: List[dict]) -> List[tuple]:
+    stmt = upsert_statement(rows)
+    if stmt is None:
+        return []
+    changed = [tuple(r) for r in (await db.execute(stmt)).all()]
+    enqueue = enqueue_statement(changed)
+    if enqueue is not None:
+        await db.execute(enqueue)
+    return changed
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="Kayıtlı TCMB XML dosyası")
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--currencies", nargs="*")
+    args = parser.parse_args()
+
+    with open(args.path, "rb") as f:
+        tarih, parsed = parse_tcmb_xml(f.read(), args.date, args.currencies)
+    print(json.dumps({"Tarih": tarih, "rows": parsed}, default=str, ensure_ascii=False, indent=2))
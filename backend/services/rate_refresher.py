@@ -0,0 +1,70 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+from database import SessionLocal
+from services.exchange_rates import fetch_and_store_exchange_rates, TCMB_URL
+
+# TCMB gösterge kurlarını iş günleri 15:30 (TSİ) civarında yayımlar; biraz pay bırakılır
+TR_TZ = timezone(timedelta(hours=3))
+PUBLICATION_TIME = (15, 45)
+RETRY_DELAY = 15 * 60
+
+
+def next_publication_window(now: datetime) -> datetime:
+    """`now` sonrasındaki ilk iş günü yayın saatini döndürür."""
+    candidate = now.replace(hour=PUBLICATION_TIME[0], minute=PUBLICATION_TIME[1], second=0, microsecond=0)
+    if candidate <= now:
+        candidate += timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+def _refresh(url: str) -> dict:
+    db = SessionLocal()
+    try:
+        return fetch_and_store_exchange_rates(db, url)
+    finally:
+        db.close()
+
+
+async def refresh_loop(url: str = TCMB_URL):
+    """Açılışta bir kez, sonra her yayın penceresinde bir kez kurları çekip yazar."""
+    while True:
+        result = await asyncio.to_thread(_refresh, url)
+        if "error" in result:
+            print(f"Kur güncelleme hatası: {result['error']}")
+            delay = RETRY_DELAY
+        else:
+            now = datetime.now(TR_TZ)
+            delay = (next_publication_window(now) - now).total_seconds()
+        await asyncio.sleep(delay)
+
+
+class RateRefresher:
+    """`main.app` açılışında başlatılan arka plan kur güncelleyicisi."""
+
+    def __init__(self, url: str = TCMB_URL):
+        self.url = url
+        self._task = None
+
+    @property
+    def enabled(self) -> bool:
+        return os.getenv("EXCHANGE_RATE_REFRESH", "1") != "0"
+
+    def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(refresh_loop(self.url))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+rate_refresher = RateRefresher()
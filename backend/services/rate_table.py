@@ -0,0 +1,150 @@
+import os
+import threading
+import time
+from bisect import bisect_right
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from models.exchange_rate import ExchangeRate
+
+# Diğer worker süreçlerinin yazdığı kurları da görmek için tablo en fazla bu kadar saniyede bir yeniden yüklenir
+RATE_TABLE_MAX_AGE = int(os.getenv("RATE_TABLE_MAX_AGE", "300"))
+
+
+class RateTable:
+    """Süreç içi "as-of" kur tablosu.
+
+    Her para birimi için tarihe göre sıralı bir tarih dizisi ve buna paralel kur dizisi
+    tutulur; bir tarihteki geçerli kur (o tarihte veya öncesindeki en son kur) bisect ile
+    O(log n) bulunur. Tablo ilk kullanımda bir kez yüklenir, kur yazan kodlar `update()`
+    ile artımlı olarak günceller.
+    """
+
+    def __init__(self, max_age: int = RATE_TABLE_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._dates: Dict[str, List[date]] = {}
+        self._rates: Dict[str, List] = {}
+        self._loaded_at: Optional[float] = None
+        # Tablo her değiştiğinde artar; türetilmiş önbellekler (çapraz kur matrisleri) buna bakar
+        self.version = 0
+
+    @staticmethod
+    def _statement():
+        return (
+            select(ExchangeRate.currency, ExchangeRate.date, ExchangeRate.rate_to_try)
+            .where(ExchangeRate.currency.isnot(None), ExchangeRate.date.isnot(None))
+            .order_by(ExchangeRate.currency, ExchangeRate.date)
+        )
+
+    def _is_stale(self) -> bool:
+        loaded_at = self._loaded_at
+        return loaded_at is None or time.monotonic() - loaded_at > self.max_age
+
+    def load(self, db: Session):
+        self._replace(db.execute(self._statement()).all())
+
+    async def load_async(self, db: AsyncSession):
+        self._replace((await db.execute(self._statement())).all())
+
+    def _replace(self, rows):
+        dates: Dict[str, List[date]] = {}
+        rates: Dict[str, List] = {}
+        for currency, on_date, rate in rows:
+            code = currency.upper()
+            dates.setdefault(code, []).append(on_date)
+            rates.setdefault(code, []).append(rate)
+
+        with self._lock:
+            self._dates = dates
+            self._rates = rates
+            self._loaded_at = time.monotonic()
+            self.version += 1
+
+    def ensure_loaded(self, db: Session):
+        if self._is_stale():
+            self.load(db)
+
+    async def ensure_loaded_async(self, db: AsyncSession):
+        if self._is_stale():
+            await self.load_async(db)
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+            self.version += 1
+
+    def update(self, rows: Iterable[Tuple[str, date, object]]):
+        """Yeni yazılan (para birimi, tarih, kur) satırlarını tabloya işler."""
+        with self._lock:
+            if self._loaded_at is None:
+                return  # henüz yüklenmedi; ilk kullanımda zaten DB'den okunacak
+            for currency, on_date, rate in rows:
+                code = currency.upper()
+                dates = self._dates.setdefault(code, [])
+                rates = self._rates.setdefault(code, [])
+                i = bisect_right(dates, on_date)
+                if i and dates[i - 1] == on_date:
+                    rates[i - 1] = rate
+                else:
+                    dates.insert(i, on_date)
+                    rates.insert(i, rate)
+            self.version += 1
+
+    def lookup(self, db: Session, currency: str, on_date: date):
+        """`on_date` tarihinde geçerli kur; kayıt yoksa None."""
+        self.ensure_loaded(db)
+        return self.lookup_loaded(currency, on_date)
+
+    def lookup_loaded(self, currency: str, on_date: date):
+        """Yüklü tablodan (DB'ye gitmeden) kur arar; önce `ensure_loaded*` çağrılmalıdır."""
+        with self._lock:
+            dates = self._dates.get(currency.upper())
+            if not dates:
+                return None
+            i = bisect_right(dates, on_date)
+            if i == 0:
+                return None
+            return self._rates[currency.upper()][i - 1]
+
+    def rates_at(self, on_date: date) -> Dict[str, object]:
+        """Yüklü tablodaki tüm para birimlerinin `on_date` tarihinde geçerli kurları."""
+        with self._lock:
+            rates = {}
+            for code, dates in self._dates.items():
+                i = bisect_right(dates, on_date)
+                if i:
+                    rates[code] = self._rates[code][i - 1]
+            return rates
+
+
+rate_table = RateTable()
+
+
+def calculate_tl_total(db: Session, amount, currency: str, on_date: date):
+    """İşlem tutarının TL karşılığı; kur bulunamazsa None."""
+    if currency.upper() not in ["TL", "TRY"]:
+        rate_table.ensure_loaded(db)
+    return tl_total_from_table(amount, currency, on_date)
+
+
+async def calculate_tl_total_async(db: AsyncSession, amount, currency: str, on_date: date):
+    if currency.upper() not in ["TL", "TRY"]:
+        await rate_table.ensure_loaded_async(db)
+    return tl_total_from_table(amount, currency, on_date)
+
+
+def tl_total_from_table(amount, currency: str, on_date: date):
+    if currency.upper() in ["TL", "TRY"]:
+        return amount
+
+    rate = rate_table.lookup_loaded(currency, on_date)
+    if not rate:
+        return None
+    try:
+        return float(amount) * float(rate)
+    except Exception:
+        return None
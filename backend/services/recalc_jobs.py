@@ -0,0 +1,238 @@
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import ExchangeRate, Transaction, TlTotalRecalcJob
+from services.rollups import KEY_FIELDS, apply_deltas, collect_deltas
+
+# Tek UPDATE ile işlenecek işlem sayısı (her parçadan sonra commit + ilerleme kaydı)
+RECALC_CHUNK_SIZE = int(os.getenv("RECALC_CHUNK_SIZE", "5000"))
+# Uygulama içi işçinin boşta kuyruğu yoklama aralığı (sn); RECALC_WORKER=0 ile kapatılır
+RECALC_POLL_INTERVAL = float(os.getenv("RECALC_POLL_INTERVAL", "5"))
+# Bu süre boyunca ilerleme kaydetmeyen "running" iş (çöken işçi) başka bir işçi tarafından devralınır
+RECALC_STALE_AFTER = int(os.getenv("RECALC_STALE_AFTER", "300"))
+
+_tx = Transaction.__table__
+_rates = ExchangeRate.__table__
+
+
+def enqueue_statement(changes: Iterable[Tuple[str, date]]):
+    """Değişen (para birimi, tarih) kurları için iş kuyruğuna yazan ifade; değişiklik yoksa None.
+
+    Para birimi başına tek bekleyen iş tutulur: aynı para birimi için yeni bir değişiklik
+    gelirse bekleyen işin başlangıç tarihi geri çekilir (iş sayısı büyümez).
+    """
+    earliest = {}
+    for currency, on_date in changes:
+        code = currency.upper()
+        if code in ("TL", "TRY"):
+            continue
+        earliest[code] = min(on_date, earliest.get(code, on_date))
+    if not earliest:
+        return None
+
+    stmt = insert(TlTotalRecalcJob).values([
+        {"currency": code, "date_from": on_date, "status": "pending", "created_at": datetime.utcnow()}
+        for code, on_date in earliest.items()
+    ])
+    return stmt.on_conflict_do_update(
+        index_elements=["currency"],
+        # Kısmi indeks çıkarımı için koşul indeks tanımıyla aynı literal olmalı (bağlı parametre eşleşmez)
+        index_where=text("status = 'pending'"),
+        set_={"date_from": func.least(TlTotalRecalcJob.date_from, stmt.excluded.date_from)},
+    )
+
+
+def enqueue_recalc(db: Session, changes: Iterable[Tuple[str, date]]):
+    """İşleri kur yazımıyla aynı transaction içinde kuyruğa ekler (commit çağırana kalır)."""
+    stmt = enqueue_statement(changes)
+    if stmt is not None:
+        db.execute(stmt)
+
+
+def job_to_dict(job: TlTotalRecalcJob) -> dict:
+    progress = None
+    if job.total:
+        progress = round(min(job.processed / job.total, 1.0) * 100, 1)
+    elif job.status == "done":
+        progress = 100.0
+    return {
+        "id": job.id,
+        "currency": job.currency,
+        "date_from": job.date_from,
+        "status": job.status,
+        "total": job.total,
+        "processed": job.processed,
+        "updated": job.updated,
+        "progress": progress,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def _scope(table, job: TlTotalRecalcJob) -> list:
+    # Para birimi kodları büyük harfle saklanır; sütuna upper() uygulamak ix_transactions_currency_date'i devre dışı bırakır
+    return [table.c.currency == job.currency.upper(), table.c.date >= job.date_from]
+
+
+def _update_statement(job: TlTotalRecalcJob, first_id: int, last_id: int):
+    """(first_id, last_id] aralığındaki kapsam içi işlemleri tek `UPDATE ... FROM` ile günceller.
+
+    Yalnızca tl_total'ı gerçekten değişen satırlar yazılır (iş tekrar çalışsa da sonuç aynı);
+    özet tablosu farkları için eski/yeni değerler RETURNING ile döner.
+    """
+    src = _tx.alias("src")
+    as_of_rate = (
+        select(_rates.c.rate_to_try)
+        .where(_rates.c.currency == src.c.currency, _rates.c.date <= src.c.date)
+        .order_by(_rates.c.date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    computed = (
+        select(
+            src.c.id,
+            src.c.tl_total.label("old_tl_total"),
+            func.round(src.c.amount * as_of_rate, 2).label("new_tl_total"),
+        )
+        .where(*_scope(src, job), src.c.id > first_id, src.c.id <= last_id)
+        .subquery("computed")
+    )
+    return (
+        _tx.update()
+        .where(_tx.c.id == computed.c.id, _tx.c.tl_total.is_distinct_from(computed.c.new_tl_total))
+        .values(tl_total=computed.c.new_tl_total)
+        .returning(
+            _tx.c.date, *(_tx.c[name] for name in KEY_FIELDS), _tx.c.amount,
+            computed.c.old_tl_total, _tx.c.tl_total,
+        )
+    )
+
+
+def _rollup_items(rows) -> list:
+    items = []
+    for row in rows:
+        base = {"date": row.date, "amount": row.amount, **{name: row._mapping[name] for name in KEY_FIELDS}}
+        items.append(({**base, "tl_total": row.old_tl_total}, -1))
+        items.append(({**base, "tl_total": row.tl_total}, 1))
+    return items
+
+
+def claim_job(db: Session) -> Optional[TlTotalRecalcJob]:
+    """Sıradaki bekleyen (veya sahipsiz kalmış) işi kilitleyip "running" yapar."""
+    stale = datetime.utcnow() - timedelta(seconds=RECALC_STALE_AFTER)
+    job = db.execute(
+        select(TlTotalRecalcJob)
+        .where(or_(
+            TlTotalRecalcJob.status == "pending",
+            and_(TlTotalRecalcJob.status == "running", TlTotalRecalcJob.heartbeat_at < stale),
+        ))
+        .order_by(TlTotalRecalcJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).scalars().first()
+    if job is None:
+        db.rollback()
+        return None
+
+    now = datetime.utcnow()
+    if job.status == "pending":
+        job.started_at = now
+        job.total = db.execute(select(func.count()).select_from(_tx).where(*_scope(_tx, job))).scalar()
+    job.status = "running"
+    job.heartbeat_at = now
+    db.commit()
+    return job
+
+
+def run_job(db: Session, job: TlTotalRecalcJob, chunk_size: int = RECALC_CHUNK_SIZE,
+            stop: Optional[threading.Event] = None) -> TlTotalRecalcJob:
+    """İşi `last_id`'den devam ederek parça parça işler; her parça kendi transaction'ında."""
+    try:
+        while not (stop and stop.is_set()):
+            ids: List[int] = db.execute(
+                select(_tx.c.id)
+                .where(*_scope(_tx, job), _tx.c.id > job.last_id)
+                .order_by(_tx.c.id)
+                .limit(chunk_size)
+            ).scalars().all()
+            if not ids:
+                job.status = "done"
+                job.finished_at = datetime.utcnow()
+                db.commit()
+                break
+
+            rows = db.execute(_update_statement(job, job.last_id, ids[-1])).all()
+            apply_deltas(db, collect_deltas(_rollup_items(rows)))
+            job.last_id = ids[-1]
+            job.processed += len(ids)
+            job.updated += len(rows)
+            job.heartbeat_at = datetime.utcnow()
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        job.status = "failed"
+        job.error = str(e)
+        job.finished_at = datetime.utcnow()
+        db.commit()
+    return job
+
+
+def run_pending_jobs(stop: Optional[threading.Event] = None) -> int:
+    """Kuyruk boşalana kadar işleri çalıştırır; çalıştırılan iş sayısını döndürür."""
+    count = 0
+    db = SessionLocal()
+    try:
+        while not (stop and stop.is_set()):
+            job = claim_job(db)
+            if job is None:
+                break
+            run_job(db, job, stop=stop)
+            count += 1
+    finally:
+        db.close()
+    return count
+
+
+class RecalcWorker:
+    """`main.app` içinde çalışan arka plan işçisi (ayrı süreç için: recalc_tl_totals.py work)."""
+
+    def __init__(self, poll_interval: float = RECALC_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def enabled(self) -> bool:
+        return os.getenv("RECALC_WORKER", "1") != "0"
+
+    def start(self):
+        if self.enabled and self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="tl-total-recalc", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                run_pending_jobs(self._stop)
+            except Exception as e:
+                print(f"tl_total yeniden hesaplama hatası: {e}")
+            self._stop.wait(self.poll_interval)
+
+
+recalc_worker = RecalcWorker()
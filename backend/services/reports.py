@@ -0,0 +1,148 @@
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import Date, cast, func, select
+from sqlalchemy.orm import Session
+
+from models import Transaction, TransactionMonthlyRollup
+from services.cross_rates import convert_tl_totals, cross_rates
+from services.transactions import TransactionFilters, NO_FILTERS
+
+# Gruplanabilir boyutlar
+DIMENSIONS = {
+    "type": Transaction.type,
+    "project_id": Transaction.project_id,
+    "category_id": Transaction.category_id,
+    "currency": Transaction.currency,
+}
+DATE_BUCKETS = ("day", "week", "month")
+
+
+def dimension_column(name: str):
+    if name in DIMENSIONS:
+        return DIMENSIONS[name].label(name)
+    if name in DATE_BUCKETS:
+        return cast(func.date_trunc(name, Transaction.date), Date).label(name)
+    raise HTTPException(
+        status_code=400,
+        detail=f"Geçersiz gruplama: {name}. Geçerli değerler: {', '.join([*DIMENSIONS, *DATE_BUCKETS])}",
+    )
+
+
+def _json_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def to_columnar(names: List[str], rows) -> dict:
+    """Satır listesini {"columns": [...], "data": {sütun: [değerler]}} biçimine çevirir."""
+    data = {name: [] for name in names}
+    for row in rows:
+        for name, value in zip(names, row):
+            data[name].append(_json_value(value))
+    return {"columns": names, "length": len(rows), "data": data}
+
+
+ROLLUP_DIMENSIONS = {"type", "project_id", "category_id", "currency", "month"}
+
+
+def can_use_rollups(group_by: List[str], filters: TransactionFilters) -> bool:
+    """Aylık özet tablosu sorguyu karşılayabiliyor mu (ay ve üstü gruplama, ay sınırlı tarih aralığı, tutar filtresi yok)."""
+    return set(group_by) <= ROLLUP_DIMENSIONS and filters.rollup_compatible()
+
+
+def _summarize_rollups(db: Session, group_by: List[str], filters: TransactionFilters) -> dict:
+    dims = [getattr(TransactionMonthlyRollup, name).label(name) for name in group_by]
+    measures = [
+        func.coalesce(func.sum(TransactionMonthlyRollup.count), 0).label("count"),
+        func.coalesce(func.sum(TransactionMonthlyRollup.tl_total), 0).label("tl_total"),
+    ]
+    if "currency" in group_by:
+        measures.append(func.sum(TransactionMonthlyRollup.amount).label("amount"))
+
+    query = db.query(*dims, *measures).filter(*filters.rollup_conditions())
+    if dims:
+        query = query.group_by(*dims).having(func.sum(TransactionMonthlyRollup.count) != 0).order_by(*dims)
+
+    names = group_by + [m.name for m in measures]
+    return to_columnar(names, query.all())
+
+
+def _summarize_in_currency(
+    db: Session, group_by: List[str], dims: list, measures: list, filters: TransactionFilters, report_currency: str
+) -> dict:
+    """Gruplar gün kırılımıyla okunur, TL toplamları günün çapraz kuruyla toplu çevrilip yeniden toplanır."""
+    query = db.query(*dims, Transaction.date, *measures).filter(*filters.conditions()).group_by(*dims, Transaction.date)
+    rows = query.order_by(*dims, Transaction.date).all()
+
+    n_dims, n_measures = len(dims), len(measures)
+    matrices = cross_rates.matrices(row[n_dims] for row in rows)
+    converted = convert_tl_totals(matrices, [(row[n_dims], row.tl_total) for row in rows], report_currency)
+
+    # Sorgu boyutlara göre sıralı olduğundan gruplar ardışık gelir; sözlük sırası korunur
+    groups = {}
+    for row, value in zip(rows, converted):
+        key = tuple(row[:n_dims])
+        sums = groups.get(key)
+        if sums is None:
+            sums = groups[key] = [0] * n_measures + [0.0]
+        for i, measure in enumerate(row[n_dims + 1:]):
+            sums[i] = None if measure is None or sums[i] is None else sums[i] + measure
+        # Kuru bilinmeyen gün varsa grubun rapor toplamı boş (null) döner
+        sums[-1] = None if value is None or sums[-1] is None else sums[-1] + value
+
+    names = group_by + [m.name for m in measures] + ["report_total"]
+    result_rows = [(*key, *sums[:-1], None if sums[-1] is None else round(sums[-1], 2)) for key, sums in groups.items()]
+    return {**to_columnar(names, result_rows), "report_currency": report_currency}
+
+
+def summarize_transactions(
+    db: Session,
+    group_by: List[str],
+    filters: TransactionFilters = NO_FILTERS,
+    report_currency: Optional[str] = None,
+) -> dict:
+    """tl_total toplamı ve işlem sayısını `GROUP BY` ile veritabanında hesaplar.
+
+    Gruplama ve filtreler izin veriyorsa aylık özet tablosu kullanılır. `report_currency`
+    verilirse ek olarak `report_total` (her günün kuruyla o para birimine çevrilmiş toplam)
+    döner; bu durumda gün kırılımı gerektiğinden özet tablosu kullanılmaz.
+    """
+    group_by = list(dict.fromkeys(group_by))  # tekrarları at, sırayı koru
+    dims = [dimension_column(name) for name in group_by]
+
+    # Ay ve üstü gruplamalar milyonlarca işlem yerine aylık özet tablosundan okunur
+    if not report_currency and can_use_rollups(group_by, filters):
+        return _summarize_rollups(db, group_by, filters)
+
+    measures = summary_measures(group_by)
+    if report_currency:
+        return _summarize_in_currency(db, group_by, dims, measures, filters, report_currency)
+
+    names = group_by + [m.name for m in measures]
+    return to_columnar(names, db.execute(summary_statement(group_by, filters)).all())
+
+
+def summary_measures(group_by: List[str]) -> list:
+    measures = [
+        func.count(Transaction.id).label("count"),
+        func.coalesce(func.sum(Transaction.tl_total), 0).label("tl_total"),
+    ]
+    # Tutar toplamı yalnızca para birimine göre gruplanınca anlamlıdır
+    if "currency" in group_by:
+        measures.append(func.sum(Transaction.amount).label("amount"))
+    return measures
+
+
+def summary_statement(group_by: List[str], filters: TransactionFilters = NO_FILTERS):
+    """İşlemlerden gruplu özet sorgusu (özet tablosu kullanılmadığında)."""
+    dims = [dimension_column(name) for name in group_by]
+    stmt = select(*dims, *summary_measures(group_by)).where(*filters.conditions())
+    if dims:
+        stmt = stmt.group_by(*dims).order_by(*dims)
+    return stmt
@@ -0,0 +1,214 @@
+from datetime import date, timedelta
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from models import ExchangeRate, Transaction
+
+# NumPy isteğe bağlı bağımlılıktır; kurulu değilse yeniden değerleme ucu 400 döner
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Tek istekte değerlenebilecek en fazla tarih sayısı
+MAX_VALUATION_DATES = 1000
+STEPS = ("day", "week", "month")
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class Flows(NamedTuple):
+    """Günlük net döviz akışları: (proje, para birimi) anahtarı başına satırlar."""
+    projects: "np.ndarray"        # anahtar -> proje id
+    currencies: List[str]         # anahtar -> para birimi
+    key_index: "np.ndarray"       # akış -> anahtar
+    dates: "np.ndarray"           # akış -> tarih (datetime64[D])
+    amounts: "np.ndarray"         # akış -> döviz cinsinden net tutar (gelir +, gider -)
+    book: "np.ndarray"            # akış -> işlem tarihi kuruyla TL karşılığı (tl_total)
+
+
+class Revaluation(NamedTuple):
+    """(anahtar x değerleme tarihi) matrisleri."""
+    projects: "np.ndarray"
+    currencies: List[str]
+    valuation_dates: "np.ndarray"
+    position: "np.ndarray"        # döviz cinsinden açık pozisyon
+    book_tl: "np.ndarray"         # tarihî kurlarla TL değeri
+    rate: "np.ndarray"            # değerleme tarihindeki as-of kur (yoksa NaN)
+    revalued_tl: "np.ndarray"     # pozisyon x güncel kur
+    gain_tl: "np.ndarray"         # gerçekleşmemiş kur farkı
+
+
+def valuation_dates(date_from: date, date_to: date, step: str) -> List[date]:
+    """[date_from, date_to] aralığında gün/hafta/ay adımlı değerleme tarihleri (ay: ay sonları)."""
+    dates = []
+    current = date_from
+    # Sınırın bir fazlası üretilir; çağıran aşımı bu sayede fark eder
+    while current <= date_to and len(dates) <= MAX_VALUATION_DATES:
+        if step == "month":
+            next_month = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+            dates.append(min(next_month - timedelta(days=1), date_to))
+            current = next_month
+        else:
+            dates.append(current)
+            current += timedelta(days=7 if step == "week" else 1)
+    return dates
+
+
+def load_flows(db: Session, until: date, project_ids: Sequence[int] = ()) -> Flows:
+    """TL dışı işlemleri (proje, para birimi, gün) bazında DB'de toplayıp dizilere yükler."""
+    sign = case((Transaction.type == "gider", -1), else_=1)
+    currency = func.upper(Transaction.currency)
+    stmt = (
+        select(
+            Transaction.project_id,
+            currency.label("currency"),
+            Transaction.date,
+            func.sum(sign * Transaction.amount).label("amount"),
+            func.sum(sign * func.coalesce(Transaction.tl_total, 0)).label("book"),
+        )
+        .where(
+            currency.notin_(["TL", "TRY"]),
+            Transaction.date <= until,
+            Transaction.project_id.isnot(None),
+            Transaction.amount.isnot(None),
+        )
+        .group_by(Transaction.project_id, currency, Transaction.date)
+        .order_by(Transaction.project_id, currency, Transaction.date)
+    )
+    if project_ids:
+        stmt = stmt.where(Transaction.project_id.in_(project_ids))
+    rows = db.execute(stmt).all()
+
+    keys: Dict[Tuple[int, str], int] = {}
+    key_index = np.empty(len(rows), dtype=np.int64)
+    for i, row in enumerate(rows):
+        key_index[i] = keys.setdefault((row.project_id, row.currency), len(keys))
+    return Flows(
+        projects=np.array([k[0] for k in keys], dtype=np.int64),
+        currencies=[k[1] for k in keys],
+        key_index=key_index,
+        dates=np.array([row.date for row in rows], dtype="datetime64[D]"),
+        amounts=np.array([row.amount for row in rows], dtype=np.float64),
+        book=np.array([row.book for row in rows], dtype=np.float64),
+    )
+
+
+def load_rate_series(db: Session, currencies: Sequence[str], until: date) -> Dict[str, Tuple["np.ndarray", "np.ndarray"]]:
+    """Para birimi başına tarihe göre sıralı (tarihler, kurlar) dizileri."""
+    if not currencies:
+        return {}
+    rows = db.execute(
+        select(ExchangeRate.currency, ExchangeRate.date, ExchangeRate.rate_to_try)
+        .where(ExchangeRate.currency.in_(set(currencies)), ExchangeRate.date <= until,
+               ExchangeRate.rate_to_try.isnot(None))
+        .order_by(ExchangeRate.currency, ExchangeRate.date)
+    ).all()
+    grouped: Dict[str, Tuple[list, list]] = {}
+    for code, on_date, rate in rows:
+        dates, rates = grouped.setdefault(code, ([], []))
+        dates.append(on_date)
+        rates.append(rate)
+    return {
+        code: (np.array(dates, dtype="datetime64[D]"), np.array(rates, dtype=np.float64))
+        for code, (dates, rates) in grouped.items()
+    }
+
+
+def revalue(flows: Flows, rate_series: Dict[str, Tuple["np.ndarray", "np.ndarray"]], at: Sequence[date]) -> Revaluation:
+    """Tüm anahtarları tüm değerleme tarihlerinde tek vektörel geçişte değerler.
+
+    Her akış, tarihi kendisinden büyük/eşit ilk değerleme tarihinin sütununa eklenir; sütunlar
+    boyunca kümülatif toplam, her değerleme tarihindeki açık pozisyonu verir. Kurlar para birimi
+    başına `searchsorted` ile as-of olarak seçilir.
+    """
+    valuation = np.array(sorted(set(at)), dtype="datetime64[D]")
+    n_keys, n_dates = len(flows.currencies), len(valuation)
+
+    column = np.searchsorted(valuation, flows.dates, side="left")
+    inside = column < n_dates  # son değerleme tarihinden sonraki akışlar hiçbir pozisyona girmez
+    position = np.zeros((n_keys, n_dates))
+    book = np.zeros((n_keys, n_dates))
+    np.add.at(position, (flows.key_index[inside], column[inside]), flows.amounts[inside])
+    np.add.at(book, (flows.key_index[inside], column[inside]), flows.book[inside])
+    position = np.cumsum(position, axis=1)
+    book = np.cumsum(book, axis=1)
+
+    # Para birimi başına as-of kur satırı, sonra anahtarlara yayılır
+    codes = sorted(set(flows.currencies))
+    code_rates = np.full((len(codes), n_dates), np.nan)
+    for i, code in enumerate(codes):
+        if code not in rate_series:
+            continue
+        dates, rates = rate_series[code]
+        idx = np.searchsorted(dates, valuation, side="right") - 1
+        code_rates[i] = np.where(idx >= 0, rates[np.clip(idx, 0, None)], np.nan)
+    code_of_key = np.array([codes.index(c) for c in flows.currencies], dtype=np.int64)
+    rate = code_rates[code_of_key] if n_keys else np.zeros((0, n_dates))
+
+    revalued = position * rate
+    return Revaluation(
+        projects=flows.projects,
+        currencies=flows.currencies,
+        valuation_dates=valuation,
+        position=position,
+        book_tl=book,
+        rate=rate,
+        revalued_tl=revalued,
+        gain_tl=revalued - book,
+    )
+
+
+def _nan_to_none(values: "np.ndarray") -> list:
+    return [None if v != v else round(v, 2) for v in values.tolist()]
+
+
+def to_columnar(result: Revaluation, by_currency: bool) -> dict:
+    """Uzun biçimli sütun bazlı JSON (reports/summary ile aynı yapı).
+
+    by_currency=False ise para birimleri proje bazında toplanır; kuru bilinmeyen para birimi
+    varsa o projenin yeniden değerlenmiş toplamı boş (null) döner.
+    """
+    n_dates = len(result.valuation_dates)
+    if by_currency:
+        projects = result.projects
+        position, book, revalued, gain = result.position, result.book_tl, result.revalued_tl, result.gain_tl
+    else:
+        projects, inverse = np.unique(result.projects, return_inverse=True)
+
+        def by_project(matrix):
+            out = np.zeros((len(projects), n_dates))
+            np.add.at(out, inverse, matrix)
+            return out
+
+        book, revalued = by_project(result.book_tl), by_project(result.revalued_tl)
+        gain = revalued - book
+
+    n_rows = len(projects) * n_dates
+    data = {
+        "project_id": np.repeat(projects, n_dates).tolist(),
+        "valuation_date": [str(d) for d in np.tile(result.valuation_dates, len(projects))],
+    }
+    columns = ["project_id", "valuation_date"]
+    if by_currency:
+        data["currency"] = [c for c in result.currencies for _ in range(n_dates)]
+        data["position"] = _nan_to_none(position.ravel())
+        data["rate"] = [None if v != v else v for v in result.rate.ravel().tolist()]
+        columns += ["currency", "position", "rate"]
+    data["book_tl"] = _nan_to_none(book.ravel())
+    data["revalued_tl"] = _nan_to_none(revalued.ravel())
+    data["gain_tl"] = _nan_to_none(gain.ravel())
+    columns += ["book_tl", "revalued_tl", "gain_tl"]
+    return {"columns": columns, "length": n_rows, "data": data}
+
+
+def revaluation_report(db: Session, at: Sequence[date], project_ids: Sequence[int] = (),
+                       by_currency: bool = False) -> dict:
+    until = max(at)
+    flows = load_flows(db, until, project_ids)
+    rate_series = load_rate_series(db, flows.currencies, until)
+    return to_columnar(revalue(flows, rate_series, at), by_currency)
@@ -0,0 +1,134 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import Date, and_, cast, func, select, delete, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from models import Transaction, TransactionMonthlyRollup
+
+KEY_FIELDS = ("project_id", "category_id", "type", "currency")
+MEASURES = ("count", "amount", "tl_total")
+
+RollupKey = Tuple  # (month, project_id, category_id, type, currency)
+
+
+def _dec(value) -> Decimal:
+    if value is None:
+        return Decimal(0)
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def rollup_snapshot(tr) -> dict:
+    """İşlemin özet tablosunu etkileyen alanlarının kopyası (güncelleme öncesi değerler için)."""
+    get = tr.get if isinstance(tr, dict) else lambda name: getattr(tr, name)
+    return {name: get(name) for name in ("date", *KEY_FIELDS, "amount", "tl_total")}
+
+
+def _key(snapshot: dict) -> Optional[RollupKey]:
+    if snapshot["date"] is None or any(snapshot[name] is None for name in KEY_FIELDS):
+        return None  # eksik alanlı eski kayıtlar özetlenmez
+    return (snapshot["date"].replace(day=1), *(snapshot[name] for name in KEY_FIELDS))
+
+
+def collect_deltas(items: Iterable[Tuple[dict, int]]) -> Dict[RollupKey, list]:
+    """(snapshot, +1/-1) çiftlerini kova başına [count, amount, tl_total] farklarına indirger."""
+    deltas = defaultdict(lambda: [0, Decimal(0), Decimal(0)])
+    for snapshot, sign in items:
+        key = _key(snapshot)
+        if key is None:
+            continue
+        delta = deltas[key]
+        delta[0] += sign
+        delta[1] += sign * _dec(snapshot["amount"])
+        delta[2] += sign * _dec(snapshot["tl_total"])
+    return {key: d for key, d in deltas.items() if any(d)}
+
+
+def delta_statement(deltas: Dict[RollupKey, list]):
+    """Farkları özet tablosuna ekleyen tek `INSERT ... ON CONFLICT DO UPDATE`; fark yoksa None."""
+    if not deltas:
+        return None
+    rows = [
+        dict(zip(("month", *KEY_FIELDS), key), count=d[0], amount=d[1], tl_total=d[2])
+        for key, d in deltas.items()
+    ]
+    stmt = insert(TransactionMonthlyRollup).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["month", *KEY_FIELDS],
+        set_={
+            name: getattr(TransactionMonthlyRollup, name) + getattr(stmt.excluded, name)
+            for name in MEASURES
+        },
+    )
+
+
+def apply_deltas(db: Session, deltas: Dict[RollupKey, list]):
+    stmt = delta_statement(deltas)
+    if stmt is not None:
+        db.execute(stmt)
+
+
+def record_insert(db: Session, tr):
+    apply_deltas(db, collect_deltas([(rollup_snapshot(tr), 1)]))
+
+
+def record_delete(db: Session, tr):
+    apply_deltas(db, collect_deltas([(rollup_snapshot(tr), -1)]))
+
+
+def record_update(db: Session, old_snapshot: dict, tr):
+    # Eski kovadan düş, yeni kovaya ekle (aynı kovadaysa tek fark olarak birleşir)
+    apply_deltas(db, collect_deltas([(old_snapshot, -1), (rollup_snapshot(tr), 1)]))
+
+
+def _computed_rollups():
+    month = cast(func.date_trunc("month", Transaction.date), Date)
+    keys = [getattr(Transaction, name) for name in KEY_FIELDS]
+    return (
+        select(
+            month.label("month"),
+            *keys,
+            func.count().label("count"),
+            func.coalesce(func.sum(Transaction.amount), 0).label("amount"),
+            func.coalesce(func.sum(Transaction.tl_total), 0).label("tl_total"),
+        )
+        .where(Transaction.date.isnot(None), *(k.isnot(None) for k in keys))
+        .group_by(month, *keys)
+    )
+
+
+def rebuild_rollups(db: Session) -> int:
+    """Özet tablosunu işlemlerden baştan üretir."""
+    db.execute(delete(TransactionMonthlyRollup))
+    computed = _computed_rollups()
+    db.execute(
+        TransactionMonthlyRollup.__table__.insert().from_select(
+            ["month", *KEY_FIELDS, *MEASURES], computed
+        )
+    )
+    db.commit()
+    return db.query(TransactionMonthlyRollup).count()
+
+
+def verify_rollups(db: Session) -> list:
+    """Özet tablosu ile işlemlerden hesaplanan değerleri karşılaştırır; farklı kovaları döndürür."""
+    computed = _computed_rollups().subquery("c")
+    stored = select(TransactionMonthlyRollup).where(TransactionMonthlyRollup.count != 0).subquery("s")
+    key_names = ["month", *KEY_FIELDS]
+    on = and_(*(computed.c[name] == stored.c[name] for name in key_names))
+    mismatch = [
+        func.coalesce(computed.c[name], 0) != func.coalesce(stored.c[name], 0) for name in MEASURES
+    ]
+    query = (
+        select(
+            *(func.coalesce(computed.c[name], stored.c[name]).label(name) for name in key_names),
+            *(computed.c[name].label(f"expected_{name}") for name in MEASURES),
+            *(stored.c[name].label(f"stored_{name}") for name in MEASURES),
+        )
+        .select_from(computed.join(stored, on, full=True))
+        .where(mismatch[0] | mismatch[1] | mismatch[2])
+        .order_by(literal_column("month"))
+    )
+    return [dict(row._mapping) for row in db.execute(query)]
@@ -0,0 +1,48 @@
+from sqlalchemy import or_, select, func
+from models import Transaction, Project, Category
+
+# Arama sorguları pg_trgm GIN indekslerine dayanır (bkz. migrations/versions/0002_search_trgm_indexes.py).
+# `ILIKE '%terim%'` bu indekslerle desteklenir; sıralama için similarity() skorları kullanılır.
+
+
+def escape_like(term: str) -> str:
+    """LIKE joker karakterlerini (%, _) kullanıcı girdisinde etkisizleştirir."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def contains(column, term: str):
+    return column.ilike(f"%{escape_like(term)}%", escape="\\")
+
+
+def name_search_filter(column, term: str):
+    """Tek bir ad sütununda (proje/kategori) arama koşulu."""
+    return contains(column, term)
+
+
+def name_search_rank(column, term: str):
+    return func.similarity(column, term)
+
+
+def transaction_search_filter(term: str):
+    """İşlem araması için koşul.
+
+    Proje/kategori adları JOIN üzerinden değil, id alt sorgularıyla aranır; böylece
+    bütün OR dalları `transactions` tablosunda kalır ve Postgres her dal için kendi
+    indeksini kullanıp sonuçları BitmapOr ile birleştirebilir.
+    """
+    return or_(
+        Transaction.project_id.in_(select(Project.id).where(contains(Project.name, term))),
+        Transaction.category_id.in_(select(Category.id).where(contains(Category.name, term))),
+        contains(Transaction.type, term),
+        contains(Transaction.currency, term),
+        contains(Transaction.description, term),
+    )
+
+
+def transaction_search_rank(term: str):
+    """İşlem sonucunun arama terimine benzerlik skoru (0..1, büyük olan daha alakalı)."""
+    return func.greatest(
+        func.similarity(Project.name, term),
+        func.similarity(Category.name, term),
+        func.word_similarity(term, func.coalesce(Transaction.description, "")),
+    )
@@ -0,0 +1,48 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from operator import itemgetter
+from typing import Iterable, Optional, Sequence
+
+from fastapi import Response
+
+# Liste uçları için hızlı JSON yolu: satır demetleri Pydantic doğrulamasına girmeden
+# doğrudan kodlanır. orjson kuruluysa o, değilse standart json kullanılır.
+try:
+    import orjson
+except ImportError:  # isteğe bağlı bağımlılık
+    orjson = None
+
+# Anahtar sırası ilgili *Response şemalarının alan sırasıyla aynıdır (JSON biçimi değişmez)
+PROJECT_FIELDS = ("name", "id", "created_at")
+CATEGORY_FIELDS = ("type", "name", "id", "created_at")
+TRANSACTION_FIELDS = (
+    "type", "project_id", "category_id", "date", "amount", "currency", "description",
+    "id", "created_at", "tl_total", "project_name", "category_name",
+)
+
+
+def _default(value):
+    # Numeric sütunlar şemadaki gibi float olarak yazılır
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"JSON'a çevrilemeyen tür: {type(value).__name__}")
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def rows_to_items(fields: Sequence[str], keys: Sequence[str], rows: Iterable) -> list:
+    """Sonuç satırlarını (sütun adları `keys`) `fields` sırasında sözlüklere çevirir."""
+    getter = itemgetter(*(list(keys).index(name) for name in fields))
+    return [dict(zip(fields, getter(row))) for row in rows]
+
+
+def list_response(total: Optional[int], items: list, **extra) -> Response:
+    """`{"total", "items", ...}` gövdeli, response_model doğrulamasını atlayan yanıt."""
+    return Response(dumps({"total": total, "items": items, **extra}), media_type="application/json")
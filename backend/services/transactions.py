@@ -0,0 +1,223 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable, List, Optional, Tuple
+
+from fastapi import HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+
+from models import Transaction, Project, Category, TransactionMonthlyRollup
+from services.pagination import encode_cursor, decode_cursor, keyset_filter, count_statement
+from services.search import transaction_search_filter, transaction_search_rank
+
+# Senkron ve asenkron işlem uçlarının ortak kullandığı sorgu kurucuları.
+# Hepsi `select()` ifadesi döndürür; çalıştırma (Session / AsyncSession) çağırana kalır.
+
+
+def row_to_dict(r):
+    return {
+        "id": r.id,
+        "type": r.type,
+        "project_id": r.project_id,          # düzelt
+        "category_id": r.category_id,        # düzelt
+        "project_name": r.project_name,
+        "category_name": r.category_name,
+        "date": r.date,
+        "amount": r.amount,
+        "currency": r.currency,
+        "description": r.description,
+        "tl_total": r.tl_total,
+        "created_at": r.created_at,
+    }
+
+
+class TransactionFilters:
+    """Liste, dışa aktarma ve rapor uçlarının ortak yapısal filtreleri.
+
+    FastAPI dependency olarak kullanılır (`filters: TransactionFilters = Depends()`); çoklu
+    değerler parametre tekrarlanarak verilir (`?project_id=1&project_id=2`). Her filtre
+    indekslenebilir bir SQL koşuluna çevrilir.
+    """
+
+    def __init__(
+        self,
+        date_from: Optional[date] = Query(None, description="Başlangıç tarihi (dahil)"),
+        date_to: Optional[date] = Query(None, description="Bitiş tarihi (dahil)"),
+        project_id: List[int] = Query([], description="Proje id'leri (tekrarlanabilir)"),
+        category_id: List[int] = Query([], description="Kategori id'leri (tekrarlanabilir)"),
+        type: Optional[str] = Query(None, description="gelir veya gider"),
+        currency: List[str] = Query([], description="Para birimleri (tekrarlanabilir)"),
+        min_amount: Optional[Decimal] = Query(None, description="En düşük tutar (dahil)"),
+        max_amount: Optional[Decimal] = Query(None, description="En yüksek tutar (dahil)"),
+    ):
+        if date_from and date_to and date_from > date_to:
+            raise HTTPException(status_code=400, detail="date_from, date_to'dan büyük olamaz.")
+        if min_amount is not None and max_amount is not None and min_amount > max_amount:
+            raise HTTPException(status_code=400, detail="min_amount, max_amount'tan büyük olamaz.")
+        self.date_from = date_from
+        self.date_to = date_to
+        self.project_ids = list(dict.fromkeys(project_id))
+        self.category_ids = list(dict.fromkeys(category_id))
+        self.type = type.lower() if type else None
+        self.currencies = list(dict.fromkeys(c.upper() for c in currency))
+        self.min_amount = min_amount
+        self.max_amount = max_amount
+
+    @classmethod
+    def of(cls, **values) -> "TransactionFilters":
+        """Kod içinden (Query varsayılanları olmadan) filtre nesnesi oluşturur."""
+        defaults = dict(
+            date_from=None, date_to=None, project_id=[], category_id=[],
+            type=None, currency=[], min_amount=None, max_amount=None,
+        )
+        return cls(**{**defaults, **values})
+
+    def __bool__(self) -> bool:
+        return any((
+            self.date_from, self.date_to, self.project_ids, self.category_ids, self.type,
+            self.currencies, self.min_amount is not None, self.max_amount is not None,
+        ))
+
+    def _key_conditions(self, model) -> list:
+        conditions = []
+        if self.project_ids:
+            conditions.append(model.project_id.in_(self.project_ids))
+        if self.category_ids:
+            conditions.append(model.category_id.in_(self.category_ids))
+        if self.type:
+            conditions.append(model.type == self.type)
+        if self.currencies:
+            conditions.append(model.currency.in_(self.currencies))
+        return conditions
+
+    def conditions(self) -> list:
+        """`transactions` tablosu için WHERE koşulları."""
+        conditions = self._key_conditions(Transaction)
+        if self.date_from:
+            conditions.append(Transaction.date >= self.date_from)
+        if self.date_to:
+            conditions.append(Transaction.date <= self.date_to)
+        if self.min_amount is not None:
+            conditions.append(Transaction.amount >= self.min_amount)
+        if self.max_amount is not None:
+            conditions.append(Transaction.amount <= self.max_amount)
+        return conditions
+
+    def rollup_compatible(self) -> bool:
+        """Aylık özet tablosu bu filtreleri karşılayabiliyor mu (tutar aralığı yok, tarihler ay sınırında)."""
+        if self.min_amount is not None or self.max_amount is not None:
+            return False
+        if self.date_from and self.date_from.day != 1:
+            return False
+        if self.date_to and (self.date_to + timedelta(days=1)).day != 1:
+            return False
+        return True
+
+    def rollup_conditions(self) -> list:
+        """Aylık özet tablosu için WHERE koşulları (yalnızca rollup_compatible ise geçerli)."""
+        conditions = self._key_conditions(TransactionMonthlyRollup)
+        if self.date_from:
+            conditions.append(TransactionMonthlyRollup.month >= self.date_from)
+        if self.date_to:
+            conditions.append(TransactionMonthlyRollup.month <= self.date_to)
+        return conditions
+
+
+NO_FILTERS = TransactionFilters.of()
+
+
+# Liste, dışa aktarma vb. uçların ortak kullandığı sorgu (JOIN + arama + yapısal filtreler)
+def transaction_list_statement(search: str = "", filters: TransactionFilters = NO_FILTERS) -> Select:
+    stmt = (
+        select(
+            Transaction.id,
+            Transaction.type,
+            Transaction.project_id,
+            Transaction.category_id,
+            Project.name.label("project_name"),
+            Category.name.label("category_name"),
+            Transaction.date,
+            Transaction.amount,
+            Transaction.currency,
+            Transaction.description,
+            Transaction.tl_total,
+            Transaction.created_at,
+        )
+        .join(Project, Transaction.project_id == Project.id)
+        .join(Category, Transaction.category_id == Category.id)
+    )
+
+    # Arama (pg_trgm indeksleri ile)
+    if search:
+        stmt = stmt.where(transaction_search_filter(search))
+    if filters:
+        stmt = stmt.where(*filters.conditions())
+    return stmt
+
+
+# Sıralama
+valid_sort_columns = {
+    "id": Transaction.id,
+    "type": Transaction.type,
+    "project_name": Project.name,
+    "category_name": Category.name,
+    "date": Transaction.date,
+    "amount": Transaction.amount,
+    "currency": Transaction.currency,
+    "created_at": Transaction.created_at,
+    "tl_total": Transaction.tl_total,
+}
+
+def order_transactions(stmt: Select, sort_by: str, sort_order: str):
+    """Geçerli sıralamayı uygular; (sorgu, sort_by, sort_order, anahtar sütun) döndürür."""
+    if sort_by not in valid_sort_columns:
+        sort_by = "id"
+    sort_order = "desc" if sort_order.lower() == "desc" else "asc"
+
+    key_column = valid_sort_columns[sort_by]
+    # Eşit değerlerde kararlı sıra için id her zaman ikincil anahtar
+    if sort_order == "desc":
+        stmt = stmt.order_by(key_column.desc(), Transaction.id.desc())
+    else:
+        stmt = stmt.order_by(key_column.asc(), Transaction.id.asc())
+    return stmt, sort_by, sort_order, key_column
+
+
+def transaction_page_statements(
+    search: str,
+    skip: int,
+    limit: int,
+    sort_by: str,
+    sort_order: str,
+    after: Optional[str],
+    count: str,
+    filters: TransactionFilters = NO_FILTERS,
+) -> Tuple[Select, Optional[Select], Callable[[List], Optional[str]]]:
+    """Liste sayfası için (sayfa sorgusu, sayım sorgusu, next_cursor üretici) döndürür."""
+    stmt = transaction_list_statement(search, filters)
+
+    # Alaka sıralaması (yalnızca arama varken, offset sayfalama ile)
+    if search and sort_by == "relevance":
+        if after:
+            raise HTTPException(status_code=400, detail="Alaka sıralamasında imleç (after) kullanılamaz; skip ile sayfalayın.")
+        stmt = stmt.order_by(transaction_search_rank(search).desc(), Transaction.id.asc())
+        return stmt.offset(skip).limit(limit), count_statement(stmt, count), lambda records: None
+
+    stmt, sort_by, sort_order, key_column = order_transactions(stmt, sort_by, sort_order)
+    descending = sort_order == "desc"
+
+    count_stmt = count_statement(stmt, count, table_name=Transaction.__tablename__, filtered=bool(search or filters))
+
+    if after:
+        value, last_id = decode_cursor(after, sort_by, sort_order, key_column)
+        stmt = stmt.where(keyset_filter(key_column, Transaction.id, value, last_id, descending))
+    else:
+        stmt = stmt.offset(skip)
+
+    def next_cursor(records):
+        if records and len(records) == limit:
+            last = records[-1]
+            return encode_cursor(sort_by, sort_order, getattr(last, sort_by), last.id)
+        return None
+
+    return stmt.limit(limit), count_stmt, next_cursor
@@ -0,0 +1,5 @@
+"""Ortak test ayarları (test modüllerinden önce yüklenir)."""
+import os
+
+# database modülü içe aktarılırken motor oluşturur; bağlantı verilmemişse sürücü gerektirmeyen SQLite kullanılır
+os.environ.setdefault("DATABASE_URL", "sqlite://")
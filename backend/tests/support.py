@@ -0,0 +1,18 @@
+"""Test yardımcıları.
+
+Derleme testleri veritabanına bağlanmaz; ifadeler postgresql diyalektiyle derlenip incelenir.
+EXPLAIN testleri yalnızca DATABASE_URL bir Postgres'i gösterdiğinde çalışır, aksi halde atlanır.
+"""
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from database import engine
+
+requires_postgres = pytest.mark.skipif(
+    engine.dialect.name != "postgresql", reason="canlı Postgres gerekli (DATABASE_URL=postgresql://...)"
+)
+
+
+def compile_sql(stmt) -> str:
+    """İfadeyi Postgres SQL'ine derler; boşluklar tek satıra indirilir."""
+    return " ".join(str(stmt.compile(dialect=postgresql.dialect())).split())
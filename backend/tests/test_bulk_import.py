@@ -0,0 +1,41 @@
+"""CSV toplu aktarımında satır bazlı hatalar ve okunamayan girdi."""
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from models import Category, Project, Transaction
+from routers.transactions import bulk_create_transactions_csv
+
+HEADER = b"type,project_id,category_id,date,amount,currency,description\n"
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Project.metadata.create_all(engine, tables=[Project.__table__, Category.__table__, Transaction.__table__])
+    with Session(engine) as session:
+        yield session
+
+
+def _import(db, body: bytes, chunk_size: int = 1000):
+    upload = UploadFile(file=io.BytesIO(HEADER + body), filename="islemler.csv")
+    return bulk_create_transactions_csv(file=upload, delimiter=",", chunk_size=chunk_size, db=db)
+
+
+def test_extra_columns_are_reported_with_row_number(db):
+    result = _import(db, b"gider,1,1,2024-01-01,10,TRY,kira,fazla,alan\ngider,1,1,2024-01-01,10,TRY\n")
+    assert result["inserted"] == 0
+    assert result["errors"][0] == {"row": 1, "error": "Başlıktakinden 2 fazla alan var."}
+    # Eksik alanlı satır olağan doğrulama hatası alır, fazla alan hatası değil
+    assert result["errors"][1]["row"] == 2
+    assert "fazla alan" not in result["errors"][1]["error"]
+
+
+def test_undecodable_input_returns_400(db):
+    with pytest.raises(HTTPException) as e:
+        _import(db, b"gider,1,1,2024-01-01,10,TRY,kira\n" * 3 + b"gider,1,1,2024-01-01,10,TRY,\xff\xfe\n", chunk_size=2)
+    assert e.value.status_code == 400
+    assert "0 işlem kaydedildi" in e.value.detail
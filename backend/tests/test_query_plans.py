@@ -0,0 +1,95 @@
+"""İşlem listesinin sıralama/filtre indeksleri: derleme kontrolleri ve canlı EXPLAIN (check_query_plans)."""
+import importlib.util
+import os
+
+import pytest
+
+import check_query_plans as plans
+from database import SessionLocal
+from models import Transaction
+from services import partitions
+from services.transactions import TransactionFilters, transaction_page_statements, valid_sort_columns
+from support import compile_sql, requires_postgres
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations", "versions")
+# Canlı kontrolde üretilecek sentetik satır sayısı (küçük tablolarda planlayıcı sıralı taramayı seçer)
+PLAN_CHECK_SIZE = int(os.getenv("PLAN_CHECK_SIZE", "200000"))
+
+TRANSACTION_SORTS = sorted(name for name, col in valid_sort_columns.items() if col.table is Transaction.__table__)
+
+
+def _index_columns() -> set:
+    return {tuple(c.name for c in index.columns) for index in Transaction.__table__.indexes}
+
+
+def _migration(name: str):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(MIGRATIONS, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("sort_by", TRANSACTION_SORTS)
+def test_sort_is_backed_by_column_id_index(sort_by, sort_order):
+    stmt, _, _ = transaction_page_statements("", 0, 10, sort_by, sort_order, None, "none")
+    direction = sort_order.upper()
+    assert f"ORDER BY transactions.{sort_by} {direction}, transactions.id {direction}" in compile_sql(stmt)
+    key = ("id",) if sort_by == "id" else (sort_by, "id")
+    assert any(columns[:len(key)] == key for columns in _index_columns())
+
+
+@pytest.mark.parametrize("filters, column", [
+    (dict(date_from=plans.JANUARY["date_from"]), "date"),
+    (dict(project_id=[1]), "project_id"),
+    (dict(category_id=[1]), "category_id"),
+    (dict(currency=["usd"]), "currency"),
+    (dict(min_amount=1), "amount"),
+])
+def test_filter_column_leads_an_index(filters, column):
+    stmt, _, _ = transaction_page_statements("", 0, 10, "id", "asc", None, "none", TransactionFilters.of(**filters))
+    assert f"transactions.{column} " in compile_sql(stmt).split(" WHERE ", 1)[1]
+    assert any(columns[0] == column for columns in _index_columns())
+
+
+def test_partitioned_table_rebuilds_model_indexes():
+    assert {name for name, _ in partitions.INDEXES} == {index.name for index in Transaction.__table__.indexes}
+
+
+def test_sort_filter_migration_matches_model():
+    model = {index.name: tuple(c.name for c in index.columns) for index in Transaction.__table__.indexes}
+    for name, columns in _migration("0006_tx_sort_filter_indexes").INDEXES:
+        assert model.get(name) == tuple(columns)
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    db = SessionLocal()
+    try:
+        interval, small = plans.prepare(db, PLAN_CHECK_SIZE)
+        yield db, interval, small
+    finally:
+        db.rollback()
+        db.close()
+
+
+@requires_postgres
+@pytest.mark.parametrize("args", [args for _, args in plans.CASES], ids=[name for name, _ in plans.CASES])
+def test_explain_uses_index(seeded, args):
+    db, _, small = seeded
+    ok, scans = plans.check(db, dict(args), small)
+    assert ok, scans
+
+
+@requires_postgres
+@pytest.mark.parametrize(
+    "kind, args, date_range",
+    [case[1:] for case in plans.PRUNING_CASES],
+    ids=[case[0] for case in plans.PRUNING_CASES],
+)
+def test_explain_prunes_partitions(seeded, kind, args, date_range):
+    db, interval, _ = seeded
+    if not interval:
+        pytest.skip("transactions bölümlü değil")
+    ok, scanned, _ = plans.check_pruning(db, interval, kind, args, date_range)
+    assert ok, scanned
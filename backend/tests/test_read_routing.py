@@ -0,0 +1,60 @@
+"""Dashboard okumaları replikaya gider; yakın zamanda yazan istemci önbelleği birincilden tazeler."""
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import database
+from database import RoutingState, get_db, get_read_db, pinned_to_primary
+from main import app
+from models import Category, Project
+from services.lookups import LookupCache
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Project.metadata.create_all(engine, tables=[Project.__table__, Category.__table__])
+    with Session(engine) as session:
+        yield session
+
+
+def _state(pinned_until: float = 0.0, wrote: bool = False) -> RoutingState:
+    state = RoutingState(pinned_until)
+    state.wrote = wrote
+    return state
+
+
+@pytest.mark.parametrize("state, pinned", [
+    (None, False),
+    (_state(), False),
+    (_state(pinned_until=time.time() + 60), True),
+    (_state(wrote=True), True),
+], ids=["istek-disi", "sabitsiz", "sabitli", "yazan-istek"])
+def test_pinned_to_primary(state, pinned):
+    token = database._routing_state.set(state)
+    try:
+        assert pinned_to_primary() is pinned
+    finally:
+        database._routing_state.reset(token)
+
+
+def test_fresh_skips_cached_lookups(db):
+    cache = LookupCache(ttl=60)
+    assert cache.get(db)["body"]["projects"] == []
+    # Replikadan dolmuş eski liste; invalidate sonrası yazma yapılmış gibi
+    db.add(Project(name="Kira"))
+    db.commit()
+    assert cache.get(db)["body"]["projects"] == []
+    assert [p["name"] for p in cache.get(db, fresh=True)["body"]["projects"]] == ["Kira"]
+    # Tazelenen değer önbelleğe yazılır
+    assert [p["name"] for p in cache.get(db)["body"]["projects"]] == ["Kira"]
+
+
+@pytest.mark.parametrize("path", ["/dashboard/lookups", "/dashboard/bootstrap"])
+def test_dashboard_reads_use_read_db(path):
+    route = next(r for r in app.routes if getattr(r, "path", None) == path)
+    calls = {dep.call for dep in route.dependant.dependencies}
+    assert get_read_db in calls
+    assert get_db not in calls
@@ -0,0 +1,59 @@
+"""Rapor para birimine çevrim: tarihi boş işlemler ve kuru bilinmeyen günler null döner."""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import services.reports as reports
+from models import Category, Project, Transaction
+from services.cross_rates import CrossRateCache, add_report_amounts
+from services.rate_table import RateTable
+
+KNOWN = date(2024, 1, 2)
+
+
+@pytest.fixture
+def cache():
+    table = RateTable()
+    table._replace([("USD", date(2024, 1, 1), Decimal("30"))])
+    return CrossRateCache(table)
+
+
+def test_matrices_skip_null_dates(cache):
+    assert set(cache.matrices([KNOWN, None, KNOWN])) == {KNOWN}
+
+
+def test_report_amount_is_null_for_undated_items(cache):
+    items = [
+        {"date": KNOWN, "currency": "TRY", "amount": Decimal("60")},
+        {"date": None, "currency": "TRY", "amount": Decimal("60")},
+    ]
+    add_report_amounts(cache.matrices(item["date"] for item in items), items, "USD")
+    assert [item["report_amount"] for item in items] == [2.0, None]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    tables = [Project.__table__, Category.__table__, Transaction.__table__]
+    Project.metadata.create_all(engine, tables=tables)
+    with Session(engine) as session:
+        session.add_all([
+            Transaction(type="gelir", date=KNOWN, amount=60, currency="TRY", tl_total=60),
+            Transaction(type="gelir", date=KNOWN, amount=30, currency="TRY", tl_total=30),
+            Transaction(type="gider", date=KNOWN, amount=90, currency="TRY", tl_total=90),
+            Transaction(type="gider", date=None, amount=10, currency="TRY", tl_total=10),
+        ])
+        session.commit()
+        yield session
+
+
+def test_summary_groups_with_undated_rows_get_null_report_total(db, cache, monkeypatch):
+    monkeypatch.setattr(reports, "cross_rates", cache)
+    result = reports.summarize_transactions(db, ["type"], report_currency="USD")
+    data = result["data"]
+    assert data["type"] == ["gelir", "gider"]
+    assert data["count"] == [2, 2]
+    assert data["report_total"] == [3.0, None]
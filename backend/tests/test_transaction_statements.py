@@ -0,0 +1,150 @@
+"""İşlem listesi ve sayım ifadeleri: filtre, sıralama, keyset ve LIMIT'in SQL'e inmesi."""
+from collections import namedtuple
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from models import Transaction
+from services.pagination import COUNT_CAP, decode_cursor, encode_cursor
+from services.transactions import TransactionFilters, transaction_page_statements
+from support import compile_sql
+
+ALL_FILTERS = TransactionFilters.of(
+    date_from=date(2024, 1, 1), date_to=date(2024, 1, 31), project_id=[3, 3, 4], category_id=[5],
+    type="Gider", currency=["usd"], min_amount=Decimal("1"), max_amount=Decimal("9"),
+)
+FILTER_SQL = [
+    "transactions.project_id IN (",
+    "transactions.category_id IN (",
+    "transactions.type = ",
+    "transactions.currency IN (",
+    "transactions.date >= ",
+    "transactions.date <= ",
+    "transactions.amount >= ",
+    "transactions.amount <= ",
+]
+
+Row = namedtuple("Row", "id date amount")
+
+
+def _params(stmt) -> dict:
+    return stmt.compile(dialect=postgresql.dialect()).params
+
+
+def _where(sql: str) -> str:
+    return sql.split(" WHERE ", 1)[1].split(" ORDER BY ", 1)[0]
+
+
+def test_filters_are_pushed_into_where():
+    page, _, _ = transaction_page_statements("", 0, 10, "id", "asc", None, "none", ALL_FILTERS)
+    where = _where(compile_sql(page))
+    for fragment in FILTER_SQL:
+        assert fragment in where
+    params = _params(page)
+    # Tekrarlar atılır, tip küçük, para birimi büyük harfe çevrilir
+    assert params["project_id_1"] == [3, 4]
+    assert params["type_1"] == "gider"
+    assert params["currency_1"] == ["USD"]
+
+
+def test_no_filters_no_where():
+    page, _, _ = transaction_page_statements("", 0, 10, "id", "asc", None, "none")
+    assert " WHERE " not in compile_sql(page)
+
+
+def test_search_and_filters_are_combined():
+    page, _, _ = transaction_page_statements("kira", 0, 10, "id", "asc", None, "none", ALL_FILTERS)
+    where = _where(compile_sql(page))
+    assert "transactions.description ILIKE" in where
+    assert all(fragment in where for fragment in FILTER_SQL)
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_order_by_sort_column_then_id(sort_order):
+    page, _, _ = transaction_page_statements("", 0, 10, "amount", sort_order, None, "none")
+    direction = sort_order.upper()
+    assert f"ORDER BY transactions.amount {direction}, transactions.id {direction}" in compile_sql(page)
+
+
+def test_unknown_sort_falls_back_to_id():
+    page, _, _ = transaction_page_statements("", 0, 10, "password; --", "sideways", None, "none")
+    assert "ORDER BY transactions.id ASC, transactions.id ASC" in compile_sql(page)
+
+
+def test_offset_page_has_limit_and_offset():
+    page, _, _ = transaction_page_statements("", 40, 20, "id", "asc", None, "none")
+    assert compile_sql(page).endswith("LIMIT %(param_1)s OFFSET %(param_2)s")
+    assert (_params(page)["param_1"], _params(page)["param_2"]) == (20, 40)
+
+
+def test_keyset_descending_replaces_offset():
+    after = encode_cursor("date", "desc", date(2024, 6, 1), 500)
+    page, _, _ = transaction_page_statements("", 999, 10, "date", "desc", after, "none", ALL_FILTERS)
+    sql = compile_sql(page)
+    where = _where(sql)
+    assert "transactions.date < %(date_3)s OR transactions.date = %(date_4)s AND transactions.id < %(id_1)s" in where
+    assert all(fragment in where for fragment in FILTER_SQL)
+    assert sql.endswith("LIMIT %(param_1)s")
+    assert "OFFSET" not in sql
+    assert _params(page)["date_3"] == date(2024, 6, 1)
+    assert _params(page)["id_1"] == 500
+
+
+def test_keyset_ascending_keeps_nulls_last():
+    after = encode_cursor("amount", "asc", Decimal("12.50"), 7)
+    page, _, _ = transaction_page_statements("", 0, 10, "amount", "asc", after, "none")
+    where = _where(compile_sql(page))
+    assert ("transactions.amount > %(amount_1)s OR transactions.amount = %(amount_2)s "
+            "AND transactions.id > %(id_1)s OR transactions.amount IS NULL") in where
+    assert _params(page)["amount_1"] == Decimal("12.50")
+
+
+def test_next_cursor_round_trips_last_row():
+    _, _, next_cursor = transaction_page_statements("", 0, 2, "date", "desc", None, "none")
+    rows = [Row(9, date(2024, 3, 2), Decimal("5")), Row(4, date(2024, 3, 1), Decimal("7"))]
+    token = next_cursor(rows)
+    assert decode_cursor(token, "date", "desc", Transaction.date) == (date(2024, 3, 1), 4)
+    assert next_cursor(rows[:1]) is None
+
+
+def test_exact_count_keeps_where_without_order_or_limit():
+    _, count, _ = transaction_page_statements("", 40, 20, "date", "desc", None, "exact", ALL_FILTERS)
+    sql = compile_sql(count)
+    assert sql.startswith("SELECT count(*)")
+    assert all(fragment in _where(sql) for fragment in FILTER_SQL)
+    assert "ORDER BY" not in sql and "LIMIT" not in sql and "OFFSET" not in sql
+
+
+def test_estimate_count_uses_statistics_only_without_filters():
+    _, unfiltered, _ = transaction_page_statements("", 0, 10, "id", "asc", None, "estimate")
+    _, filtered, _ = transaction_page_statements("", 0, 10, "id", "asc", None, "estimate", ALL_FILTERS)
+    assert "pg_class.reltuples" in compile_sql(unfiltered)
+    assert "pg_class" not in compile_sql(filtered)
+    assert COUNT_CAP in _params(filtered).values()
+
+
+def test_count_none_skips_query():
+    _, count, _ = transaction_page_statements("", 0, 10, "id", "asc", None, "none")
+    assert count is None
+
+
+@pytest.mark.parametrize("token", [
+    encode_cursor("amount", "asc", "12,5", 7),          # Decimal'e çevrilemeyen değer
+    encode_cursor("amount", "asc", "12.50", "yedi"),    # sayı olmayan id
+    encode_cursor("date", "asc", "2024-01-01", 7),      # başka sıralamanın imleci
+    "bozuk-imlec",
+], ids=["decimal", "id", "sort", "base64"])
+def test_tampered_cursor_is_rejected_with_400(token):
+    with pytest.raises(HTTPException) as e:
+        transaction_page_statements("", 0, 10, "amount", "asc", token, "none")
+    assert e.value.status_code == 400
+
+
+def test_relevance_sort_rejects_cursor():
+    after = encode_cursor("id", "asc", 5, 5)
+    with pytest.raises(HTTPException) as e:
+        transaction_page_statements("kira", 0, 10, "relevance", "asc", after, "none")
+    assert e.value.status_code == 400
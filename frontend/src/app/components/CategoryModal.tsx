@@ -1,6 +1,7 @@
 "use client";
 
 import { useState, useEffect } from "react";
+import { apiFetch } from "@/app/lib/api";
 
 interface Category {
   id: number;
@@ -51,7 +52,7 @@ export default function CategoryModal({
         ? `http://127.0.0.1:8000/categories/${category.id}`
         : "http://127.0.0.1:8000/categories";
 
-      const res = await fetch(url, {
+      const res = await apiFetch(url, {
         method,
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ type, name }),
@@ -1,12 +1,11 @@
 "use client";
 
 import { useEffect, useState } from "react";
+import { apiFetch } from "@/app/lib/api";
 
 interface ExchangeRate {
   code: string;
-  name: string;
-  forex_buying: string;
-  forex_selling: string | null;
+  rate: number;
 }
 
 export default function ExchangeRateCard() {
@@ -15,7 +14,7 @@ export default function ExchangeRateCard() {
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
-    fetch("http://127.0.0.1:8000/exchange-rates")
+    apiFetch("http://127.0.0.1:8000/exchange-rates")
       .then((res) => res.json())
       .then((data) => {
         setRates(data.rates || []);
@@ -59,7 +58,7 @@ export default function ExchangeRateCard() {
               </span>
               <div>
                 <p className="font-medium text-gray-700 text-sm sm:text-base">
-                  {rate.name}
+                  {getCurrencyName(rate.code)}
                 </p>
                 <p className="text-[10px] sm:text-xs text-gray-400">
                   {rate.code}
@@ -69,11 +68,7 @@ export default function ExchangeRateCard() {
             <div className="text-right">
               <p className="text-xs sm:text-sm">
                 <span className="font-semibold text-green-600">Alış:</span>{" "}
-                {rate.forex_buying}
-              </p>
-              <p className="text-xs sm:text-sm">
-                <span className="font-semibold text-red-500">Satış:</span>{" "}
-                {rate.forex_selling}
+                {rate.rate}
               </p>
             </div>
           </li>
@@ -94,3 +89,15 @@ function getCurrencyIcon(code: string) {
   };
   return icons[code] || "💰";
 }
+
+// Para birimi adları
+function getCurrencyName(code: string) {
+  const names: Record<string, string> = {
+    USD: "ABD Doları",
+    EUR: "Euro",
+    GBP: "İngiliz Sterlini",
+    CHF: "İsviçre Frangı",
+    CAD: "Kanada Doları",
+  };
+  return names[code] || code;
+}
@@ -1,6 +1,7 @@
 "use client";
 
 import { useState, useEffect } from "react";
+import { apiFetch } from "@/app/lib/api";
 
 interface Project {
   id: number;
@@ -51,7 +52,7 @@ export default function ProjectModal({
         ? `http://127.0.0.1:8000/projects/${project.id}`
         : "http://127.0.0.1:8000/projects";
 
-      const res = await fetch(url, {
+      const res = await apiFetch(url, {
         method,
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ name }),
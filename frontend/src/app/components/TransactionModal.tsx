@@ -1,4 +1,5 @@
 import React, { useState, useEffect } from "react";
+import { apiFetch } from "@/app/lib/api";
 
 interface Transaction {
   id: number;
@@ -44,7 +45,7 @@ export default function TransactionModal({
   };
 
   const handleSave = async () => {
-    const res = await fetch(`http://127.0.0.1:8000/transactions/${form.id}`, {
+    const res = await apiFetch(`http://127.0.0.1:8000/transactions/${form.id}`, {
       method: "PUT",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify(form),
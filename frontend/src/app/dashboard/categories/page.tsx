@@ -3,6 +3,7 @@
 import { useEffect, useState } from "react";
 import CategoryModal from "@/app/components/CategoryModal";
 import { FaEdit, FaTrash, FaSortUp, FaSortDown } from "react-icons/fa";
+import { apiFetch } from "@/app/lib/api";
 
 interface Category {
   id: number;
@@ -27,7 +28,7 @@ export default function CategoriesPage() {
   }, [page, search, limit, sortColumn, sortOrder]);
 
   const fetchCategories = async () => {
-    const res = await fetch(
+    const res = await apiFetch(
       `http://127.0.0.1:8000/categories?search=${search}&skip=${(page - 1) * limit}&limit=${limit}&sort_by=${sortColumn}&sort_order=${sortOrder}`
     );
     const data = await res.json();
@@ -37,7 +38,7 @@ export default function CategoriesPage() {
 
   const handleDelete = async (id: number) => {
     if (confirm("Bu kategoriyi silmek istediğinizden emin misiniz?")) {
-      const res = await fetch(`http://127.0.0.1:8000/categories/${id}`, {
+      const res = await apiFetch(`http://127.0.0.1:8000/categories/${id}`, {
         method: "DELETE",
       });
       if (res.ok) {
@@ -4,6 +4,7 @@ import { useEffect, useState } from "react";
 import ProjectModal from "@/app/components/ProjectModal";
 import { FaEdit, FaTrash } from "react-icons/fa";
 import { FaSort, FaSortUp, FaSortDown } from "react-icons/fa";
+import { apiFetch } from "@/app/lib/api";
 
 interface Project {
   id: number;
@@ -27,7 +28,7 @@ export default function ProjectsPage() {
   }, [page, search, limit, sortColumn, sortOrder]);
 
   const fetchProjects = async () => {
-    const res = await fetch(
+    const res = await apiFetch(
       `http://127.0.0.1:8000/projects?search=${search}&skip=${(page - 1) * limit}&limit=${limit}&sort_by=${sortColumn}&sort_order=${sortOrder}`
     );
     const data = await res.json();
@@ -46,7 +47,7 @@ export default function ProjectsPage() {
 
   const handleDelete = async (id: number) => {
     if (confirm("Bu projeyi silmek istediğinizden emin misiniz?")) {
-      const res = await fetch(`http://127.0.0.1:8000/projects/${id}`, {
+      const res = await apiFetch(`http://127.0.0.1:8000/projects/${id}`, {
         method: "DELETE",
       });
       if (res.ok) {
@@ -1,8 +1,9 @@
 "use client";
 
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { FaEdit, FaTrash, FaSort, FaSortUp, FaSortDown } from "react-icons/fa";
 import TransactionModal from "@/app/components/TransactionModal";
+import { apiFetch } from "@/app/lib/api";
 
 interface Transaction {
   id: number;
@@ -52,32 +53,41 @@ export default function TransactionsPage() {
   const [editTransaction, setEditTransaction] = useState<Transaction | null>(null);
   const [modalOpen, setModalOpen] = useState(false);
 
+  // İlk yüklemede listeler + ilk sayfa tek istekte (/dashboard/bootstrap) gelir
+  const bootstrapped = useRef(false);
+  const lookupsEtag = useRef<string | null>(null);
+
   useEffect(() => {
-    fetchTransactions();
-    fetchProjects();
-    fetchCategories();
+    if (!bootstrapped.current) {
+      bootstrapped.current = true;
+      fetchBootstrap();
+    } else {
+      fetchTransactions();
+    }
     // eslint-disable-next-line
   }, [page, limit, search, sortColumn, sortOrder]);
 
-  const fetchTransactions = async () => {
-    const res = await fetch(
-      `http://127.0.0.1:8000/transactions?search=${search}&skip=${(page - 1) * limit}&limit=${limit}&sort_by=${sortColumn}&sort_order=${sortOrder}`
-    );
-    const data = await res.json();
-    setTransactions(data.items);
-    setTotal(data.total);
-  };
+  const listQuery = () =>
+    `search=${search}&skip=${(page - 1) * limit}&limit=${limit}&sort_by=${sortColumn}&sort_order=${sortOrder}`;
 
-  const fetchProjects = async () => {
-    const res = await fetch("http://127.0.0.1:8000/projects?limit=1000");
+  const fetchBootstrap = async () => {
+    const etag = lookupsEtag.current ? `&lookups_etag=${encodeURIComponent(lookupsEtag.current)}` : "";
+    const res = await apiFetch(`http://127.0.0.1:8000/dashboard/bootstrap?${listQuery()}${etag}`);
     const data = await res.json();
-    setProjects(data.items || data);
+    lookupsEtag.current = data.lookups_etag;
+    if (data.lookups) {
+      setProjects(data.lookups.projects);
+      setCategories(data.lookups.categories);
+    }
+    setTransactions(data.transactions.items);
+    setTotal(data.transactions.total);
   };
 
-  const fetchCategories = async () => {
-    const res = await fetch("http://127.0.0.1:8000/categories?limit=1000");
+  const fetchTransactions = async () => {
+    const res = await apiFetch(`http://127.0.0.1:8000/transactions?${listQuery()}`);
     const data = await res.json();
-    setCategories(data.items || data);
+    setTransactions(data.items);
+    setTotal(data.total);
   };
 
   const handleSort = (column: keyof Transaction) => {
@@ -100,7 +110,7 @@ export default function TransactionsPage() {
 
   const handleDelete = async (id: number) => {
     if (confirm("Bu kaydı silmek istediğinize emin misiniz?")) {
-      const res = await fetch(`http://127.0.0.1:8000/transactions/${id}`, {
+      const res = await apiFetch(`http://127.0.0.1:8000/transactions/${id}`, {
         method: "DELETE",
       });
       if (res.ok) {
@@ -125,7 +135,7 @@ export default function TransactionsPage() {
       description: formDescription,
     };
 
-    const res = await fetch("http://127.0.0.1:8000/transactions", {
+    const res = await apiFetch("http://127.0.0.1:8000/transactions", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify(payload),
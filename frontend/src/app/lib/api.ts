@@ -0,0 +1,38 @@
+// API istekleri için fetch sarmalayıcısı.
+// Backend okuma replikası kullanıyorsa, yazma yapan isteğin yanıtı `X-DB-Pin` başlığında bir
+// sabitleme zamanı döner. Bu değer süresi dolana kadar sonraki isteklere geri gönderilir; böylece
+// okumalar birincil veritabanından yapılır ve az önce kaydedilen veri listede hemen görünür.
+// (Ön yüz ile API farklı kökenlerde olduğundan çerez yerine başlık kullanılır.)
+
+const PIN_HEADER = "X-DB-Pin";
+const PIN_STORAGE_KEY = "db_pin";
+
+let pinnedUntil = 0;
+
+function currentPin(): string | null {
+  if (!pinnedUntil && typeof window !== "undefined") {
+    pinnedUntil = Number(window.sessionStorage.getItem(PIN_STORAGE_KEY)) || 0;
+  }
+  return pinnedUntil > Date.now() / 1000 ? String(pinnedUntil) : null;
+}
+
+function rememberPin(res: Response) {
+  const value = Number(res.headers.get(PIN_HEADER));
+  if (value > pinnedUntil) {
+    pinnedUntil = value;
+    if (typeof window !== "undefined") {
+      window.sessionStorage.setItem(PIN_STORAGE_KEY, String(value));
+    }
+  }
+}
+
+export async function apiFetch(input: string, init: RequestInit = {}): Promise<Response> {
+  const headers = new Headers(init.headers);
+  const pin = currentPin();
+  if (pin) {
+    headers.set(PIN_HEADER, pin);
+  }
+  const res = await fetch(input, { ...init, headers });
+  rememberPin(res);
+  return res;
+}